@@ -0,0 +1,101 @@
+"""
+Worker cold-start benchmark: time from interpreter start to the first request.
+
+Each run starts a fresh Python process that imports Django, loads the WSGI or
+ASGI application the way gunicorn/uvicorn do, and serves one request that
+resolves the full URLconf (so every view module and its imports are loaded).
+Nothing is cached between runs apart from the OS file cache, so results are
+reproducible on a given machine:
+
+    python benchmarks/cold_start.py --runs 10
+    python benchmarks/cold_start.py --runs 10 --max-seconds 1.5   # fail on regressions
+    python benchmarks/cold_start.py --importtime 15               # slowest imports
+
+No database connection is needed; set THRYV_FAST_BOOT=1 to measure fast-boot mode.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child process; ``__start__`` is taken before any project import
+CHILD = """
+import time
+__start__ = time.perf_counter()
+import json, os, sys
+sys.path.insert(0, {project_dir!r})
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "thryv.settings")
+from thryv.{stack} import application
+loaded = time.perf_counter()
+from django.test import Client
+response = Client().get("/__cold_start__/", HTTP_HOST="localhost")
+done = time.perf_counter()
+print(json.dumps({{"boot": loaded - __start__, "first_request": done - __start__, "status": response.status_code}}))
+"""
+
+
+def _run_once(stack, extra_args=()):
+    code = CHILD.format(project_dir=PROJECT_DIR, stack=stack)
+    completed = subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+    )
+    return completed
+
+
+def _importtime(stack, top):
+    stderr = _run_once(stack, ["-X", "importtime"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    # importtime indents nested imports by two spaces per level; skip the
+    # application module itself and list what it pulls in a few levels down
+    shallow = []
+    for us, name in rows:
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if 1 <= depth <= 3:
+            shallow.append((us, "  " * (depth - 1) + name.strip()))
+    for us, name in sorted(shallow, reverse=True)[:top]:
+        print(f"{us / 1000:9.1f} ms  {name}")
+
+
+def main(args):
+    if args.importtime:
+        _importtime(args.stack, args.importtime)
+        return 0
+
+    boots, firsts = [], []
+    for _ in range(args.runs):
+        result = json.loads(_run_once(args.stack).stdout.strip().splitlines()[-1])
+        boots.append(result["boot"])
+        firsts.append(result["first_request"])
+
+    print(f"stack={args.stack} runs={args.runs} fast_boot={os.environ.get('THRYV_FAST_BOOT', '0')}")
+    for label, values in (("app loaded", boots), ("first request", firsts)):
+        print(
+            f"{label:>14}: median {statistics.median(values) * 1000:7.1f} ms  "
+            f"min {min(values) * 1000:7.1f} ms  max {max(values) * 1000:7.1f} ms"
+        )
+
+    median = statistics.median(firsts)
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"Cold start regression: median {median:.3f}s > {args.max_seconds:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--stack", choices=["wsgi", "asgi"], default="asgi")
+    parser.add_argument("--max-seconds", type=float, help="Exit non-zero if the median time to first request is higher.")
+    parser.add_argument("--importtime", type=int, metavar="N", help="Print the N slowest top-level imports instead.")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,58 @@
+"""
+Concurrency load test for the sync vs async interview endpoints.
+
+Fires N simultaneous ``start-interview`` requests at the sync DRF view and at
+its async counterpart, then prints wall time and throughput for each. Run it
+against a single ASGI worker so the difference comes from the views alone:
+
+    uvicorn thryv.asgi:application --workers 1
+    python benchmarks/interview_concurrency.py --concurrency 100 --user-id 2
+
+With one worker the sync view completes roughly one LLM + TTS round trip at a
+time, while the async view overlaps all of them, so its wall time stays close
+to the latency of a single turn.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+ENDPOINTS = {
+    "sync": "/api/start-interview/",
+    "async": "/api/async/start-interview/",
+}
+
+
+async def _fire(client, path, payload, concurrency):
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        *(client.post(path, json=payload) for _ in range(concurrency)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in responses if isinstance(r, httpx.Response) and r.status_code == 200)
+    return elapsed, ok
+
+
+async def main(args):
+    payload = {"job_description": args.job_description, "user_id": args.user_id}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for mode in args.modes:
+            elapsed, ok = await _fire(client, ENDPOINTS[mode], payload, args.concurrency)
+            print(
+                f"{mode:>5}: {args.concurrency} requests, {ok} ok, "
+                f"{elapsed:.2f}s wall, {args.concurrency / elapsed:.1f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--user-id", type=int, default=2)
+    parser.add_argument("--job-description", default="Data Scientist")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--modes", nargs="+", choices=sorted(ENDPOINTS), default=["sync", "async"])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,156 @@
+"""
+Interview table benchmark: lookup and listing latency before and after the
+compact schema (migrations rhBot 0004/0005).
+
+Builds the ``rhBot_interview`` table twice in throwaway SQLite files, once
+with the old layout and once with the new one, then times the three queries
+the interview endpoints run on every request:
+
+* lookup by ``interview_id`` (InterviewDetailView, ContinueInterview)
+* a user's newest interviews, one page (InterviewByUserAPIView)
+* counting interviews by status
+
+Only the standard library is needed:
+
+    python benchmarks/interview_lookup.py                 # 1,000,000 rows
+    python benchmarks/interview_lookup.py --rows 200000 --queries 5000
+
+Before: ``interview_id`` is a 36-char varchar, ``status`` free text with no
+index, and only the implicit index on ``user_id``. After: ``interview_id`` is a
+16-byte UUID (PostgreSQL's native ``uuid`` size; SQLite has no UUID type, so
+it is stored as a 16-byte blob), ``status`` is a short choices column with its
+own index, and ``(user_id, created_at DESC)`` serves the listing.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+
+SCHEMAS = {
+    "before": """
+        CREATE TABLE rhBot_interview (
+            id INTEGER PRIMARY KEY,
+            interview_id VARCHAR(100) NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            job_description TEXT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX rhBot_interview_user_id ON rhBot_interview (user_id);
+    """,
+    "after": """
+        CREATE TABLE rhBot_interview (
+            id INTEGER PRIMARY KEY,
+            interview_id BLOB NOT NULL UNIQUE,
+            user_id INTEGER NOT NULL,
+            job_description TEXT NOT NULL,
+            status VARCHAR(10) NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX interview_user_created_idx ON rhBot_interview (user_id, created_at DESC);
+        CREATE INDEX interview_status_idx ON rhBot_interview (status);
+    """,
+}
+
+LISTING_SQL = (
+    "SELECT id, interview_id, status, substr(job_description, 1, 200), created_at, updated_at "
+    "FROM rhBot_interview WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT 20"
+)
+
+_BATCH_SIZE = 50_000
+
+
+def _rows(count, users, seed):
+    rng = random.Random(seed)
+    start = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+    for pk in range(1, count + 1):
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start + pk * 30))
+        status = "completed" if rng.random() < 0.8 else "ongoing"
+        yield (pk, uuid.UUID(int=rng.getrandbits(128), version=4), rng.randint(1, users),
+               f"Backend Engineer {pk % 97}\n" + "Requirements: Python, Django, SQL. " * 5,
+               status, created, created)
+
+
+def build(path, layout, count, users, seed):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMAS[layout])
+    encode = (lambda value: str(value)) if layout == "before" else (lambda value: value.bytes)
+    batch = []
+    for row in _rows(count, users, seed):
+        batch.append((row[0], encode(row[1])) + row[2:])
+        if len(batch) >= _BATCH_SIZE:
+            connection.executemany("INSERT INTO rhBot_interview VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        connection.executemany("INSERT INTO rhBot_interview VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    connection.commit()
+    connection.execute("ANALYZE")
+    return connection
+
+
+def _time(connection, sql, params_list):
+    timings = []
+    for params in params_list:
+        started = time.perf_counter()
+        connection.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _summary(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    return f"{label:>16}: median {statistics.median(timings) * 1e6:9.1f} us  p95 {p95 * 1e6:9.1f} us"
+
+
+def run(layout, args, workdir):
+    path = os.path.join(workdir, f"{layout}.sqlite3")
+    started = time.perf_counter()
+    connection = build(path, layout, args.rows, args.users, args.seed)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(args.seed + 1)
+    sample_pks = [rng.randint(1, args.rows) for _ in range(args.queries)]
+    interview_ids = [
+        connection.execute("SELECT interview_id FROM rhBot_interview WHERE id = ?", (pk,)).fetchone()
+        for pk in sample_pks
+    ]
+    user_ids = [(rng.randint(1, args.users),) for _ in range(args.queries)]
+
+    results = [
+        _summary("lookup by id", _time(connection, "SELECT * FROM rhBot_interview WHERE interview_id = ?", interview_ids)),
+        _summary("user listing", _time(connection, LISTING_SQL, user_ids)),
+        _summary("count by status", _time(
+            connection, "SELECT count(*) FROM rhBot_interview WHERE status = ?", [("ongoing",)] * args.status_queries
+        )),
+    ]
+    plan = connection.execute("EXPLAIN QUERY PLAN " + LISTING_SQL, (1,)).fetchall()
+    connection.close()
+
+    print(f"[{layout}] built in {build_seconds:.1f}s, file size {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+    for line in results:
+        print(line)
+    print("    listing plan: " + "; ".join(row[-1] for row in plan))
+
+
+def main(args):
+    print(f"rows={args.rows} users={args.users} queries={args.queries}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for layout in ("before", "after"):
+            run(layout, args, workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=10_000, help="Lookups and listings timed per layout.")
+    parser.add_argument("--status-queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
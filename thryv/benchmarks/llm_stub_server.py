@@ -0,0 +1,122 @@
+"""
+Local OpenAI-compatible chat-completion stub for offline benchmarks.
+
+Answers ``POST .../chat/completions`` after a configurable latency, with or
+without ``stream=True``, and returns canned content shaped like what each
+prompt expects (the interview questions JSON, answer feedback, or the resume
+evaluation JSON). ``--schema-error-rate`` answers that share of question
+requests with a numbered prose script instead, to exercise the schema retry
+(its counters are at ``/api/question-generation/stats/``). Point the app at
+it with:
+
+    python benchmarks/llm_stub_server.py --port 8001 --latency 1.5
+    LLM_BASE_URL=http://127.0.0.1:8001/v1 LLM_API_KEY=stub uvicorn thryv.asgi:application
+"""
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+INTERVIEW_QUESTIONS = [
+    "Welcome, and thanks for joining us today! To start, could you tell us a little about yourself?",
+    "What drew you to this position?",
+    "Can you walk us through a project you are particularly proud of?",
+    "Tell us about a time you disagreed with a teammate. How did you resolve it?",
+    "Which tools do you rely on most in your day-to-day work?",
+    "Where would you like to grow over the next two years?",
+]
+# What models answered before JSON mode: numbered prose, which breaks the schema
+INTERVIEW_SCRIPT = "\n".join(f"{number}. {question}" for number, question in enumerate(INTERVIEW_QUESTIONS, 1))
+FEEDBACK = (
+    "Great job! That is a clear and well-structured answer. You could strengthen it further "
+    "by quantifying the impact of your work. Let's move on to the next question."
+)
+
+
+def _resume_evaluation():
+    return json.dumps({
+        "ats_score": round(random.uniform(40, 95), 1),
+        "best_practices_score": round(random.uniform(40, 95), 1),
+        "suggestions": "Add measurable achievements and mirror the keywords of the job description.",
+    })
+
+
+def _reply_for(body, schema_error_rate=0.0):
+    prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+    if "interview script" in prompt:
+        # A retry (it has the rejected reply in its messages) always gets valid JSON
+        if len(body.get("messages", [])) == 1 and random.random() < schema_error_rate:
+            return INTERVIEW_SCRIPT
+        return json.dumps({"questions": INTERVIEW_QUESTIONS})
+    if body.get("response_format", {}).get("type") == "json_object":
+        return _resume_evaluation()
+    return FEEDBACK
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        content = _reply_for(body, self.server.schema_error_rate)
+        time.sleep(self.server.latency)
+        if body.get("stream"):
+            self._stream(body, content)
+        else:
+            self._complete(body, content)
+
+    def _complete(self, body, content):
+        payload = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, body, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in content.split(" "):
+            chunk = {"id": "stub", "model": body.get("model"), "choices": [{"index": 0, "delta": {"content": token + " "}}]}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+            time.sleep(self.server.token_interval)
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds before the first byte of each reply.")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="Seconds between streamed tokens.")
+    parser.add_argument("--schema-error-rate", type=float, default=0.0,
+                        help="Share of question sets answered as prose instead of JSON.")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    server.latency = args.latency
+    server.token_interval = args.token_interval
+    server.schema_error_rate = args.schema_error_rate
+    print(f"LLM stub listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,127 @@
+"""
+Job matching benchmark: top-k resumes for a job description (cvBot.vectors).
+
+Stores synthetic resumes (the generator of ``resume_search.py``) with their
+embeddings in a throwaway SQLite database, loads the vector index from it and
+times:
+
+* embedding a resume, and adding one to a loaded index
+* loading the index from the database (a worker's first query)
+* a top-k query: embedding the job description plus ranking every resume
+* the alternative without an index: keyword-scoring every stored resume
+  against the job description (``cvBot.scoring.score_resume``), measured on
+  a sample and extrapolated to the whole corpus
+
+    python benchmarks/resume_match.py                      # 100,000 resumes
+    python benchmarks/resume_match.py --resumes 20000 --dimensions 256
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from resume_search import SKILLS, _texts, setup_django
+
+
+def _job_descriptions(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "We are hiring. Requirements: " + ", ".join(rng.sample(SKILLS, 8)) + "."
+
+
+def _summary(label, timings, unit=1e3, suffix="ms"):
+    timings = sorted(timings)
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    return f"{label:>34}: median {statistics.median(timings) * unit:8.2f} {suffix}  p95 {p95 * unit:8.2f} {suffix}"
+
+
+def build(args):
+    from django.contrib.auth.models import User
+    from cvBot.models import Resume
+    from cvBot.vectors import embed_text, encode_vector
+
+    users = [User.objects.create_user(username=f"benchmark-{number}") for number in range(args.users)]
+    timings, batch = [], []
+    started = time.perf_counter()
+    for number, text in enumerate(_texts(args.resumes, args.seed, args.skills, args.filler)):
+        embedding_started = time.perf_counter()
+        embedding = encode_vector(embed_text(text))
+        timings.append(time.perf_counter() - embedding_started)
+        batch.append(Resume(
+            user=users[number % len(users)], name=f"resume-{number}.pdf", file=f"resumes/{number}.pdf",
+            extracted_text=text, embedding=embedding,
+        ))
+        if len(batch) >= args.batch_size:
+            Resume.objects.bulk_create(batch)
+            batch.clear()
+    if batch:
+        Resume.objects.bulk_create(batch)
+    print(f"stored {args.resumes} resumes with embeddings in {time.perf_counter() - started:.1f}s")
+    print(_summary("embed one resume", timings))
+    return users
+
+
+def main(args):
+    print(f"resumes={args.resumes} dimensions={args.dimensions} k={args.k}")
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["RESUME_EMBEDDING_DIMENSIONS"] = str(args.dimensions)
+        setup_django(os.path.join(workdir, "match.sqlite3"))
+
+        from cvBot.models import Resume
+        from cvBot.scoring import score_resume
+        from cvBot.vectors import ResumeVectorIndex, embed_text
+
+        users = build(args)
+
+        index = ResumeVectorIndex(dimensions=args.dimensions)
+        started = time.perf_counter()
+        index.rebuild()
+        loaded = time.perf_counter() - started
+        megabytes = len(index) * args.dimensions * 4 / 2 ** 20
+        print(f"loaded the index in {loaded:.2f}s ({len(index)} vectors, {megabytes:.0f} MiB of float32)")
+
+        resumes = list(Resume.objects.order_by("?").only("pk", "user_id", "embedding")[:args.samples])
+        timings = []
+        for resume in resumes:
+            started = time.perf_counter()
+            index.add(resume)
+            timings.append(time.perf_counter() - started)
+        print(_summary("incremental add", timings, 1e6, "us"))
+
+        job_descriptions = list(_job_descriptions(args.queries, args.seed + 1))
+        for label, user_id in (("top-k query", None), ("top-k query, one user's resumes", users[0].pk)):
+            timings = []
+            for job_description in job_descriptions:
+                started = time.perf_counter()
+                index.top_k(embed_text(job_description), args.k, user_id=user_id)
+                timings.append(time.perf_counter() - started)
+            print(_summary(label, timings))
+
+        texts = list(Resume.objects.values_list("extracted_text", flat=True)[:args.scan_sample])
+        started = time.perf_counter()
+        for text in texts:
+            score_resume(text, job_descriptions[0])
+        per_resume = (time.perf_counter() - started) / len(texts)
+        print(f"{'keyword-scoring every resume':>34}: {per_resume * args.resumes:8.2f} s "
+              f"(extrapolated from {len(texts)} resumes)")
+
+        from django.db import connection
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--skills", type=int, default=25, help="Skill words per resume.")
+    parser.add_argument("--filler", type=int, default=60, help="Filler words per resume.")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200, help="Job descriptions ranked.")
+    parser.add_argument("--samples", type=int, default=1000, help="Resumes re-added to time incremental adds.")
+    parser.add_argument("--scan-sample", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,176 @@
+"""
+Resume search benchmark: inverted index (cvBot.search) against a text scan.
+
+Creates a throwaway SQLite database with the project's migrations, stores
+synthetic resumes (a skill vocabulary with a Zipf-like distribution mixed
+with filler words), indexes them with ``index_resumes`` and times:
+
+* building the index, and reindexing one resume as ``Resume.save()`` does
+* boolean and phrase queries through ``cvBot.search.search``
+* the same queries answered by scanning every ``extracted_text`` (what a
+  ``LIKE`` would do; the column is compressed, so the scan runs in Python)
+
+Both paths must return the same number of matches, which the benchmark checks:
+
+    python benchmarks/resume_search.py                    # 100,000 resumes
+    python benchmarks/resume_search.py --resumes 20000 --scan-queries 1
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKILLS = """
+    python django flask fastapi java spring kotlin scala golang rust ruby rails php laravel symfony javascript
+    typescript react angular vue node svelte html css sass webpack graphql rest grpc kafka rabbitmq redis
+    postgresql mysql oracle mongodb cassandra elasticsearch snowflake bigquery spark hadoop airflow dbt pandas
+    numpy pytorch tensorflow keras sklearn docker kubernetes helm terraform ansible jenkins gitlab github aws
+    azure gcp linux bash nginx prometheus grafana datadog celery selenium cypress pytest junit agile scrum jira
+    figma tableau excel powerbi sap salesforce swift android ios flutter unity opencv nlp llm
+""".split()
+
+# (query, predicate on the set of a resume's words, optional phrase that must appear in the text)
+QUERIES = [
+    ("kubernetes AND django", lambda words: {"kubernetes", "django"} <= words, None),
+    ("python OR golang", lambda words: bool({"python", "golang"} & words), None),
+    ("react NOT angular", lambda words: "react" in words and "angular" not in words, None),
+    ("(spark OR hadoop) airflow NOT java", lambda words: bool({"spark", "hadoop"} & words) and "airflow" in words and "java" not in words, None),
+    ('"machine learning" pytorch', lambda words: "pytorch" in words, "machine learning"),
+    ("unity AND opencv AND flutter", lambda words: {"unity", "opencv", "flutter"} <= words, None),
+]
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def _texts(count, seed, skills_per_resume, filler_per_resume):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(SKILLS))]
+    filler = [f"{rng.choice('bcdfghklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfgklmnprst')}{i}" for i in range(5000)]
+    for _ in range(count):
+        words = rng.choices(SKILLS, weights, k=skills_per_resume) + rng.choices(filler, k=filler_per_resume)
+        rng.shuffle(words)
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words)), "machine learning")
+        yield "Summary: " + " ".join(words) + "."
+
+
+def setup_django(path):
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "thryv.settings")
+    import django
+    from django.conf import settings
+
+    settings.DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": path}}
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command("migrate", verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = OFF")
+
+
+def build(args):
+    from django.contrib.auth.models import User
+    from cvBot.models import Resume, ResumePosting
+    from cvBot.search import index_resumes
+
+    user = User.objects.create_user(username="benchmark")
+    started = time.perf_counter()
+    batch = []
+    for number, text in enumerate(_texts(args.resumes, args.seed, args.skills, args.filler)):
+        batch.append(Resume(user=user, name=f"resume-{number}.pdf", file=f"resumes/{number}.pdf", extracted_text=text))
+        if len(batch) >= args.batch_size:
+            Resume.objects.bulk_create(batch)
+            batch.clear()
+    if batch:
+        Resume.objects.bulk_create(batch)
+    stored = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resumes = Resume.objects.only("pk", "extracted_text").order_by("pk")
+    last_pk = 0
+    while page := list(resumes.filter(pk__gt=last_pk)[:args.batch_size]):
+        index_resumes(page)
+        last_pk = page[-1].pk
+    indexed = time.perf_counter() - started
+    print(f"stored {args.resumes} resumes in {stored:.1f}s; indexed them in {indexed:.1f}s "
+          f"({args.resumes / indexed:,.0f} resumes/s, {ResumePosting.objects.count():,} postings)")
+
+
+def time_reindex(samples):
+    from cvBot.models import Resume
+
+    pks = list(Resume.objects.order_by("?").values_list("pk", flat=True)[:samples])
+    timings = []
+    for resume in Resume.objects.filter(pk__in=pks):
+        resume.extracted_text += " terraform"
+        started = time.perf_counter()
+        resume.save()  # post_save reindexes the resume
+        timings.append(time.perf_counter() - started)
+    print(f"incremental save + reindex of one resume: median {statistics.median(timings) * 1e3:.2f} ms")
+
+
+def _scan(predicate, phrase):
+    from cvBot.models import Resume
+
+    matches = 0
+    for text in Resume.objects.values_list("extracted_text", flat=True).iterator(chunk_size=2000):
+        text = text.lower()
+        if (phrase is None or phrase in text) and predicate(set(_WORD.findall(text))):
+            matches += 1
+    return matches
+
+
+def time_queries(args):
+    from cvBot.search import search
+
+    print(f"{'query':>38}  {'matches':>8}  {'index median':>12}  {'scan':>9}  speed-up")
+    for query, predicate, phrase in QUERIES:
+        timings = []
+        for _ in range(args.queries):
+            started = time.perf_counter()
+            found = search(query, limit=20)
+            timings.append(time.perf_counter() - started)
+        indexed = statistics.median(timings)
+
+        scans = []
+        for _ in range(args.scan_queries):
+            started = time.perf_counter()
+            scanned = _scan(predicate, phrase)
+            scans.append(time.perf_counter() - started)
+        scan = statistics.median(scans)
+        assert scanned == found["total"], (query, scanned, found["total"])
+        print(f"{query:>38}  {found['total']:>8}  {indexed * 1e3:9.1f} ms  {scan:7.2f} s  {scan / indexed:7.0f}x")
+
+
+def main(args):
+    print(f"resumes={args.resumes} skills/resume={args.skills} filler/resume={args.filler}")
+    with tempfile.TemporaryDirectory() as workdir:
+        setup_django(os.path.join(workdir, "search.sqlite3"))
+        build(args)
+        time_reindex(args.reindex_samples)
+        time_queries(args)
+        from django.db import connection
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--skills", type=int, default=25, help="Skill words per resume.")
+    parser.add_argument("--filler", type=int, default=60, help="Filler words per resume.")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=5, help="Timed runs of each query on the index.")
+    parser.add_argument("--scan-queries", type=int, default=1, help="Timed runs of each query as a scan.")
+    parser.add_argument("--reindex-samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
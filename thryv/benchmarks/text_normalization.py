@@ -0,0 +1,104 @@
+"""
+Text normalization benchmark: thryv.text_normalization against the sanitizer it replaced.
+
+Generates large synthetic CVs in French and English (accents, typographic
+quotes and dashes, non-breaking spaces, ligatures, control and zero-width
+characters as PDF extraction leaves them) and times:
+
+* the former ``ResumeUploadView.sanitize_text``: five regex/normalize passes
+* ``normalize(text)``: one ``str.translate`` plus a whitespace collapse
+* line by line, as the evaluation prompt is built: one legacy call per line
+  against a single ``normalize_many`` call for all the lines
+
+Outputs must be identical, which the benchmark checks before timing:
+
+    python benchmarks/text_normalization.py                  # 200 CVs of ~40 KB
+    python benchmarks/text_normalization.py --cvs 50 --lines 2000
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import unicodedata
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = """
+    développeur ingénieur expérience compétences réalisé équipe données sécurité déploiement
+    Python Django PostgreSQL Kubernetes Docker AWS microservices REST API leadership management
+    conçu amélioré réduit coûts performance latence fiabilité qualité livrés clients naïve façade
+    efﬁcacité ﬂux coopération Zürich Málaga São Paulo Kraków 2019 2023 +35% 10k €
+""".split()
+NOISE = [" ", " ", "’", "“", "”", "–", "—", "•", "\t", "\x0c",
+         "\x00", "​", "­", "﻿", "™", "½", "é"]
+
+
+def legacy_sanitize(text):
+    """The former ``ResumeUploadView.sanitize_text``."""
+    text = str(text)
+    sanitized_text = re.sub(r'[\x00-\x1F\x7F]', ' ', text)
+    sanitized_text = unicodedata.normalize('NFKD', sanitized_text).encode('ASCII', 'ignore').decode('ASCII')
+    sanitized_text = re.sub(r'\s+', ' ', sanitized_text)
+    sanitized_text = sanitized_text.replace(' ', ' ')
+    sanitized_text = re.sub(r'[^\x20-\x7E]', ' ', sanitized_text)
+    return sanitized_text.strip()
+
+
+def _cvs(count, lines, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "\n".join(
+            " ".join(rng.choice(WORDS) + (rng.choice(NOISE) if rng.random() < 0.1 else "")
+                     for _ in range(rng.randint(4, 14)))
+            for _ in range(lines)
+        )
+
+
+def _time(function, items, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main(args):
+    sys.path.insert(0, PROJECT_DIR)
+    from thryv.text_normalization import normalize, normalize_many
+
+    cvs = list(_cvs(args.cvs, args.lines, args.seed))
+    megabytes = sum(len(cv.encode("utf-8")) for cv in cvs) / 2 ** 20
+    print(f"cvs={args.cvs} lines/cv={args.lines} ({megabytes:.1f} MiB of text)")
+
+    for cv in cvs:
+        assert normalize(cv) == legacy_sanitize(cv)
+        lines = cv.splitlines()
+        assert normalize_many(lines) == [legacy_sanitize(line) for line in lines]
+
+    legacy = _time(legacy_sanitize, cvs, args.runs)
+    single = _time(normalize, cvs, args.runs)
+    print(f"{'whole CV, legacy sanitizer':>34}: {legacy / args.cvs * 1e3:8.2f} ms/CV  {megabytes / legacy:7.1f} MiB/s")
+    print(f"{'whole CV, normalize':>34}: {single / args.cvs * 1e3:8.2f} ms/CV  {megabytes / single:7.1f} MiB/s"
+          f"  {legacy / single:5.1f}x")
+
+    split = [cv.splitlines() for cv in cvs]
+    legacy = _time(lambda lines: [legacy_sanitize(line) for line in lines], split, args.runs)
+    per_line = _time(lambda lines: [normalize(line) for line in lines], split, args.runs)
+    batch = _time(normalize_many, split, args.runs)
+    print(f"{'per line, legacy sanitizer':>34}: {legacy / args.cvs * 1e3:8.2f} ms/CV")
+    print(f"{'per line, normalize':>34}: {per_line / args.cvs * 1e3:8.2f} ms/CV  {legacy / per_line:5.1f}x")
+    print(f"{'per line, normalize_many':>34}: {batch / args.cvs * 1e3:8.2f} ms/CV  {legacy / batch:5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=600, help="Lines per CV.")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs; the median is reported.")
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
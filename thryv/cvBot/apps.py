@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CvbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cvBot'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,91 @@
+"""
+DB-backed queue for asynchronous resume evaluation.
+
+Uploads are stored as ResumeEvaluationJob rows by ``ResumeJobView`` and picked
+up by the ``process_resume_jobs`` management command. Workers claim rows with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so several of them can share one queue
+without an external broker.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Resume, ResumeEvaluationJob
+from .storage import file_sha256
+
+logger = logging.getLogger(__name__)
+
+
+def claim_next_job():
+    """
+    Mark the oldest pending job as running and return it.
+
+    Returns:
+        ResumeEvaluationJob | None: The claimed job, or None if the queue is empty.
+    """
+    with transaction.atomic():
+        job = (
+            ResumeEvaluationJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=ResumeEvaluationJob.Status.PENDING)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ResumeEvaluationJob.Status.RUNNING
+        job.attempts += 1
+        job.save(update_fields=["status", "attempts", "updated_at"])
+        return job
+
+
+def run_job(job):
+    """Extract, evaluate and save the resume of a claimed job."""
+    # Imported here to avoid a circular import: the views enqueue jobs
+    from .views import ResumeUploadView
+
+    view = ResumeUploadView()
+    try:
+        with job.file.open("rb") as file:
+            extracted_text = view.extract_text_from_pdf(file)
+            content_hash = file_sha256(file)
+        evaluation = view.score_and_evaluate(extracted_text, job.job_description, job.llm_evaluation)
+        with transaction.atomic():
+            job.resume = Resume.objects.create(
+                user_id=job.user_id,
+                name=job.name,
+                file=job.file.name,  # Reuse the stored upload instead of copying it
+                content_hash=content_hash,
+                extracted_text=extracted_text,
+                job_description=job.job_description,
+                **evaluation,
+            )
+            job.status = ResumeEvaluationJob.Status.DONE
+            job.error = None
+            job.save(update_fields=["resume", "status", "error", "updated_at"])
+    except Exception as e:
+        logger.error(f"Resume evaluation job {job.pk} failed: {str(e)}")
+        job.status = ResumeEvaluationJob.Status.FAILED
+        job.error = str(e)
+        job.save(update_fields=["status", "error", "updated_at"])
+
+
+def requeue_stale_jobs(stale_after, max_attempts):
+    """
+    Put back jobs left running by a worker that died.
+
+    Returns:
+        int: Number of jobs moved back to pending.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = ResumeEvaluationJob.objects.filter(
+        status=ResumeEvaluationJob.Status.RUNNING, updated_at__lt=cutoff
+    )
+    stale.filter(attempts__gte=max_attempts).update(
+        status=ResumeEvaluationJob.Status.FAILED,
+        error="Worker stopped while processing this job.",
+        updated_at=timezone.now(),
+    )
+    return stale.update(status=ResumeEvaluationJob.Status.PENDING, updated_at=timezone.now())
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from cvBot.models import Resume
+from cvBot.vectors import embed_text, encode_vector
+
+
+class Command(BaseCommand):
+    help = "Compute the job-matching embedding of resumes stored without one (or of all resumes with --all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-embed every resume, e.g. after changing RESUME_EMBEDDING_DIMENSIONS.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Resumes updated per query.")
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.only("pk", "extracted_text").order_by("pk")
+        if not options["all"]:
+            resumes = resumes.filter(embedding__isnull=True)
+        last_pk, embedded = 0, 0
+        while batch := list(resumes.filter(pk__gt=last_pk)[:options["batch_size"]]):
+            for resume in batch:
+                resume.embedding = encode_vector(embed_text(resume.extracted_text))
+            Resume.objects.bulk_update(batch, ["embedding"])
+            embedded += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(f"Embedded {embedded} resume(s); workers pick them up within RESUME_VECTOR_INDEX_MAX_AGE.")
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from cvBot.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued asynchronous resume evaluations with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Number of concurrent worker threads.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--stale-after", type=int, default=900, help="Seconds after which a running job is requeued.")
+        parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before a stale job is marked failed.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty instead of polling.")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(options["stale_after"], options["max_attempts"])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        stop = threading.Event()
+        workers = [
+            threading.Thread(target=self._work, args=(stop, options), name=f"resume-job-{i}", daemon=True)
+            for i in range(options["workers"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Processing resume jobs with {len(workers)} worker(s).")
+
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=1.0)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping after the jobs in progress...")
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def _work(self, stop, options):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                job = claim_next_job()
+                if job is None:
+                    if options["once"]:
+                        return
+                    stop.wait(options["poll_interval"])
+                    continue
+                started = time.monotonic()
+                run_job(job)
+                self.stdout.write(f"Job {job.pk} {job.status} in {time.monotonic() - started:.1f}s")
+        finally:
+            connection.close()
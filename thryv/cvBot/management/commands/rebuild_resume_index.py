@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from cvBot.models import Resume
+from cvBot.search import index_resumes
+
+
+class Command(BaseCommand):
+    help = "Rebuild the resume search index, e.g. for resumes stored before it existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Resumes indexed per transaction.")
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.only("pk", "extracted_text").order_by("pk")
+        last_pk, indexed, postings = 0, 0, 0
+        while batch := list(resumes.filter(pk__gt=last_pk)[:options["batch_size"]]):
+            postings += index_resumes(batch)
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(f"Indexed {indexed} resume(s) into {postings} posting(s).")
@@ -0,0 +1,24 @@
+import cvBot.fields
+from django.db import migrations
+
+HEAVY_FIELDS = ('extracted_text', 'suggestions', 'job_description')
+
+
+class Migration(migrations.Migration):
+    """Step 1 of 3: keep the plain text columns aside and add compressed ones under the original names."""
+
+    dependencies = [
+        ('cvBot', '0003_resumeevaluationjob'),
+    ]
+
+    operations = [
+        migrations.RenameField(model_name='resume', old_name=name, new_name=f'{name}_plain')
+        for name in HEAVY_FIELDS
+    ] + [
+        migrations.AddField(
+            model_name='resume',
+            name=name,
+            field=cvBot.fields.CompressedTextField(blank=True, null=True),
+        )
+        for name in HEAVY_FIELDS
+    ]
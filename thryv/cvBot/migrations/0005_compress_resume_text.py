@@ -0,0 +1,41 @@
+from django.db import migrations
+
+HEAVY_FIELDS = ('extracted_text', 'suggestions', 'job_description')
+BATCH_SIZE = 500
+
+
+def _copy(apps, source_suffix, target_suffix):
+    Resume = apps.get_model('cvBot', 'Resume')
+    sources = [name + source_suffix for name in HEAVY_FIELDS]
+    targets = [name + target_suffix for name in HEAVY_FIELDS]
+
+    batch = []
+    for resume in Resume.objects.only('id', *sources).order_by('id').iterator(chunk_size=BATCH_SIZE):
+        for source, target in zip(sources, targets):
+            setattr(resume, target, getattr(resume, source))
+        batch.append(resume)
+        if len(batch) >= BATCH_SIZE:
+            Resume.objects.bulk_update(batch, targets)
+            batch = []
+    if batch:
+        Resume.objects.bulk_update(batch, targets)
+
+
+def compress(apps, schema_editor):
+    _copy(apps, '_plain', '')
+
+
+def decompress(apps, schema_editor):
+    _copy(apps, '', '_plain')
+
+
+class Migration(migrations.Migration):
+    """Step 2 of 3: copy the plain text into the compressed columns."""
+
+    dependencies = [
+        ('cvBot', '0004_resume_compressed_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(compress, decompress),
+    ]
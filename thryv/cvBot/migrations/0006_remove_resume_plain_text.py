@@ -0,0 +1,16 @@
+from django.db import migrations
+
+HEAVY_FIELDS = ('extracted_text', 'suggestions', 'job_description')
+
+
+class Migration(migrations.Migration):
+    """Step 3 of 3: drop the plain text columns."""
+
+    dependencies = [
+        ('cvBot', '0005_compress_resume_text'),
+    ]
+
+    operations = [
+        migrations.RemoveField(model_name='resume', name=f'{name}_plain')
+        for name in HEAVY_FIELDS
+    ]
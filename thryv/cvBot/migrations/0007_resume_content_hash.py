@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+import cvBot.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0006_remove_resume_plain_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='resume',
+            name='file',
+            field=models.FileField(db_index=True, storage=cvBot.storage.ContentAddressedStorage(), upload_to='resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='resumeevaluationjob',
+            name='file',
+            field=models.FileField(storage=cvBot.storage.ContentAddressedStorage(), upload_to='resumes/'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+import posixpath
+import re
+
+from django.db import migrations
+
+from cvBot.storage import file_sha256
+
+BATCH_SIZE = 500
+CONTENT_NAME_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def move_to_content_addressed_storage(apps, schema_editor):
+    """Store existing uploads under their content hash, sharing identical files, and fill in content_hash."""
+    Resume = apps.get_model("cvBot", "Resume")
+    ResumeEvaluationJob = apps.get_model("cvBot", "ResumeEvaluationJob")
+    storage = Resume._meta.get_field("file").storage
+    moved = {}  # old name -> (new name, digest), or None if the file is missing
+
+    def content_addressed(name):
+        if name not in moved:
+            digest = posixpath.splitext(posixpath.basename(name))[0]
+            if CONTENT_NAME_RE.match(digest):
+                moved[name] = (name, digest)  # Already content-addressed
+            elif not storage.exists(name):
+                moved[name] = None
+            else:
+                with storage.open(name, "rb") as file:
+                    digest = file_sha256(file)
+                    moved[name] = (storage.save(name, file), digest)
+        return moved[name]
+
+    for model, fields in ((Resume, ["file", "content_hash"]), (ResumeEvaluationJob, ["file"])):
+        batch = []
+        for row in model.objects.exclude(file="").only("id", *fields).order_by("id").iterator(chunk_size=BATCH_SIZE):
+            stored = content_addressed(row.file.name)
+            if stored is None:
+                continue
+            row.file.name, digest = stored
+            if "content_hash" in fields:
+                row.content_hash = digest
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, fields)
+
+    # Every row now points at the content-addressed copy; drop the old files once that is committed
+    stale = [old_name for old_name, stored in moved.items() if stored is not None and stored[0] != old_name]
+    schema_editor.connection.on_commit(lambda: [storage.delete(name) for name in stale])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cvBot", "0007_resume_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_to_content_addressed_storage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0008_move_resumes_to_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='llm_evaluated',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='local_ats_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0009_resume_local_ats_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumePosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField()),
+                ('positions', models.BinaryField()),
+                ('resume', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='cvBot.resume')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'resume', 'frequency'], name='resume_posting_term_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumeposting',
+            constraint=models.UniqueConstraint(fields=('resume', 'term'), name='unique_resume_posting'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0010_resumeposting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0011_resume_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeevaluation',
+            name='prompt_tokens',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumeevaluation',
+            name='prompt_tokens_saved',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
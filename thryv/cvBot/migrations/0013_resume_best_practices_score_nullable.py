@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+def clear_unrated(apps, schema_editor):
+    # Resumes scored without the LLM were stored with a placeholder 0.0
+    Resume = apps.get_model('cvBot', 'Resume')
+    Resume.objects.filter(llm_evaluated=False).update(best_practices_score=None)
+
+
+def restore_placeholder(apps, schema_editor):
+    Resume = apps.get_model('cvBot', 'Resume')
+    Resume.objects.filter(best_practices_score__isnull=True).update(best_practices_score=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0012_resumeevaluation_prompt_tokens'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='resume',
+            name='best_practices_score',
+            field=models.FloatField(blank=True, default=0.0, null=True),
+        ),
+        migrations.RunPython(clear_unrated, restore_placeholder),
+    ]
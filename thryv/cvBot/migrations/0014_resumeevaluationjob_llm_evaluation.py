@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cvBot', '0013_resume_best_practices_score_nullable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeevaluationjob',
+            name='llm_evaluation',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+    ]
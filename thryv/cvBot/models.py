@@ -1,17 +1,139 @@
+import hashlib
+
 from django.db import models
 from django.contrib.auth.models import User
 
+from .fields import CompressedTextField
+from .storage import ContentAddressedStorage, file_sha256
+
+# Uploads are stored once per distinct content, named by SHA-256
+resume_storage = ContentAddressedStorage()
+
 class Resume(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
-    file = models.FileField(upload_to='resumes/')
-    extracted_text = models.TextField(blank=True, null=True)
+    # Indexed to count the rows sharing a stored file
+    file = models.FileField(upload_to='resumes/', storage=resume_storage, db_index=True)
+    # SHA-256 of the uploaded file, usable as a cache key for anything derived from it
+    content_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    extracted_text = CompressedTextField(blank=True, null=True)
+    ats_score = models.FloatField(default=0.0)
+    # Only the LLM rates best practices: None when it was skipped (llm_evaluated is False)
+    best_practices_score = models.FloatField(default=0.0, blank=True, null=True)
+    # Keyword overlap score computed locally (cvBot.scoring) before any LLM call
+    local_ats_score = models.FloatField(blank=True, null=True)
+    # False when the LLM was skipped and the scores come from the local pre-scorer
+    llm_evaluated = models.BooleanField(default=True)
+    suggestions = CompressedTextField(blank=True, null=True)
+    job_description = CompressedTextField(blank=True, null=True)
+    # float32 vector of extracted_text for job matching (cvBot.vectors), set on save
+    embedding = models.BinaryField(blank=True, null=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Large fields left out of listings
+    HEAVY_FIELDS = ('extracted_text', 'suggestions', 'job_description', 'embedding')
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        # Hash new uploads; rows built from an already stored file set content_hash themselves
+        if not self.content_hash and self.file and not self.file._committed:
+            self.content_hash = file_sha256(self.file)
+        # Re-embed whenever the text may have changed
+        update_fields = kwargs.get('update_fields')
+        if 'extracted_text' not in self.get_deferred_fields() and (
+            update_fields is None or 'extracted_text' in update_fields
+        ):
+            # Imported here so loading the models doesn't load NumPy
+            from .vectors import embed_text, encode_vector
+
+            self.embedding = encode_vector(embed_text(self.extracted_text))
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'embedding'}
+        super().save(*args, **kwargs)
+
+
+class ResumeEvaluationJob(models.Model):
+    """Resume upload queued for evaluation by the process_resume_jobs command."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255, blank=True, null=True)
+    file = models.FileField(upload_to='resumes/', storage=resume_storage)
+    job_description = models.TextField()
+    # "auto", "always" or "never" as sent with the upload; None uses RESUME_LLM_EVALUATION when the job runs
+    llm_evaluation = models.CharField(max_length=10, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    resume = models.ForeignKey(Resume, on_delete=models.SET_NULL, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+def stored_file_references(name):
+    """Reference count of a stored upload: the resumes and evaluation jobs pointing at ``name``."""
+    return Resume.objects.filter(file=name).count() + ResumeEvaluationJob.objects.filter(file=name).count()
+
+
+class ResumeEvaluation(models.Model):
+    """Cached Groq evaluation of a resume text against a job description."""
+    cache_key = models.CharField(max_length=64, unique=True)
     ats_score = models.FloatField(default=0.0)
     best_practices_score = models.FloatField(default=0.0)
     suggestions = models.TextField(blank=True, null=True)
-    job_description = models.TextField(blank=True, null=True)
+    llm_seconds = models.FloatField(default=0.0)  # How long the Groq call took
+    # Estimated size of the prompt sent, and tokens cut from it to fit the budget
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    prompt_tokens_saved = models.PositiveIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @staticmethod
+    def make_key(sanitized_text, sanitized_job_description):
+        """Hash the sanitized resume text and job description into a cache key."""
+        payload = f"{sanitized_text}\x1f{sanitized_job_description}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def __str__(self):
-        return self.name
+        return self.cache_key
+
+
+class ResumePosting(models.Model):
+    """
+    Entry of the resume search index: where one term occurs in one resume.
+
+    Maintained by ``cvBot.search`` whenever a resume's text is saved.
+    """
+    term = models.CharField(max_length=64)
+    # Indexed by unique_resume_posting, which starts with it
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='postings', db_index=False)
+    frequency = models.PositiveIntegerField()
+    # Term positions in the resume text, packed as little-endian uint32
+    positions = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'term'], name='unique_resume_posting'),
+        ]
+        indexes = [
+            # Covers the postings lookup of a query term: no table access per posting
+            models.Index(fields=['term', 'resume', 'frequency'], name='resume_posting_term_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} in resume {self.resume_id}"
@@ -0,0 +1,10 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ResumeCursorPagination(CursorPagination):
+    """Newest-first cursor pagination for resume listings."""
+    ordering = ('-created_at', '-id')
+    page_size = settings.RESUME_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.RESUME_MAX_PAGE_SIZE
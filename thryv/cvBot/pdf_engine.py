@@ -0,0 +1,164 @@
+"""
+PDF text extraction on a process pool.
+
+PyMuPDF holds the GIL while it parses, so extraction runs in separate worker
+processes with a cap on pages, on wall-clock time and on extracted characters.
+Neither Django nor PyMuPDF is imported at module level: the spawned workers
+stay cheap to start and the web process never loads PyMuPDF at all.
+
+A job is only submitted once a worker is free, and its time budget starts
+when the worker picks it up, so waiting behind other uploads never counts
+against it. A worker stuck on one page past the budget can't be interrupted:
+it is killed on its own, and ``multiprocessing.Pool`` starts a replacement
+while the jobs of the other workers carry on.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+# Extra time the caller waits beyond the budget before giving up on a worker
+_TIMEOUT_GRACE_SECONDS = 2.0
+
+# In the workers: per slot, the job the parent wants run and the pid running it (0 when none)
+_slot_jobs = None
+_slot_pids = None
+
+
+def _init_worker(slot_jobs, slot_pids):
+    global _slot_jobs, _slot_pids
+    _slot_jobs, _slot_pids = slot_jobs, slot_pids
+
+
+def _extract_text(data, max_pages, max_chars, timeout, slot, job):
+    """Runs in a worker process: extract text page by page until a budget is spent."""
+    with _slot_pids.get_lock():
+        if _slot_jobs[slot] != job:
+            return None  # The caller gave up before the job started
+        _slot_pids[slot] = os.getpid()
+    try:
+        import fitz  # PyMuPDF; only the worker processes need it
+
+        deadline = time.monotonic() + timeout
+        parts = []
+        total_chars = 0
+        with fitz.open(stream=data, filetype="pdf") as pdf_document:
+            if pdf_document.page_count == 0:
+                raise ValueError("The PDF has no pages.")
+            for page_number, page in enumerate(pdf_document):
+                # The first page is always read, so a result is never silently empty
+                if page_number >= max_pages or (page_number and time.monotonic() >= deadline):
+                    break
+                text = page.get_text()
+                parts.append(text)
+                total_chars += len(text)
+                if total_chars >= max_chars:
+                    break
+        return "".join(parts)[:max_chars].strip()
+    finally:
+        with _slot_pids.get_lock():
+            _slot_pids[slot] = 0
+
+
+class PDFExtractionEngine:
+    """Extracts text from PDF bytes on a shared pool of worker processes."""
+
+    def __init__(self, max_workers, max_pages, timeout, max_chars):
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._pool = None
+        self._lock = threading.Lock()
+        self._jobs = 0
+        # One slot per worker: holding a slot means a worker is free for the job
+        self._free_slots = queue.SimpleQueue()
+        for slot in range(max_workers):
+            self._free_slots.put(slot)
+        context = multiprocessing.get_context("spawn")
+        self._context = context
+        self._slot_pids = context.Array("q", max_workers)
+        self._slot_jobs = context.Array("q", max_workers, lock=self._slot_pids.get_lock())
+
+    def extract(self, data):
+        """
+        Extract text from a PDF document.
+
+        Args:
+            data (bytes): Raw PDF bytes.
+
+        Returns:
+            str: Text of at most ``max_pages`` pages and ``max_chars`` characters.
+
+        Raises:
+            ValueError: If the PDF cannot be parsed or the time budget is exceeded.
+        """
+        slot = self._free_slots.get()  # Wait for a worker; the budget starts in the worker
+        try:
+            with self._lock:
+                self._jobs += 1
+                job = self._jobs
+            with self._slot_pids.get_lock():
+                self._slot_jobs[slot] = job
+            result = self._get_pool().apply_async(
+                _extract_text, (data, self.max_pages, self.max_chars, self.timeout, slot, job)
+            )
+            try:
+                return result.get(timeout=self.timeout + _TIMEOUT_GRACE_SECONDS)
+            except multiprocessing.TimeoutError:
+                self._abandon(slot)
+                raise ValueError(f"PDF extraction exceeded {self.timeout}s time budget.")
+            except Exception as e:
+                raise ValueError(str(e))
+        finally:
+            self._free_slots.put(slot)
+
+    def _abandon(self, slot):
+        """Give up on the job of ``slot``: kill its worker if it started, else make sure it never does."""
+        with self._slot_pids.get_lock():
+            self._slot_jobs[slot] = 0
+            pid = self._slot_pids[slot]
+            if pid:
+                # A single page is taking too long; the pool replaces the killed worker
+                os.kill(pid, signal.SIGTERM)
+                self._slot_pids[slot] = 0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._context.Pool(
+                    processes=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self._slot_jobs, self._slot_pids),
+                )
+            return self._pool
+
+    def close(self):
+        """Stop the worker processes; the next extraction starts new ones."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_pdf_engine():
+    """Return the process-wide engine configured from the PDF_EXTRACTION_* settings."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            from django.conf import settings
+
+            _engine = PDFExtractionEngine(
+                max_workers=settings.PDF_EXTRACTION_WORKERS,
+                max_pages=settings.PDF_EXTRACTION_MAX_PAGES,
+                timeout=settings.PDF_EXTRACTION_TIMEOUT,
+                max_chars=settings.PDF_EXTRACTION_MAX_CHARS,
+            )
+        return _engine
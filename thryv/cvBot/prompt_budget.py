@@ -0,0 +1,191 @@
+"""
+Token budgeting for the resume evaluation prompt.
+
+Long CVs make the Groq call slower and more expensive and can overflow the
+context window, while most of what decides an ATS evaluation sits in a few
+sections. Before the prompt is built, the resume is split into sections by
+their headings (English and French), and when it is over budget the sections
+that matter least are cut first: references and interests are dropped, then
+languages and unrecognized sections, the contact header, education and
+projects are shortened to their first lines, and experience and skills go
+last. A shortened section keeps its heading and ends with ``[...]``, so the
+model knows content was left out.
+
+Token counts are estimates: one token per run of up to four letters or
+digits and per punctuation mark, which matches or slightly overestimates
+Llama-family tokenizers on English and French text, so a budget is kept
+rather than exceeded.
+"""
+import math
+import re
+
+from thryv.text_normalization import normalize
+
+_TOKEN_PIECE = re.compile(r"\w{1,4}|[^\w\s]")
+_HEADING_WORDS = re.compile(r"[^a-z ]+")
+
+# Marker closing a shortened section
+ELLIPSIS = "[...]"
+
+# Section kinds by heading (accent-free, lowercase)
+SECTION_HEADINGS = {
+    "summary": {"summary", "profile", "professional summary", "about me", "objective", "career objective",
+                "profil", "resume", "a propos", "objectif"},
+    "experience": {"experience", "experiences", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "experience professionnelle",
+                   "experiences professionnelles", "parcours professionnel"},
+    "skills": {"skills", "technical skills", "key skills", "core competencies", "competencies", "technologies",
+               "tech stack", "competences", "competences techniques"},
+    "projects": {"projects", "personal projects", "key projects", "projets", "projets personnels"},
+    "education": {"education", "academic background", "qualifications", "formation", "formations", "diplomes",
+                  "etudes", "parcours academique"},
+    "certifications": {"certifications", "certificates", "licenses", "certificats"},
+    "languages": {"languages", "langues"},
+    "interests": {"interests", "hobbies", "activities", "centres d interet", "loisirs", "activites"},
+    "references": {"references", "referees"},
+}
+_KIND_BY_HEADING = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# How much a section matters to the evaluation; lower priorities are cut first
+SECTION_PRIORITY = {
+    "references": 0,
+    "interests": 0,
+    "languages": 1,
+    "other": 1,
+    "header": 2,
+    "certifications": 2,
+    "education": 3,
+    "projects": 3,
+    "summary": 4,
+    "experience": 5,
+    "skills": 5,
+}
+
+# Headings are short lines; longer ones are content that happens to start with "Experience"
+_MAX_HEADING_LENGTH = 40
+
+
+def estimate_tokens(text):
+    """Estimated number of LLM tokens in ``text``."""
+    return len(_TOKEN_PIECE.findall(text)) if text else 0
+
+
+def _heading_kind(line):
+    if len(line) > _MAX_HEADING_LENGTH:
+        return None
+    return _KIND_BY_HEADING.get(" ".join(_HEADING_WORDS.sub(" ", normalize(line).lower()).split()))
+
+
+def split_sections(text):
+    """
+    Split a resume into sections at their headings.
+
+    Returns:
+        list: ``{"kind", "lines"}`` dicts in resume order. Lines before the first
+        heading form a ``header`` section; unknown headings can't be told from
+        content, so their lines stay in the section above them.
+    """
+    sections = [{"kind": "header", "lines": []}]
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        kind = _heading_kind(line)
+        if kind:
+            sections.append({"kind": kind, "lines": [line]})
+        else:
+            sections[-1]["lines"].append(line)
+    return [section for section in sections if section["lines"]]
+
+
+def _shorten(lines, max_tokens, has_heading):
+    """Keep the first lines (and the heading) of a section within ``max_tokens``."""
+    if sum(estimate_tokens(line) for line in lines) <= max_tokens:
+        return lines
+    max_tokens -= estimate_tokens(ELLIPSIS)
+    kept, used = [], 0
+    for number, line in enumerate(lines):
+        cost = estimate_tokens(line)
+        if used + cost > max_tokens and not (has_heading and number == 0):
+            # Keep the start of a line that doesn't fit whole, word by word
+            words = []
+            for word in line.split():
+                cost = estimate_tokens(word)
+                if used + cost > max_tokens:
+                    break
+                words.append(word)
+                used += cost
+            if any(word[0].isalnum() for word in words):
+                kept.append(" ".join(words))
+            # A heading without content isn't worth its tokens
+            if len(kept) == int(has_heading):
+                return []
+            kept.append(ELLIPSIS)
+            return kept
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def truncate_tokens(text, max_tokens):
+    """Cut ``text`` after about ``max_tokens`` tokens."""
+    pieces = list(_TOKEN_PIECE.finditer(text))
+    if len(pieces) <= max_tokens:
+        return text
+    text = text[:pieces[max_tokens].start()].rstrip()
+    return text if text.endswith(ELLIPSIS) else f"{text} {ELLIPSIS}"
+
+
+def fit_resume(text, max_tokens):
+    """
+    Shorten a resume to about ``max_tokens`` tokens, least valuable sections first.
+
+    Args:
+        text (str): Resume text with its line breaks.
+        max_tokens (int): Token budget for the resume.
+
+    Returns:
+        dict: ``text``, the (possibly shortened) resume with one line per line;
+        ``original_tokens`` and ``tokens``, its estimated size before and
+        after; and ``trimmed_sections``, the kinds of the sections cut.
+    """
+    sections = split_sections(text)
+    for section in sections:
+        section["tokens"] = sum(estimate_tokens(line) for line in section["lines"])
+    original_tokens = sum(section["tokens"] for section in sections)
+    total = original_tokens
+    trimmed = []
+
+    for priority in sorted(set(SECTION_PRIORITY.values())):
+        excess = total - max_tokens
+        if excess <= 0:
+            break
+        level = [section for section in sections if SECTION_PRIORITY.get(section["kind"], 1) == priority]
+        level_tokens = sum(section["tokens"] for section in level)
+        if not level_tokens:
+            continue
+        # Every section of the level gives up the same share of its tokens
+        keep_ratio = max(level_tokens - excess, 0) / level_tokens
+        for section in level:
+            if priority == 0:
+                lines = []
+            else:
+                allowance = math.floor(section["tokens"] * keep_ratio)
+                lines = _shorten(section["lines"], allowance, has_heading=section["kind"] != "header")
+                if lines == section["lines"]:
+                    continue
+            tokens = sum(estimate_tokens(line) for line in lines)
+            total -= section["tokens"] - tokens
+            section["lines"], section["tokens"] = lines, tokens
+            trimmed.append(section["kind"])
+
+    fitted = "\n".join(line for section in sections for line in section["lines"])
+    if total > max_tokens:
+        # Headings and ellipses alone are over budget
+        fitted = truncate_tokens(fitted, max_tokens)
+    return {
+        "text": fitted,
+        "original_tokens": original_tokens,
+        "tokens": estimate_tokens(fitted),
+        "trimmed_sections": trimmed,
+    }
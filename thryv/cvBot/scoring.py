@@ -0,0 +1,91 @@
+"""
+Local keyword pre-scorer for resumes.
+
+Scores how well a resume covers the vocabulary of a job description in a
+couple of milliseconds, without calling the LLM. Each distinct job description
+term is weighted by how often the job description repeats it (1 + log tf), and
+credited by its BM25 term-frequency saturation in the resume, so one mention in
+a normal-length resume counts fully and padding a long resume with keywords
+doesn't. The score is the weighted coverage, from 0 to 100.
+
+Counting and matching are vectorized with NumPy: both texts are reduced to
+sorted unique terms with their counts and joined with ``searchsorted``.
+NumPy is imported on first use, so importing the models doesn't load it.
+"""
+import re
+
+# BM25 parameters; AVERAGE_RESUME_TERMS is the length that gets no length penalty
+K1 = 1.2
+B = 0.75
+AVERAGE_RESUME_TERMS = 400
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Function words (English and French) and job-posting boilerplate that every
+# resume and job description share, which would otherwise inflate mismatches
+STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been being both but by can could did do does doing
+    for from had has have having he her here him his how i if in into is it its just me more most my no nor
+    not of on once only or other our out over own same she should so some such than that the their them then
+    there these they this those through to too under until up very was we were what when where which while who
+    whom why will with would you your
+    au aux avec ce ces dans de des du elle en et eux il je la le les leur lui ma mais me meme mes moi mon ne
+    nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos votre vous
+    ability able candidate candidates experience experienced including job knowledge looking must plus position
+    preferred required requirements responsibilities role skills strong team work working year years
+""".split())
+
+
+def terms(text):
+    """All lowercase terms of ``text``, in order."""
+    return _TOKEN.findall(text.lower())
+
+
+def is_keyword(term):
+    """Whether ``term`` carries meaning: not a stopword or a one-letter token."""
+    return len(term) > 1 and term not in STOPWORDS
+
+
+def tokenize(text):
+    """Lowercase terms of ``text`` without stopwords or one-letter tokens."""
+    return [term for term in terms(text) if is_keyword(term)]
+
+
+def score_resume(resume_text, job_description, missing_limit=10):
+    """
+    Score the keyword overlap between a resume and a job description.
+
+    Args:
+        resume_text (str): Sanitized resume text.
+        job_description (str): Sanitized job description.
+        missing_limit (int): How many missing job description terms to report.
+
+    Returns:
+        dict: ``score`` from 0 to 100, and ``missing_keywords``, the heaviest job
+        description terms absent from the resume.
+    """
+    import numpy as np
+
+    job_terms, job_counts = np.unique(np.array(tokenize(job_description), dtype=str), return_counts=True)
+    if job_terms.size == 0:
+        return {"score": 0.0, "missing_keywords": []}
+    resume_tokens = tokenize(resume_text)
+    resume_terms, resume_counts = np.unique(np.array(resume_tokens, dtype=str), return_counts=True)
+
+    # Frequency in the resume of every job description term (0 when absent)
+    if resume_terms.size:
+        positions = np.minimum(np.searchsorted(resume_terms, job_terms), resume_terms.size - 1)
+        found = resume_terms[positions] == job_terms
+        tf = np.where(found, resume_counts[positions], 0).astype(np.float64)
+    else:
+        found = np.zeros(job_terms.size, dtype=bool)
+        tf = np.zeros(job_terms.size)
+
+    length_norm = 1 - B + B * len(resume_tokens) / AVERAGE_RESUME_TERMS
+    credit = np.minimum(tf * (K1 + 1) / (tf + K1 * length_norm), 1.0)
+    weights = 1 + np.log(job_counts)
+
+    score = float(100 * np.dot(weights, credit) / weights.sum())
+    missing = np.flatnonzero(~found)
+    heaviest = missing[np.argsort(-weights[missing], kind="stable")][:missing_limit]
+    return {"score": round(score, 1), "missing_keywords": job_terms[heaviest].tolist()}
@@ -4,4 +4,14 @@ from .models import Resume
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['embedding']
+
+
+class ResumeSummarySerializer(serializers.ModelSerializer):
+    """
+    Lightweight serializer for resume listings, without the large text fields.
+    """
+    class Meta:
+        model = Resume
+        fields = ['id', 'user', 'name', 'file', 'ats_score', 'best_practices_score', 'created_at', 'updated_at']
+        read_only_fields = fields
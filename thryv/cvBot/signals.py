@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Resume, ResumeEvaluationJob
+from .search import index_resume
+from .storage import release_file
+from .vectors import resume_index
+
+
+@receiver(post_delete, sender=Resume)
+@receiver(post_delete, sender=ResumeEvaluationJob)
+def release_uploaded_file(sender, instance, **kwargs):
+    """Delete the stored upload once the last row referencing it is gone."""
+    storage, name = instance.file.storage, instance.file.name
+    if name:
+        # Count references only after the delete is committed
+        transaction.on_commit(lambda: release_file(storage, name))
+
+
+@receiver(post_delete, sender=Resume)
+def remove_from_vector_index(sender, instance, **kwargs):
+    # Django sets instance.pk to None once the delete is done, before on_commit runs
+    pk = instance.pk
+    transaction.on_commit(lambda: resume_index.remove(pk))
+
+
+@receiver(post_save, sender=Resume)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Reindex a resume whose text may have changed (bulk_create callers index themselves)."""
+    if update_fields is None or 'extracted_text' in update_fields:
+        index_resume(instance)
+
+
+@receiver(post_save, sender=Resume)
+def update_vector_index(sender, instance, update_fields=None, **kwargs):
+    """Keep this worker's vector index in step with the embedding Resume.save() computed."""
+    if update_fields is None or 'embedding' in update_fields:
+        transaction.on_commit(lambda: resume_index.add(instance))
@@ -0,0 +1,88 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+Files are named after the SHA-256 of their bytes (``resumes/ab/abcd….pdf``),
+so uploading the same CV again reuses the stored blob instead of writing a
+copy. Rows point at blobs by name; a blob is deleted once no row references
+it any more (see ``cvBot.signals``).
+
+Reusing a blob touches it, and ``release_file`` leaves blobs touched within
+``MEDIA_ORPHAN_GRACE`` to the media sweeper: an identical upload can reuse a
+blob after its last reference was counted but before its row is committed,
+and must not be left pointing at a deleted file.
+"""
+import hashlib
+import os
+import posixpath
+import time
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+def file_sha256(file):
+    """Return the SHA-256 hex digest of a Django ``File``, leaving it rewound."""
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and stores each content once."""
+
+    def content_name(self, name, digest):
+        """Storage name for content with ``digest`` uploaded as ``name``."""
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def _save(self, name, content):
+        name = self.content_name(name, file_sha256(content))
+        try:
+            # Reuse the stored copy, marking it as in use again for release_file
+            os.utime(self.path(name))
+            return name
+        except FileNotFoundError:
+            pass
+        saved_name = super()._save(name, content)
+        if saved_name != name:
+            # An identical upload was stored first in the meantime; keep that copy
+            self.delete(saved_name)
+        return name
+
+
+def release_file(storage, name, grace=None):
+    """
+    Delete the stored file ``name`` if no resume or evaluation job references it any more.
+
+    Files touched within ``grace`` seconds (``MEDIA_ORPHAN_GRACE`` by default)
+    may be about to be referenced by an identical upload and are kept.
+
+    Returns:
+        bool: Whether the file was deleted.
+    """
+    from django.conf import settings
+
+    from .models import stored_file_references
+
+    grace = settings.MEDIA_ORPHAN_GRACE if grace is None else grace
+    if not name or stored_file_references(name):
+        return False
+    path = storage.path(name)
+    try:
+        if time.time() - os.path.getmtime(path) < grace:
+            return False
+        # Move it aside first, so a reuse racing with the checks above can be detected and undone
+        tombstone = f"{path}.{uuid.uuid4().hex}.deleting"
+        os.rename(path, tombstone)
+    except FileNotFoundError:
+        return False
+    if time.time() - os.path.getmtime(tombstone) < grace or stored_file_references(name):
+        os.replace(tombstone, path)  # Same content, so restoring over a fresh copy is harmless
+        return False
+    os.remove(tombstone)
+    return True
@@ -1,3 +1,489 @@
-from django.test import TestCase
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+import fitz
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .jobs import claim_next_job, run_job
+from .models import (
+    Resume, ResumeEvaluation, ResumeEvaluationJob, ResumePosting, resume_storage, stored_file_references,
+)
+from .pdf_engine import PDFExtractionEngine
+from .prompt_budget import estimate_tokens, fit_resume, split_sections
+from .scoring import score_resume
+from .storage import release_file
+from .vectors import embed_text, encode_vector, resume_index
+from .views import PROMPT_TOKENS, ResumeUploadView
+
+
+def _make_pdf(pages):
+    pdf_document = fitz.open()
+    for page_text in pages:
+        pdf_document.new_page().insert_text((72, 72), page_text)
+    data = pdf_document.tobytes()
+    pdf_document.close()
+    return data
+
+
+class PDFExtractionEngineTestCase(SimpleTestCase):
+    def test_page_and_character_caps(self):
+        engine = PDFExtractionEngine(max_workers=1, max_pages=2, timeout=30, max_chars=100)
+        self.addCleanup(engine.close)
+
+        text = engine.extract(_make_pdf(["first page", "second page", "third page"]))
+        self.assertIn("first page", text)
+        self.assertIn("second page", text)
+        self.assertNotIn("third page", text)
+
+        engine.max_chars = 5
+        self.assertEqual(engine.extract(_make_pdf(["first page"])), "first")
+
+    def test_time_waiting_for_a_worker_is_not_budgeted(self):
+        engine = PDFExtractionEngine(max_workers=1, max_pages=2, timeout=0.5, max_chars=100)
+        self.addCleanup(engine.close)
+        data = _make_pdf(["first page"])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            texts = list(executor.map(lambda _: engine.extract(data), range(4)))
+        self.assertEqual(texts, ["first page"] * 4)
+
+    def test_invalid_pdf_raises_value_error(self):
+        engine = PDFExtractionEngine(max_workers=1, max_pages=2, timeout=30, max_chars=100)
+        self.addCleanup(engine.close)
+        with self.assertRaises(ValueError):
+            engine.extract(b"not a pdf")
+
+
+class DeferredImportsTestCase(SimpleTestCase):
+    def test_loading_the_apps_does_not_import_numpy(self):
+        code = "import sys, django; django.setup(); print('numpy' in sys.modules)"
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+class ResumeEvaluationCacheTestCase(TestCase):
+    def test_second_evaluation_is_served_from_cache(self):
+        view = ResumeUploadView()
+
+        with mock.patch("cvBot.views.get_llm_gateway") as gateway:
+            gateway.return_value.complete.return_value = (
+                '{"ats_score": 72, "best_practices_score": 64, "suggestions": "Add metrics."}'
+            )
+            first = view.evaluate_resume("Python developer", "Backend engineer")
+            second = view.evaluate_resume("Python  developer ", "Backend engineer")
+
+        self.assertEqual(first, (72, 64, "Add metrics."))
+        self.assertEqual(second, first)
+        self.assertEqual(gateway.return_value.complete.call_count, 1)
+        self.assertEqual(ResumeEvaluation.objects.get().hit_count, 1)
+
+        stats = self.client.get("/api/v1/resumes/evaluation-cache/stats/").json()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+
+class ResumeBatchUploadTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="recruiter", password="password123")
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_batch_is_ranked_by_ats_score(self):
+        scores = {"junior.pdf": 40.0, "senior.pdf": 90.0, "broken.pdf": None}
+
+        def evaluate(view, text, job_description):
+            if scores[text] is None:
+                raise ValueError("Groq unavailable")
+            return scores[text], 50.0, "Fine."
+
+        files = [SimpleUploadedFile(name, b"%PDF-1.4", content_type="application/pdf") for name in scores]
+        with mock.patch("cvBot.views.ResumeBatchUploadView.extract_text_from_pdf", lambda view, f: f.name), \
+                mock.patch("cvBot.views.ResumeBatchUploadView.evaluate_resume", evaluate), \
+                mock.patch("cvBot.views.connection"):
+            response = self.client.post("/api/v1/resumes/batch-upload/", {
+                "user_id": self.user.id,
+                "job_description": "Backend engineer",
+                "llm_evaluation": "always",
+                "files": files,
+            })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([r["name"] for r in response.json()["results"]], ["senior.pdf", "junior.pdf"])
+        self.assertEqual(response.json()["errors"], [{"file": "broken.pdf", "error": "Groq unavailable"}])
+        self.assertEqual(Resume.objects.count(), 2)
+
+
+class ResumeJobTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="candidate", password="password123")
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_job_is_queued_then_processed(self):
+        response = self.client.post("/api/v1/resumes/jobs/", {
+            "user_id": self.user.id,
+            "job_description": "Python developer",
+            "name": "cv.pdf",
+            "file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+        })
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()["status_url"]
+        self.assertEqual(self.client.get(status_url).json()["status"], "pending")
+
+        job = claim_next_job()
+        self.assertEqual(job.status, ResumeEvaluationJob.Status.RUNNING)
+        self.assertIsNone(claim_next_job())
+        with mock.patch("cvBot.views.ResumeUploadView.extract_text_from_pdf", return_value="Python developer"), \
+                mock.patch("cvBot.views.ResumeUploadView.evaluate_resume", return_value=(80.0, 70.0, "Good.")):
+            run_job(job)
+
+        body = self.client.get(status_url).json()
+        self.assertEqual(body["status"], "done")
+        self.assertEqual(body["resume"]["ats_score"], 80.0)
+
+    def test_job_applies_the_llm_evaluation_option(self):
+        def queue(llm_evaluation):
+            return self.client.post("/api/v1/resumes/jobs/", {
+                "user_id": self.user.id,
+                "job_description": "Python developer",
+                "name": "cv.pdf",
+                "file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+                "llm_evaluation": llm_evaluation,
+            })
+
+        self.assertEqual(queue("sometimes").status_code, 400)
+        self.assertEqual(queue("never").status_code, 202)
+
+        job = claim_next_job()
+        self.assertEqual(job.llm_evaluation, "never")
+        with mock.patch("cvBot.views.ResumeUploadView.extract_text_from_pdf", return_value="Python developer"), \
+                mock.patch("cvBot.views.ResumeUploadView.evaluate_resume") as llm:
+            run_job(job)
+
+        llm.assert_not_called()
+        job.refresh_from_db()
+        self.assertFalse(job.resume.llm_evaluated)
+
+
+class ResumeStorageTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="storage", password="x")
+        self.text = "Python developer with Django and PostgreSQL experience. " * 200
+        for number in range(3):
+            Resume.objects.create(
+                user=self.user,
+                name=f"resume-{number}.pdf",
+                file="resumes/resume.pdf",
+                extracted_text=self.text,
+                suggestions="Add metrics.",
+                job_description="Backend Engineer",
+            )
+
+    def test_heavy_text_is_stored_compressed(self):
+        resume = Resume.objects.first()
+        self.assertEqual(resume.extracted_text, self.text)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT extracted_text FROM {Resume._meta.db_table} WHERE id = %s", [resume.id])
+            stored = bytes(cursor.fetchone()[0])
+        self.assertLess(len(stored), len(self.text) / 10)
+
+    def test_listing_defers_heavy_fields(self):
+        response = self.client.get("/api/v1/resumes/", {"user_id": self.user.id, "page_size": 2})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([item["name"] for item in body["results"]], ["resume-2.pdf", "resume-1.pdf"])
+        self.assertNotIn("extracted_text", body["results"][0])
+        self.assertIsNotNone(body["next"])
+
+        full = self.client.get("/api/v1/resumes/", {"detail": "full"}).json()
+        self.assertEqual(full["results"][0]["extracted_text"], self.text)
+
+
+class ContentAddressedStorageTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="dedupe", password="x")
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _upload(self, job_description):
+        with mock.patch("cvBot.views.ResumeUploadView.extract_text_from_pdf", return_value="Python developer"), \
+                mock.patch("cvBot.views.ResumeUploadView.evaluate_resume", return_value=(80.0, 70.0, "Good.")):
+            return self.client.post("/api/v1/resumes/upload/", {
+                "user_id": self.user.id,
+                "job_description": job_description,
+                "name": "cv.pdf",
+                "file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 same bytes", content_type="application/pdf"),
+            })
+
+    def test_identical_uploads_share_one_file_until_the_last_reference_goes(self):
+        self.assertEqual(self._upload("Backend engineer").status_code, 201)
+        self.assertEqual(self._upload("Data engineer").status_code, 201)
+
+        first, second = Resume.objects.order_by("id")
+        digest = hashlib.sha256(b"%PDF-1.4 same bytes").hexdigest()
+        self.assertEqual(first.content_hash, digest)
+        self.assertEqual(first.file.name, f"resumes/{digest[:2]}/{digest}.pdf")
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertEqual(stored_file_references(first.file.name), 2)
+
+        path = first.file.path
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(os.path.exists(path))
+        with override_settings(MEDIA_ORPHAN_GRACE=0), self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_recently_reused_file_is_left_to_the_sweeper(self):
+        self.assertEqual(self._upload("Backend engineer").status_code, 201)
+        resume = Resume.objects.get()
+        path = resume.file.path
+        os.utime(path, (time.time() - 7200, time.time() - 7200))
+
+        # An identical upload reuses the file before its row is saved
+        self.assertEqual(resume_storage.save("resumes/cv.pdf", ContentFile(b"%PDF-1.4 same bytes")), resume.file.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            resume.delete()
+        self.assertTrue(os.path.exists(path))
+        self.assertTrue(release_file(resume_storage, resume.file.name, grace=0))
+        self.assertFalse(os.path.exists(path))
+
+
+class LocalPreScoringTestCase(TestCase):
+    job_description = "Senior Python Django developer with PostgreSQL, Docker and AWS. Python and REST APIs."
+
+    def test_scores_keyword_overlap(self):
+        match = score_resume("Python developer. Built Django REST APIs on PostgreSQL with Docker on AWS.", self.job_description)
+        mismatch = score_resume("Pastry chef with 10 years of experience in French bakeries.", self.job_description)
+
+        self.assertGreater(match["score"], 80)
+        self.assertEqual(match["missing_keywords"], ["senior"])
+        self.assertEqual(mismatch["score"], 0.0)
+        self.assertEqual(mismatch["missing_keywords"][0], "python")  # Mentioned twice, so weighted highest
+        self.assertEqual(score_resume("Python", "")["score"], 0.0)
+
+    def _upload(self, resume_text, **extra):
+        user = User.objects.create_user(username=f"prescore-{User.objects.count()}", password="x")
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        with override_settings(MEDIA_ROOT=media_root.name), \
+                mock.patch("cvBot.views.ResumeUploadView.extract_text_from_pdf", return_value=resume_text), \
+                mock.patch("cvBot.views.ResumeUploadView.evaluate_resume", return_value=(80.0, 70.0, "Good.")) as llm:
+            response = self.client.post("/api/v1/resumes/upload/", {
+                "user_id": user.id,
+                "job_description": self.job_description,
+                "name": "cv.pdf",
+                "file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+                **extra,
+            })
+        return response, llm
+
+    def test_clear_mismatch_skips_the_llm(self):
+        response, llm = self._upload("Pastry chef with 10 years of experience in French bakeries.")
+
+        self.assertEqual(response.status_code, 201)
+        llm.assert_not_called()
+        body = response.json()
+        self.assertFalse(body["llm_evaluated"])
+        self.assertEqual(body["ats_score"], 0.0)
+        self.assertIsNone(body["best_practices_score"])
+        self.assertIn("python", body["suggestions"])
+
+    def test_llm_runs_for_a_match_or_on_request(self):
+        response, llm = self._upload("Python Django developer, PostgreSQL, Docker, AWS, REST APIs.")
+        self.assertTrue(response.json()["llm_evaluated"])
+        self.assertEqual(response.json()["ats_score"], 80.0)
+
+        response, llm = self._upload("Pastry chef.", llm_evaluation="always")
+        llm.assert_called_once()
+        self.assertEqual(response.json()["local_ats_score"], 0.0)
+
+        response, llm = self._upload("Pastry chef.", llm_evaluation="sometimes")
+        self.assertEqual(response.status_code, 400)
+
+
+class ResumeSearchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="search", password="x")
+        other = User.objects.create_user(username="search-other", password="x")
+        texts = {
+            "k8s.pdf": "Platform engineer: Kubernetes, Django, Python. Kubernetes operators and Helm.",
+            "ml.pdf": "Data scientist in machine learning with Python and Django dashboards.",
+            "php.pdf": "Web developer: PHP, Laravel and Django. Learning machine vision.",
+        }
+        self.resumes = {
+            name: Resume.objects.create(user=self.user, name=name, file=f"resumes/{name}", extracted_text=text)
+            for name, text in texts.items()
+        }
+        Resume.objects.create(user=other, name="other.pdf", file="resumes/other.pdf", extracted_text="Kubernetes and Django.")
+
+    def _search(self, query, **params):
+        response = self.client.get("/api/v1/resumes/search/", {"q": query, "user_id": self.user.id, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _names(self, query):
+        return {result["name"] for result in self._search(query)["results"]}
+
+    def test_boolean_and_phrase_queries(self):
+        self.assertEqual(self._names("kubernetes AND django"), {"k8s.pdf"})
+        self.assertEqual(self._names("django NOT php"), {"k8s.pdf", "ml.pdf"})
+        self.assertEqual(self._names("php OR helm"), {"k8s.pdf", "php.pdf"})
+        self.assertEqual(self._names('"machine learning"'), {"ml.pdf"})
+        self.assertEqual(self._names("(laravel OR helm) python"), {"k8s.pdf"})
+        self.assertEqual(self._names('"scientist in machine"'), {"ml.pdf"})  # Stopwords keep their place
+
+    def test_results_are_ranked_and_limited(self):
+        body = self._search("kubernetes OR python", k=1)
+
+        self.assertEqual(body["total"], 2)
+        self.assertEqual([result["name"] for result in body["results"]], ["k8s.pdf"])
+        self.assertNotIn("extracted_text", body["results"][0])
+        self.assertEqual(len(self.client.get("/api/v1/resumes/search/", {"q": "kubernetes"}).json()["results"]), 2)
+
+    def test_index_follows_text_changes(self):
+        resume = self.resumes["php.pdf"]
+        resume.extracted_text = "Rust systems programmer."
+        resume.save()
+        self.assertEqual(self._names("rust"), {"php.pdf"})
+        self.assertEqual(self._names("laravel"), set())
+
+        resume.delete()
+        self.assertFalse(ResumePosting.objects.filter(resume_id=resume.pk).exists())
+
+    def test_invalid_queries_are_rejected(self):
+        for query in ['"machine learning', "(python", "python AND", "the of", ""]:
+            response = self.client.get("/api/v1/resumes/search/", {"q": query})
+            self.assertEqual(response.status_code, 400, query)
+        self.assertEqual(self.client.get("/api/v1/resumes/search/", {"q": "python", "k": 0}).status_code, 400)
+
+
+class ResumeMatchTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="match", password="x")
+        resume_index.rebuild()
+        self.addCleanup(resume_index.rebuild)
+        texts = {
+            "backend.pdf": "Backend developer: Python, Django, PostgreSQL, Docker, REST APIs.",
+            "frontend.pdf": "Frontend developer: React, TypeScript, CSS, Figma.",
+            "chef.pdf": "Pastry chef, French bakeries, chocolate and viennoiserie.",
+        }
+        for name, text in texts.items():
+            Resume.objects.create(user=self.user, name=name, file=f"resumes/{name}", extracted_text=text)
+
+    def _match(self, job_description, **data):
+        response = self.client.post("/api/v1/resumes/match/", {"job_description": job_description, **data})
+        self.assertEqual(response.status_code, 200)
+        return [(result["name"], result["similarity"]) for result in response.json()["results"]]
+
+    def test_embedding_is_normalized_and_stored(self):
+        resume = Resume.objects.get(name="backend.pdf")
+        vector = embed_text(resume.extracted_text)
+
+        self.assertEqual(resume.embedding, encode_vector(vector))
+        self.assertAlmostEqual(float(np.linalg.norm(vector)), 1.0, places=5)
+        self.assertIsNone(embed_text("the of and"))
+
+    def test_best_matches_come_first(self):
+        results = self._match("Senior Python Django engineer with PostgreSQL")
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0][0], "backend.pdf")
+        self.assertGreater(results[0][1], 0.4)
+        self.assertLess(max(similarity for _, similarity in results[1:]), 0.2)
+        self.assertEqual(len(self._match("Python", k=1, user_id=self.user.id + 1)), 0)
+        self.assertEqual(self.client.post("/api/v1/resumes/match/", {"job_description": "Python", "k": 500}).status_code, 400)
+
+    def test_index_follows_saves_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            new = Resume.objects.create(
+                user=self.user, name="data.pdf", file="resumes/data.pdf", extracted_text="Python Django Airflow"
+            )
+        self.assertEqual(self._match("Airflow", k=1)[0][0], "data.pdf")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new.delete()
+        self.assertNotIn("data.pdf", [name for name, _ in self._match("Airflow")])
+
+    def test_delete_inside_a_transaction_is_removed_from_the_index(self):
+        resume = Resume.objects.get(name="backend.pdf")
+        resume_id = resume.pk
+        self._match("Python")  # Loads the index
+        self.assertIn(resume_id, resume_index._rows)
+
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            resume.delete()
+        self.assertNotIn(resume_id, resume_index._rows)
+
+
+class PromptBudgetTestCase(TestCase):
+    resume = "\n".join([
+        "Jane Doe - jane@example.com",
+        "Experience",
+        "Senior engineer at Acme: built Django APIs and led the Kubernetes migration.",
+        "Skills",
+        "Python, Django, PostgreSQL, Kubernetes",
+        "Education",
+        "MSc Computer Science, 2015",
+        "Centres d'intérêt",
+        "Climbing, chess, photography, travelling and cooking. " * 20,
+        "References",
+        "Available on request.",
+    ])
+
+    def test_sections_are_detected(self):
+        kinds = [section["kind"] for section in split_sections(self.resume)]
+        self.assertEqual(kinds, ["header", "experience", "skills", "education", "interests", "references"])
+
+    def test_low_value_sections_are_trimmed_first(self):
+        self.assertEqual(fit_resume(self.resume, 10_000)["trimmed_sections"], [])
+
+        fitted = fit_resume(self.resume, 60)
+
+        self.assertLessEqual(fitted["tokens"], 60)
+        self.assertGreater(fitted["original_tokens"], 200)
+        self.assertEqual(fitted["trimmed_sections"][:2], ["interests", "references"])
+        self.assertIn("Kubernetes migration", fitted["text"])
+        self.assertNotIn("Climbing", fitted["text"])
+
+    @override_settings(RESUME_PROMPT_TOKEN_BUDGET=PROMPT_TOKENS + 80)
+    def test_evaluation_prompt_fits_the_budget(self):
+        with mock.patch("cvBot.views.get_llm_gateway") as gateway:
+            gateway.return_value.complete.return_value = (
+                '{"ats_score": 70, "best_practices_score": 60, "suggestions": "Add metrics."}'
+            )
+            ResumeUploadView().evaluate_resume(self.resume, "Backend engineer")
+
+        prompt = gateway.return_value.complete.call_args.args[0][0]["content"]
+        self.assertNotIn("Climbing", prompt)
+        self.assertIn("Senior engineer at Acme", prompt)
+        self.assertLessEqual(estimate_tokens(prompt), PROMPT_TOKENS + 80)
+        evaluation = ResumeEvaluation.objects.get()
+        self.assertGreater(evaluation.prompt_tokens_saved, 150)
+        stats = self.client.get("/api/v1/resumes/evaluation-cache/stats/").json()
+        self.assertEqual(stats["prompt_tokens_saved"], evaluation.prompt_tokens_saved)
@@ -1,6 +1,22 @@
 from django.urls import path
-from .views import ResumeUploadView
+from .views import (
+    ResumeUploadView,
+    ResumeListView,
+    ResumeSearchView,
+    ResumeMatchView,
+    ResumeBatchUploadView,
+    ResumeJobView,
+    ResumeJobStatusView,
+    ResumeEvaluationCacheStatsView,
+)
 
 urlpatterns = [
+    path('v1/resumes/', ResumeListView.as_view(), name='resume-list'),
+    path('v1/resumes/search/', ResumeSearchView.as_view(), name='resume-search'),
+    path('v1/resumes/match/', ResumeMatchView.as_view(), name='resume-match'),
     path('v1/resumes/upload/', ResumeUploadView.as_view(), name='resume-upload'),
+    path('v1/resumes/batch-upload/', ResumeBatchUploadView.as_view(), name='resume-batch-upload'),
+    path('v1/resumes/jobs/', ResumeJobView.as_view(), name='resume-job'),
+    path('v1/resumes/jobs/<int:job_id>/', ResumeJobStatusView.as_view(), name='resume-job-status'),
+    path('v1/resumes/evaluation-cache/stats/', ResumeEvaluationCacheStatsView.as_view(), name='resume-evaluation-cache-stats'),
 ]
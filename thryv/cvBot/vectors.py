@@ -0,0 +1,216 @@
+"""
+Resume embeddings and the in-memory index that ranks them for a job description.
+
+Texts are embedded with the hashing trick: every keyword of the sanitized text
+(``cvBot.scoring.tokenize``) is hashed with CRC-32 into one of
+``RESUME_EMBEDDING_DIMENSIONS`` buckets with a hash-derived sign, weighted by
+``1 + log tf``, and the vector is L2-normalized. Nothing has to be fitted, so
+a resume is embedded once, when it is saved, and the stored float32 vector
+never goes stale as the corpus grows.
+
+Each worker keeps the vectors in one contiguous float32 matrix. Ranking the
+stored resumes for a job description is a single matrix-vector product (cosine
+similarity, as all vectors are normalized) followed by ``argpartition``. The
+index loads itself on first use, adds resumes saved by its own worker as they
+are saved, picks up resumes created by other workers before each query, and
+reloads everything every ``RESUME_VECTOR_INDEX_MAX_AGE`` seconds to see texts
+changed elsewhere.
+
+NumPy is imported on first use: importing this module (and the models and
+views that do) doesn't load it, and the matrix is allocated when the index
+first loads.
+"""
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from thryv.text_normalization import normalize
+
+from .scoring import tokenize
+
+_VECTOR_DTYPE = '<f4'  # Little-endian float32
+_SIGN_BIT = 1 << 31
+
+
+def embed_text(text, dimensions=None):
+    """
+    Embed a text as a normalized float32 vector.
+
+    Returns:
+        numpy.ndarray | None: The vector, or None if the text has no keyword.
+    """
+    import numpy as np
+
+    dimensions = dimensions or settings.RESUME_EMBEDDING_DIMENSIONS
+    tokens = tokenize(normalize(text or ""))
+    if not tokens:
+        return None
+    terms, counts = np.unique(np.array(tokens, dtype=str), return_counts=True)
+    hashes = np.fromiter((zlib.crc32(term.encode('utf-8')) for term in terms), dtype=np.uint32, count=terms.size)
+    # The top bit gives the sign, so colliding terms tend to cancel out instead of adding up
+    weights = np.where(hashes & np.uint32(_SIGN_BIT), -1.0, 1.0) * (1 + np.log(counts))
+    vector = np.bincount(hashes % dimensions, weights=weights, minlength=dimensions)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return None
+    return (vector / norm).astype(_VECTOR_DTYPE)
+
+
+def encode_vector(vector):
+    """Bytes to store in ``Resume.embedding`` (None stays None)."""
+    import numpy as np
+
+    return None if vector is None else np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes()
+
+
+def decode_vector(data):
+    import numpy as np
+
+    return np.frombuffer(bytes(data), dtype=_VECTOR_DTYPE)
+
+
+class ResumeVectorIndex:
+    """Top-k cosine similarity over the embeddings of the stored resumes."""
+
+    def __init__(self, dimensions=None, max_age=None):
+        self.dimensions = dimensions or settings.RESUME_EMBEDDING_DIMENSIONS
+        self.max_age = settings.RESUME_VECTOR_INDEX_MAX_AGE if max_age is None else max_age
+        self._lock = threading.Lock()
+        self._clear(allocate=False)
+
+    def _clear(self, allocate=True):
+        if allocate:
+            import numpy as np
+
+            self._vectors = np.empty((0, self.dimensions), dtype=_VECTOR_DTYPE)
+            self._ids = np.empty(0, dtype=np.int64)
+            self._users = np.empty(0, dtype=np.int64)
+        else:
+            # Nothing is stored before the index loads (see add), so the arrays can wait
+            self._vectors = self._ids = self._users = None
+        self._rows = {}  # Resume id -> row of the matrix
+        self._size = 0
+        self._last_pk = 0  # Highest id loaded from the database, to fetch newer ones
+        self._loaded_at = None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    def rebuild(self, batch_size=2000):
+        """Reload every stored embedding from the database."""
+        with self._lock:
+            self._clear()
+            self._load(0, batch_size)
+
+    def _load(self, after_pk, batch_size=2000):
+        # Imported here to avoid a circular import (models -> vectors -> models)
+        from .models import Resume
+
+        rows = (
+            Resume.objects.filter(pk__gt=after_pk, embedding__isnull=False)
+            .order_by('pk').values_list('pk', 'user_id', 'embedding')
+        )
+        for pk, user_id, embedding in rows.iterator(chunk_size=batch_size):
+            self._add(pk, user_id, decode_vector(embedding))
+            self._last_pk = max(self._last_pk, pk)
+        self._loaded_at = self._loaded_at or time.monotonic()
+
+    def refresh(self):
+        """Load the index on first use, reload it once too old, else fetch resumes created since."""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+                self._clear()
+                self._load(0)
+            else:
+                self._load(self._last_pk)
+
+    def add(self, resume):
+        """Add or replace ``resume``'s vector; a no-op until the index is loaded."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if resume.embedding is None:
+                self._remove(resume.pk)
+            else:
+                self._add(resume.pk, resume.user_id, decode_vector(resume.embedding))
+
+    def add_many(self, resumes):
+        for resume in resumes:
+            self.add(resume)
+
+    def remove(self, resume_id):
+        with self._lock:
+            self._remove(resume_id)
+
+    def _add(self, resume_id, user_id, vector):
+        if vector.size != self.dimensions:
+            return  # Embedded with another RESUME_EMBEDDING_DIMENSIONS; re-embed with embed_resumes
+        row = self._rows.get(resume_id)
+        if row is None:
+            if self._size == len(self._ids):
+                self._grow()
+            row = self._rows[resume_id] = self._size
+            self._size += 1
+        self._vectors[row] = vector
+        self._ids[row] = resume_id
+        self._users[row] = user_id
+
+    def _grow(self):
+        import numpy as np
+
+        # Double the capacity, so adding one resume at a time stays amortized O(1)
+        capacity = max(1024, 2 * len(self._ids))
+        vectors = np.empty((capacity, self.dimensions), dtype=_VECTOR_DTYPE)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        users = np.empty(capacity, dtype=np.int64)
+        users[:self._size] = self._users[:self._size]
+        self._vectors, self._ids, self._users = vectors, ids, users
+
+    def _remove(self, resume_id):
+        row = self._rows.pop(resume_id, None)
+        if row is None:
+            return
+        # Move the last row into the hole to keep the matrix contiguous
+        last = self._size - 1
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = self._ids[last]
+            self._users[row] = self._users[last]
+            self._rows[int(self._ids[row])] = row
+        self._size = last
+
+    def top_k(self, vector, k, user_id=None):
+        """
+        The ``k`` resumes most similar to ``vector``.
+
+        Returns:
+            list: ``(resume_id, similarity)`` pairs, most similar first.
+        """
+        import numpy as np
+
+        self.refresh()
+        with self._lock:
+            ids = self._ids[:self._size]
+            vectors = self._vectors[:self._size]
+            if user_id is not None:
+                mine = self._users[:self._size] == user_id
+                ids, vectors = ids[mine], vectors[mine]
+            if ids.size == 0:
+                return []
+            similarities = vectors @ np.asarray(vector, dtype=_VECTOR_DTYPE)
+
+        k = min(k, ids.size)
+        best = np.argpartition(-similarities, k - 1)[:k]
+        best = best[np.argsort(-similarities[best], kind='stable')]
+        return [(int(ids[row]), round(float(similarities[row]), 4)) for row in best]
+
+
+# The index of this worker process
+resume_index = ResumeVectorIndex()
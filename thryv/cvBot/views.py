@@ -1,43 +1,84 @@
-import unicodedata
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 from django.contrib.auth.models import User
-from .models import Resume
-from .serializers import ResumeSerializer
-import fitz  # PyMuPDF for text extraction
+from django.db import connection
+from django.db.models import Count, F, Sum
+from django.urls import reverse
+from .models import Resume, ResumeEvaluation, ResumeEvaluationJob
+from .pagination import ResumeCursorPagination
+from .serializers import ResumeSerializer, ResumeSummarySerializer
+from .pdf_engine import get_pdf_engine
+from .prompt_budget import estimate_tokens, fit_resume, truncate_tokens
+from .scoring import score_resume
+from .search import index_resumes, search
+from .vectors import embed_text, encode_vector, resume_index
+from .storage import file_sha256
+from thryv.llm_gateway import get_llm_gateway
+from thryv.text_normalization import normalize, normalize_many
 import json
-import os
-from groq import Groq
 import re
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Values of the ``llm_evaluation`` upload field (see ResumeUploadView.score_and_evaluate)
+LLM_EVALUATION_MODES = ('auto', 'always', 'never')
+
+# Resume evaluation prompt; the resume and job description are fitted to
+# RESUME_PROMPT_TOKEN_BUDGET first (cvBot.prompt_budget)
+EVALUATION_PROMPT = """\
+You are an expert in evaluating resumes for Applicant Tracking Systems (ATS) and HR best practices. Your task is to assess the following resume against the job description provided.
+
+Strictly respond with a valid JSON object and do not include any additional text or explanation.
+
+For the evaluation, provide:
+1. An ATS compatibility score (a precise numeric value between 0 and 100).
+2. A best practices score (a precise numeric value between 0 and 100).
+3. Concise and actionable improvement suggestions for enhancing the resume's alignment with ATS and HR best practices.
+4. The improvement suggestions should be written in the same language as the resume text.
+
+The response should be in this exact format:
+
+{{
+    "ats_score": <numeric_score>,
+    "best_practices_score": <numeric_score>,
+    "suggestions": "<actionable_suggestions>"
+}}
+
+Important instructions:
+- The suggestions should be tailored to improve the resume for ATS systems (e.g., by including relevant keywords) and to meet HR best practices (e.g., formatting, clarity).
+- Ensure the language of the suggestions matches the language of the resume text. Do not switch languages.
+- Focus on providing clear, specific, and actionable suggestions to improve the resume.
+
+Resume Text:
+{resume_text}
+
+Job Description:
+{job_description}
+"""
+PROMPT_TOKENS = estimate_tokens(EVALUATION_PROMPT)
+
 
 class ResumeUploadView(APIView):
     """API View to handle resume upload and evaluation."""
 
     def extract_text_from_pdf(self, file):
         """
-        Extract text from a PDF file using PyMuPDF.
+        Extract text from a PDF file using the shared PDF extraction engine.
 
         Args:
             file (InMemoryUploadedFile): The uploaded PDF file.
 
         Returns:
-            str: Extracted text from the PDF.
+            str: Extracted text from the PDF, within the configured page, time and size budgets.
         """
         try:
-            # Open the PDF file and extract text from all pages
-            pdf_document = fitz.open(stream=file.read(), filetype="pdf")
-            text = ""
-            for page in pdf_document:
-                text += page.get_text()
-            pdf_document.close()
-            return text.strip()
+            return get_pdf_engine().extract(file.read())
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise ValueError(f"Error extracting text from PDF: {str(e)}")
@@ -53,28 +94,8 @@ class ResumeUploadView(APIView):
             str: Sanitized text.
         """
         try:
-            # Ensure input is a string
-            text = str(text)
-
-            # Remove control characters (non-printable, special characters)
-            sanitized_text = re.sub(r'[\x00-\x1F\x7F]', ' ', text)
-
-            # Normalize accented characters to ASCII
-            sanitized_text = unicodedata.normalize('NFKD', sanitized_text).encode('ASCII', 'ignore').decode('ASCII')
-
-            # Replace multiple spaces with a single space
-            sanitized_text = re.sub(r'\s+', ' ', sanitized_text)
-
-            # Replace non-breaking spaces with regular spaces
-            sanitized_text = sanitized_text.replace('\u00A0', ' ')
-
-            # Remove any non-ASCII characters (characters outside 0-127)
-            sanitized_text = re.sub(r'[^\x20-\x7E]', ' ', sanitized_text)
-
-            # Strip leading and trailing spaces
-            sanitized_text = sanitized_text.strip()
-
-            return sanitized_text
+            # Printable ASCII with accents folded and whitespace collapsed
+            return normalize(str(text))
         except Exception as e:
             logger.error(f"Error sanitizing text: {str(e)}")
             raise ValueError(f"Error sanitizing text: {str(e)}")
@@ -95,55 +116,46 @@ class ResumeUploadView(APIView):
             sanitized_text = self.sanitize_text(text)
             sanitized_job_description = self.sanitize_text(job_description)
 
-            # Ensure the API key is set for Groq
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise EnvironmentError("GROQ_API_KEY is not set in the environment.")
-
-            # Create the Groq client with the API key
-            client = Groq(api_key=api_key)
+            # Reuse a previous evaluation of the same resume for the same job
+            cache_key = ResumeEvaluation.make_key(sanitized_text, sanitized_job_description)
+            cached = ResumeEvaluation.objects.filter(cache_key=cache_key).first()
+            if cached:
+                ResumeEvaluation.objects.filter(pk=cached.pk).update(hit_count=F("hit_count") + 1)
+                return cached.ats_score, cached.best_practices_score, cached.suggestions
+
+            # Fit the resume (kept one line per line for section detection) and
+            # the job description into the prompt budget
+            resume_text = "\n".join(filter(None, normalize_many(str(text).splitlines())))
+            budgeted_job_description = truncate_tokens(
+                sanitized_job_description, settings.RESUME_JOB_DESCRIPTION_MAX_TOKENS
+            )
+            job_description_tokens = estimate_tokens(budgeted_job_description)
+            fitted = fit_resume(
+                resume_text, max(settings.RESUME_PROMPT_TOKEN_BUDGET - PROMPT_TOKENS - job_description_tokens, 0)
+            )
+            prompt_tokens = PROMPT_TOKENS + fitted['tokens'] + job_description_tokens
+            prompt_tokens_saved = (
+                fitted['original_tokens'] - fitted['tokens']
+                + estimate_tokens(sanitized_job_description) - job_description_tokens
+            )
+            logger.info(
+                f"Resume evaluation prompt: ~{prompt_tokens} tokens, ~{prompt_tokens_saved} saved"
+                + (f" (trimmed: {', '.join(fitted['trimmed_sections'])})" if fitted['trimmed_sections'] else "")
+            )
 
             # Construct the LLM prompt for resume evaluation
-            prompt = f"""
-            You are an expert in evaluating resumes for Applicant Tracking Systems (ATS) and HR best practices. Your task is to assess the following resume against the job description provided.
-
-            Strictly respond with a valid JSON object and do not include any additional text or explanation.
-
-            For the evaluation, provide:
-            1. An ATS compatibility score (a precise numeric value between 0 and 100).
-            2. A best practices score (a precise numeric value between 0 and 100).
-            3. Concise and actionable improvement suggestions for enhancing the resume's alignment with ATS and HR best practices.
-            4. The improvement suggestions should be written in the same language as the resume text.
+            prompt = EVALUATION_PROMPT.format(resume_text=fitted['text'], job_description=budgeted_job_description)
 
-            The response should be in this exact format:
-
-            {{
-                "ats_score": <numeric_score>,
-                "best_practices_score": <numeric_score>,
-                "suggestions": "<actionable_suggestions>"
-            }}
-
-            Important instructions:
-            - The suggestions should be tailored to improve the resume for ATS systems (e.g., by including relevant keywords) and to meet HR best practices (e.g., formatting, clarity).
-            - Ensure the language of the suggestions matches the language of the resume text. Do not switch languages.
-            - Focus on providing clear, specific, and actionable suggestions to improve the resume.
-
-            Resume Text:
-            {sanitized_text}
-
-            Job Description:
-            {sanitized_job_description}
-            """
-
-            # Send the prompt to the Groq API and get the response
-            response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.1-70b-versatile",
+            # Send the prompt to the Groq API through the shared gateway
+            started = time.monotonic()
+            chat_response_content = get_llm_gateway().complete(
+                [{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"}
             )
+            llm_seconds = time.monotonic() - started
 
-            # Extract and parse the response
-            chat_response_content = response.choices[0].message.content
+            # Parse the response
+            parsed = True
 
             # Robust JSON parsing with multiple fallback strategies
             try:
@@ -163,18 +175,78 @@ class ResumeUploadView(APIView):
                     }
                     logger.warning(f"Failed to parse Groq response: {chat_response_content}")
                     parsed_response = default_response
+                    parsed = False
 
             # Extract and validate scores
             ats_score = min(max(parsed_response.get("ats_score", 0), 0), 100)
             best_practices_score = min(max(parsed_response.get("best_practices_score", 0), 0), 100)
             suggestions = parsed_response.get("suggestions", "No specific suggestions available.")
 
+            # Only cache real evaluations, never the parse-failure placeholder
+            if parsed:
+                ResumeEvaluation.objects.get_or_create(
+                    cache_key=cache_key,
+                    defaults={
+                        "ats_score": ats_score,
+                        "best_practices_score": best_practices_score,
+                        "suggestions": suggestions,
+                        "llm_seconds": llm_seconds,
+                        "prompt_tokens": prompt_tokens,
+                        "prompt_tokens_saved": prompt_tokens_saved,
+                    },
+                )
+
             return ats_score, best_practices_score, suggestions
 
         except Exception as e:
             logger.error(f"Error evaluating resume with Groq API: {str(e)}")
             raise ValueError(f"Error evaluating resume with Groq API: {str(e)}")
 
+    def score_and_evaluate(self, text, job_description, llm_evaluation=None):
+        """
+        Score the resume locally, then evaluate it with the LLM when worthwhile.
+
+        Args:
+            text (str): Extracted resume text.
+            job_description (str): Job description for evaluation.
+            llm_evaluation (str): "auto", "always" or "never"; defaults to RESUME_LLM_EVALUATION.
+                In "auto" mode the LLM is skipped below RESUME_LOCAL_SCORE_THRESHOLD.
+
+        Returns:
+            dict: Resume fields: local_ats_score, ats_score, best_practices_score
+            (None without the LLM), suggestions and llm_evaluated.
+        """
+        mode = llm_evaluation or settings.RESUME_LLM_EVALUATION
+        prescore = score_resume(self.sanitize_text(text), self.sanitize_text(job_description))
+
+        if mode == 'always' or (mode == 'auto' and prescore['score'] >= settings.RESUME_LOCAL_SCORE_THRESHOLD):
+            ats_score, best_practices_score, suggestions = self.evaluate_resume(text, job_description)
+            return {
+                'local_ats_score': prescore['score'],
+                'ats_score': ats_score,
+                'best_practices_score': best_practices_score,
+                'suggestions': suggestions,
+                'llm_evaluated': True,
+            }
+
+        suggestions = "The resume shares few keywords with the job description."
+        if prescore['missing_keywords']:
+            suggestions += " Consider covering: " + ", ".join(prescore['missing_keywords']) + "."
+        return {
+            'local_ats_score': prescore['score'],
+            'ats_score': prescore['score'],
+            'best_practices_score': None,
+            'suggestions': suggestions,
+            'llm_evaluated': False,
+        }
+
+    def get_llm_evaluation(self, request):
+        """Read the optional ``llm_evaluation`` field, raising ValueError if it is invalid."""
+        llm_evaluation = request.data.get('llm_evaluation') or None
+        if llm_evaluation not in (None, *LLM_EVALUATION_MODES):
+            raise ValueError(f"llm_evaluation must be one of: {', '.join(LLM_EVALUATION_MODES)}.")
+        return llm_evaluation
+
     def post(self, request, *args, **kwargs):
         """
         Handle POST request for resume upload and evaluation.
@@ -195,6 +267,10 @@ class ResumeUploadView(APIView):
                     {'error': 'user_id, job_description, and file are required.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            try:
+                llm_evaluation = self.get_llm_evaluation(request)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
             # Validate the provided user ID
             user = User.objects.filter(id=user_id).first()
@@ -207,10 +283,8 @@ class ResumeUploadView(APIView):
             # Extract text from the uploaded PDF
             extracted_text = self.extract_text_from_pdf(file)
 
-            # Evaluate the resume using the Groq API
-            ats_score, best_practices_score, suggestions = self.evaluate_resume(
-                extracted_text, job_description
-            )
+            # Score locally, and evaluate with the Groq API unless it's a clear mismatch
+            evaluation = self.score_and_evaluate(extracted_text, job_description, llm_evaluation)
 
             # Save the resume in the database
             resume = Resume.objects.create(
@@ -218,10 +292,8 @@ class ResumeUploadView(APIView):
                 name=name,
                 file=file,
                 extracted_text=extracted_text,
-                ats_score=ats_score,
-                best_practices_score=best_practices_score,
-                suggestions=suggestions,
                 job_description=job_description,
+                **evaluation,
             )
 
             # Serialize and return the response
@@ -236,4 +308,345 @@ class ResumeUploadView(APIView):
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class ResumeBatchUploadView(ResumeUploadView):
+    """API View to evaluate many resumes against one job description and rank them."""
+
+    def process_file(self, file, job_description, llm_evaluation=None):
+        """
+        Extract and evaluate a single resume of the batch.
+
+        Runs on a worker thread, so it closes the thread's DB connection when done.
+
+        Returns:
+            dict: The file with its extracted text and scores, or the error raised.
+        """
+        try:
+            extracted_text = self.extract_text_from_pdf(file)
+            evaluation = self.score_and_evaluate(extracted_text, job_description, llm_evaluation)
+            return {
+                'file': file,
+                'content_hash': file_sha256(file),
+                'extracted_text': extracted_text,
+                'embedding': encode_vector(embed_text(extracted_text)),  # bulk_create skips Resume.save()
+                'evaluation': evaluation,
+            }
+        except Exception as e:
+            return {'file': file, 'error': str(e)}
+        finally:
+            connection.close()
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST request for batch resume upload and ranking.
+
+        Files are processed concurrently, up to RESUME_BATCH_CONCURRENCY at a
+        time, so the batch takes about as long as its slowest resume.
+
+        Returns:
+            Response: Serialized resumes ranked by ATS score, plus per-file errors.
+        """
+        try:
+            user_id = request.data.get('user_id')
+            job_description = request.data.get('job_description')
+            files = request.FILES.getlist('files')
+
+            # Validate required fields: user_id, job_description, and files
+            if not user_id or not job_description or not files:
+                return Response(
+                    {'error': 'user_id, job_description, and files are required.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(files) > settings.RESUME_BATCH_MAX_FILES:
+                return Response(
+                    {'error': f'At most {settings.RESUME_BATCH_MAX_FILES} files can be uploaded at once.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                llm_evaluation = self.get_llm_evaluation(request)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Validate the provided user ID
+            user = User.objects.filter(id=user_id).first()
+            if not user:
+                return Response(
+                    {'error': 'Invalid user_id provided.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            # Extract and evaluate all resumes in parallel
+            max_workers = min(settings.RESUME_BATCH_CONCURRENCY, len(files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = list(executor.map(lambda f: self.process_file(f, job_description, llm_evaluation), files))
+
+            errors = [
+                {'file': outcome['file'].name, 'error': outcome['error']}
+                for outcome in outcomes if 'error' in outcome
+            ]
+
+            # Save all evaluated resumes in a single query
+            resumes = Resume.objects.bulk_create([
+                Resume(
+                    user=user,
+                    name=outcome['file'].name,
+                    file=outcome['file'],
+                    content_hash=outcome['content_hash'],  # bulk_create skips Resume.save()
+                    extracted_text=outcome['extracted_text'],
+                    embedding=outcome['embedding'],
+                    job_description=job_description,
+                    **outcome['evaluation'],
+                )
+                for outcome in outcomes if 'error' not in outcome
+            ])
+            # bulk_create doesn't send post_save
+            index_resumes(resumes)
+            resume_index.add_many(resumes)
+            resumes.sort(key=lambda resume: resume.ats_score, reverse=True)
+
+            serializer = ResumeSerializer(resumes, many=True)
+            return Response({'results': serializer.data, 'errors': errors}, status=status.HTTP_201_CREATED)
+
+        except Exception as e:
+            logger.error(f"Unexpected error in batch resume upload: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ResumeListView(APIView):
+    """API View to list resumes, newest first and cursor-paginated."""
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET request for the resume listing.
+
+        Large text fields are deferred and left out unless ``?detail=full`` is
+        passed. ``?user_id=`` restricts the listing to one user.
+
+        Returns:
+            Response: A page of serialized resumes.
+        """
+        resumes = Resume.objects.all()
+        user_id = request.query_params.get('user_id')
+        if user_id:
+            if not str(user_id).isdigit():
+                return Response({'error': 'Invalid user_id provided.'}, status=status.HTTP_400_BAD_REQUEST)
+            resumes = resumes.filter(user_id=user_id)
+
+        if request.query_params.get('detail') == 'full':
+            serializer_class = ResumeSerializer
+        else:
+            resumes = resumes.defer(*Resume.HEAVY_FIELDS)
+            serializer_class = ResumeSummarySerializer
+
+        paginator = ResumeCursorPagination()
+        page = paginator.paginate_queryset(resumes, request, view=self)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ResumeSearchView(APIView):
+    """API View to search resume texts with boolean and phrase queries."""
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET request for a resume search.
+
+        ``?q=`` is the query, e.g. ``kubernetes AND django`` or
+        ``"machine learning" NOT php`` (see cvBot.search). ``?k=`` is the
+        number of results (RESUME_SEARCH_RESULTS by default) and ``?user_id=``
+        restricts the search to one user.
+
+        Returns:
+            Response: The number of matches and the best ``k`` resumes with their score.
+        """
+        query = request.query_params.get('q', '').strip()
+        user_id = request.query_params.get('user_id')
+        limit = request.query_params.get('k', str(settings.RESUME_SEARCH_RESULTS))
+        if not query:
+            return Response({'error': 'q is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if user_id and not str(user_id).isdigit():
+            return Response({'error': 'Invalid user_id provided.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not limit.isdigit() or not 0 < int(limit) <= settings.RESUME_SEARCH_MAX_RESULTS:
+            return Response(
+                {'error': f'k must be between 1 and {settings.RESUME_SEARCH_MAX_RESULTS}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            found = search(query, limit=int(limit), user_id=int(user_id) if user_id else None)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        resumes = Resume.objects.defer(*Resume.HEAVY_FIELDS).in_bulk([resume_id for resume_id, _ in found['results']])
+        results = [
+            {**ResumeSummarySerializer(resumes[resume_id]).data, 'score': score}
+            for resume_id, score in found['results'] if resume_id in resumes
+        ]
+        return Response({'query': query, 'total': found['total'], 'results': results}, status=status.HTTP_200_OK)
+
+
+class ResumeMatchView(APIView):
+    """API View to rank the stored resumes for a job description, without calling the LLM."""
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST request for job matching.
+
+        Embeds ``job_description`` like the resumes (cvBot.vectors) and returns
+        the ``k`` most similar resumes (RESUME_MATCH_RESULTS by default),
+        optionally only among those of ``user_id``.
+
+        Returns:
+            Response: The best resumes with their cosine similarity, best first.
+        """
+        job_description = request.data.get('job_description')
+        user_id = request.data.get('user_id')
+        limit = str(request.data.get('k', settings.RESUME_MATCH_RESULTS))
+        if not job_description:
+            return Response({'error': 'job_description is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if user_id and not str(user_id).isdigit():
+            return Response({'error': 'Invalid user_id provided.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not limit.isdigit() or not 0 < int(limit) <= settings.RESUME_MATCH_MAX_RESULTS:
+            return Response(
+                {'error': f'k must be between 1 and {settings.RESUME_MATCH_MAX_RESULTS}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        vector = embed_text(job_description)
+        if vector is None:
+            return Response({'error': 'The job description has no searchable terms.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            best = resume_index.top_k(vector, int(limit), user_id=int(user_id) if user_id else None)
+        except Exception as e:
+            logger.error(f"Error ranking resumes: {str(e)}")
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        resumes = Resume.objects.defer(*Resume.HEAVY_FIELDS).in_bulk([resume_id for resume_id, _ in best])
+        results = []
+        for resume_id, similarity in best:
+            if resume_id not in resumes:
+                resume_index.remove(resume_id)  # Deleted by another worker
+                continue
+            results.append({**ResumeSummarySerializer(resumes[resume_id]).data, 'similarity': similarity})
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class ResumeJobView(APIView):
+    """API View to queue a resume for asynchronous evaluation."""
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST request for asynchronous resume upload.
+
+        The upload is stored and evaluated later by the process_resume_jobs
+        command, so the request returns without waiting on Groq.
+
+        Returns:
+            Response: 202 with the job id and its status URL, or error message.
+        """
+        try:
+            user_id = request.data.get('user_id')
+            job_description = request.data.get('job_description')
+            name = request.data.get('name')
+            file = request.FILES.get('file')
+
+            # Validate required fields: user_id, job_description, and file
+            if not user_id or not job_description or not file:
+                return Response(
+                    {'error': 'user_id, job_description, and file are required.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                # Validated like the synchronous uploads, and applied when the job runs
+                llm_evaluation = ResumeUploadView().get_llm_evaluation(request)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Validate the provided user ID
+            user = User.objects.filter(id=user_id).first()
+            if not user:
+                return Response(
+                    {'error': 'Invalid user_id provided.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            job = ResumeEvaluationJob.objects.create(
+                user=user,
+                name=name,
+                file=file,
+                job_description=job_description,
+                llm_evaluation=llm_evaluation,
+            )
+            return Response({
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': request.build_absolute_uri(reverse('resume-job-status', args=[job.id])),
+            }, status=status.HTTP_202_ACCEPTED)
+
+        except Exception as e:
+            logger.error(f"Unexpected error queuing resume job: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ResumeJobStatusView(APIView):
+    """API View to poll an asynchronous resume evaluation."""
+
+    def get(self, request, job_id, *args, **kwargs):
+        """
+        Handle GET request for a resume evaluation job.
+
+        Returns:
+            Response: Job status, with the serialized resume once it is done.
+        """
+        job = ResumeEvaluationJob.objects.select_related('resume').filter(id=job_id).first()
+        if not job:
+            return Response({'error': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        data = {'job_id': job.id, 'status': job.status}
+        if job.status == ResumeEvaluationJob.Status.DONE and job.resume:
+            data['resume'] = ResumeSerializer(job.resume).data
+        elif job.status == ResumeEvaluationJob.Status.FAILED:
+            data['error'] = job.error
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ResumeEvaluationCacheStatsView(APIView):
+    """API View exposing hit/miss counters of the resume evaluation cache."""
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET request for evaluation cache statistics.
+
+        Every miss stores one cached evaluation, so misses are the number of
+        cached rows and hits are the sum of their hit counters.
+
+        Returns:
+            Response: Hits, misses, hit rate, Groq time saved in seconds, and the
+            estimated tokens sent and saved by prompt budgeting on misses.
+        """
+        totals = ResumeEvaluation.objects.aggregate(
+            misses=Count("id"),
+            hits=Sum("hit_count"),
+            llm_seconds_saved=Sum(F("hit_count") * F("llm_seconds")),
+            prompt_tokens=Sum("prompt_tokens"),
+            prompt_tokens_saved=Sum("prompt_tokens_saved"),
+        )
+        hits = totals["hits"] or 0
+        misses = totals["misses"]
+        lookups = hits + misses
+        return Response({
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "llm_seconds_saved": totals["llm_seconds_saved"] or 0.0,
+            "prompt_tokens": totals["prompt_tokens"] or 0,
+            "prompt_tokens_saved": totals["prompt_tokens_saved"] or 0,
+        }, status=status.HTTP_200_OK)
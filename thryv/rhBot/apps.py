@@ -1,8 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 class RhBotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rhBot'
 
     def ready(self):
-        from . import views
\ No newline at end of file
+        from . import signals, views
+
+        if settings.MEDIA_SWEEP_INTERVAL > 0:
+            from thryv.media_sweeper import start_background_sweeper
+
+            start_background_sweeper(settings.MEDIA_SWEEP_INTERVAL)
@@ -0,0 +1,314 @@
+"""
+Async versions of the interview endpoints.
+
+These views are meant to be served through ``thryv.asgi`` (e.g. uvicorn). The
+LLM and TTS calls are awaited instead of blocking a worker, so a single
+worker process can keep many interview turns waiting on upstream I/O at once.
+The streaming variant of ContinueInterview also lives here: Django only streams
+async iterators incrementally under ASGI.
+"""
+import asyncio
+import json
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from thryv.llm_gateway import get_llm_gateway
+from .models import Interview
+from .question_generation import QuestionGenerationError, agenerate_questions
+from .views import (
+    audio_cache,
+    audio_url_for,
+    _build_feedback_prompt,
+    _build_questions_prompt,
+    _schedule_audio,
+    pending_audio,
+    question_bank,
+    tts_backend,
+)
+
+async def _agenerate_audio(text):
+    """Async counterpart of ``views._wait_for_audio``; returns the cached audio filename."""
+    future = pending_audio(text)
+    if future is not None:
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception:
+            pass
+
+    key = tts_backend.cache_key(text)
+    audio_filename = await sync_to_async(audio_cache.get, thread_sensitive=False)(key)
+    if audio_filename is None:
+        audio_content = await tts_backend.asynthesize(text)
+        audio_filename = await sync_to_async(audio_cache.put, thread_sensitive=False)(key, audio_content)
+    return audio_filename
+
+
+@sync_to_async
+def _acreate_interview(conversation_history, **fields):
+    """Create the interview and save its first turns in one transaction."""
+    with transaction.atomic():
+        interview = Interview.objects.create(**fields)
+        interview.append_turns(0, conversation_history)
+    return interview
+
+
+@sync_to_async
+def _acomplete_interview(interview, turn_index, conversation_history):
+    """Save the final turns and mark the interview completed in one transaction."""
+    with transaction.atomic():
+        interview.append_turns(turn_index, conversation_history[turn_index:])
+        Interview.objects.filter(pk=interview.pk).update(status=Interview.Status.COMPLETED, updated_at=timezone.now())
+
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _request_data(request):
+    """Read the request payload, accepting JSON or form-encoded bodies like DRF does."""
+    if request.content_type == "application/json":
+        return json.loads(request.body or b"{}")
+    return request.POST
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncStartInterviewView(View):
+    async def post(self, request):
+        """Starts an interview session."""
+        if not settings.LLM_API_KEY:
+            return JsonResponse({"error": "GROQ_API_KEY is not set."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        try:
+            data = _request_data(request)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=status.HTTP_400_BAD_REQUEST)
+
+        job_description = str(data.get("job_description", "")).strip()
+        user_id = data.get("user_id", "")
+
+        if not job_description or not user_id:
+            return JsonResponse(
+                {"error": "Job description and user ID are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            user = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return JsonResponse({"error": "User not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            # Reuse a cached question set, or generate one using the LLM gateway
+            questions = question_bank.get(job_description)
+            if questions is None:
+                try:
+                    questions = await agenerate_questions(
+                        get_llm_gateway(), _build_questions_prompt(job_description)
+                    )
+                except QuestionGenerationError as e:
+                    return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                question_bank.add(job_description, questions)
+
+            # Save interview data
+            interview_id = str(uuid.uuid4())
+            conversation_history = [{"role": "assistant", "content": questions[0]}]
+
+            await _acreate_interview(
+                conversation_history,
+                interview_id=interview_id,
+                user=user,
+                job_description=job_description,
+                questions=questions,
+                status=Interview.Status.ONGOING
+            )
+
+            # TTS Integration: Convert first question to audio, then queue the rest in the
+            # background, so they don't compete with it for the pooled TTS clients
+            audio_filename = await _agenerate_audio(questions[0])
+            _schedule_audio(questions[1:])
+
+            audio_url = audio_url_for(request, audio_filename)
+
+            return JsonResponse({
+                "interview_id": interview_id,
+                "current_question": questions[0],
+                "conversation_history": conversation_history,
+                "audio_url": audio_url,
+                "status": Interview.Status.ONGOING
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncContinueInterviewView(View):
+    async def post(self, request):
+        """Handles ongoing interview responses."""
+        try:
+            data = _request_data(request)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=status.HTTP_400_BAD_REQUEST)
+
+        interview_id = data.get("interview_id")
+        user_response = str(data.get("user_response", "")).strip()
+
+        if not interview_id or not user_response:
+            return JsonResponse(
+                {"error": "Interview ID and user response are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            interview = await Interview.objects.aget(interview_id=interview_id)
+
+            # Load the conversation; only the turns added below get written back
+            conversation_history = await interview.ahistory()
+            turn_index = len(conversation_history)
+            conversation_history.append({"role": "user", "content": user_response})
+
+            # Evaluate user response and generate next question
+            current_index = len(conversation_history) // 2  # Alternates user/assistant pairs
+            questions = interview.questions
+            current_question = questions[current_index - 1]
+            response_content = await get_llm_gateway().acomplete(
+                [{"role": "user", "content": _build_feedback_prompt(current_question, user_response)}]
+            )
+
+            # Append the feedback to the conversation history
+            conversation_history.append({"role": "assistant", "content": response_content})
+
+            # Check if interview is completed
+            if current_index >= len(questions):
+                await _acomplete_interview(interview, turn_index, conversation_history)
+                return JsonResponse({
+                    "message": "Interview completed.",
+                    "conversation_history": conversation_history
+                }, status=status.HTTP_200_OK)
+
+            next_question = questions[current_index]
+            conversation_history.append({"role": "assistant", "content": next_question})
+
+            # TTS Integration: Generate audio for the next question
+            audio_filename = await _agenerate_audio(next_question)
+
+            audio_url = audio_url_for(request, audio_filename)
+
+            # Save the new turns
+            await interview.aappend_turns(turn_index, conversation_history[turn_index:])
+
+            return JsonResponse({
+                "current_question": next_question,
+                "audio_url": audio_url,
+                "conversation_history": conversation_history
+            }, status=status.HTTP_200_OK)
+
+        except (Interview.DoesNotExist, ValidationError):  # Unknown or malformed UUID
+            return JsonResponse({"error": "Invalid interview ID."}, status=status.HTTP_404_NOT_FOUND)
+        except IntegrityError:
+            return JsonResponse({"error": "This answer was already submitted."}, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncContinueInterviewStreamView(View):
+    """
+    Streaming variant of ContinueInterview over Server-Sent Events.
+
+    Feedback tokens are sent as ``token`` events as soon as the LLM produces them.
+    A final ``done`` event carries the next question and its audio URL (or the
+    completion message), and the conversation history is saved at that point.
+    """
+
+    async def post(self, request):
+        """Handles ongoing interview responses, streaming the feedback."""
+        try:
+            data = _request_data(request)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=status.HTTP_400_BAD_REQUEST)
+
+        interview_id = data.get("interview_id")
+        user_response = str(data.get("user_response", "")).strip()
+
+        if not interview_id or not user_response:
+            return JsonResponse(
+                {"error": "Interview ID and user response are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            interview = await Interview.objects.aget(interview_id=interview_id)
+
+            # Load the conversation; only the turns added below get written back
+            conversation_history = await interview.ahistory()
+            turn_index = len(conversation_history)
+            conversation_history.append({"role": "user", "content": user_response})
+
+            current_index = len(conversation_history) // 2  # Alternates user/assistant pairs
+            current_question = interview.questions[current_index - 1]
+            tokens = get_llm_gateway().astream(
+                [{"role": "user", "content": _build_feedback_prompt(current_question, user_response)}]
+            )
+        except (Interview.DoesNotExist, ValidationError):  # Unknown or malformed UUID
+            return JsonResponse({"error": "Invalid interview ID."}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        response = StreamingHttpResponse(
+            self._events(request, interview, conversation_history, turn_index, current_index, tokens),
+            content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Don't let nginx buffer the stream
+        return response
+
+    async def _events(self, request, interview, conversation_history, turn_index, current_index, tokens):
+        try:
+            parts = []
+            async for token in tokens:
+                parts.append(token)
+                yield _sse_event("token", {"content": token})
+
+            # Append the feedback to the conversation history
+            conversation_history.append({"role": "assistant", "content": "".join(parts)})
+
+            # Check if interview is completed
+            questions = interview.questions
+            if current_index >= len(questions):
+                await _acomplete_interview(interview, turn_index, conversation_history)
+                yield _sse_event("done", {
+                    "message": "Interview completed.",
+                    "conversation_history": conversation_history
+                })
+                return
+
+            next_question = questions[current_index]
+            conversation_history.append({"role": "assistant", "content": next_question})
+
+            # TTS Integration: Generate audio for the next question
+            audio_filename = await _agenerate_audio(next_question)
+            audio_url = audio_url_for(request, audio_filename)
+
+            # Save the new turns
+            await interview.aappend_turns(turn_index, conversation_history[turn_index:])
+
+            yield _sse_event("done", {
+                "current_question": next_question,
+                "audio_url": audio_url,
+                "conversation_history": conversation_history
+            })
+        except Exception as e:
+            yield _sse_event("error", {"error": str(e)})
@@ -0,0 +1,123 @@
+"""
+Content-addressed cache for synthesized question audio.
+
+Files are named after a SHA-256 of the text and the voice settings used to
+synthesize them, so the same question spoken with the same voice is stored
+once and shared by every interview that asks it. The directory is bounded in
+size with a least-recently-used eviction policy.
+"""
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+_CACHE_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+class AudioCache:
+    """LRU cache of audio files stored under ``directory``."""
+
+    def __init__(self, directory, max_bytes, extension="mp3"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._entries = None  # filename -> size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text, voice_name, language_code, audio_encoding):
+        """Hash everything that changes the synthesized audio."""
+        payload = "\x1f".join([text, voice_name, language_code, str(audio_encoding)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def filename_for(self, key):
+        return f"{key}.{self.extension}"
+
+    def path_for(self, filename):
+        """Absolute path of a cache file, or None if ``filename`` is not a cache file name."""
+        if not _CACHE_NAME.match(filename):
+            return None
+        return os.path.join(self.directory, filename)
+
+    def get(self, key):
+        """Return the cached filename for ``key``, or None on a miss."""
+        filename = self.filename_for(key)
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            self._load_index()
+            if filename in self._entries:
+                if not os.path.exists(path):
+                    # Removed behind our back (another worker evicted it, or a sweep)
+                    self._total_bytes -= self._entries.pop(filename)
+                    return None
+                self._entries.move_to_end(filename)
+            else:
+                # Another worker may have written it since we scanned the directory
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    return None
+                self._entries[filename] = size
+                self._total_bytes += size
+        self._touch(path)
+        return filename
+
+    def put(self, key, audio_content):
+        """Store ``audio_content`` under ``key`` and return its filename."""
+        filename = self.filename_for(key)
+        path = os.path.join(self.directory, filename)
+        # Write to a temporary name first so readers never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as audio_file:
+                audio_file.write(audio_content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self._load_index()
+            self._total_bytes -= self._entries.pop(filename, 0)
+            self._entries[filename] = len(audio_content)
+            self._total_bytes += len(audio_content)
+            self._evict()
+        return filename
+
+    def _load_index(self):
+        """Build the LRU index from the directory the first time it is needed."""
+        if self._entries is not None:
+            return
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and _CACHE_NAME.match(entry.name):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((name, size) for _, name, size in files)
+        self._total_bytes = sum(self._entries.values())
+
+    def _evict(self):
+        # Keep the most recently stored file even if it alone exceeds the bound
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            filename, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _touch(path):
+        # The mtime doubles as the recency stamp when the index is rebuilt
+        try:
+            os.utime(path)
+        except OSError:
+            pass
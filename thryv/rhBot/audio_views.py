@@ -0,0 +1,122 @@
+"""
+Delivery of synthesized question audio.
+
+Audio files are named after a hash of their text and voice, so a name always
+denotes the same bytes: responses carry a strong ETag and a long-lived,
+immutable Cache-Control. Conditional requests get 304 and byte ranges get 206,
+so players can seek without downloading the whole file. With ``AUDIO_OFFLOAD``
+set, the worker only checks the request and lets the front proxy send the file
+(``X-Accel-Redirect`` for nginx, ``X-Sendfile`` for Apache/lighttpd).
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+
+from .views import audio_cache
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CHUNK_SIZE = 64 * 1024
+
+
+def _parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header.
+
+    Returns:
+        tuple | None: Inclusive ``(start, end)`` byte offsets, or None to send the
+        whole file (no header, or a form we don't serve such as multiple ranges).
+
+    Raises:
+        ValueError: If the range can't be satisfied for a file of ``size`` bytes.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        # Suffix range: the last N bytes
+        length = min(int(end), size)
+        if length == 0:
+            raise ValueError(header)
+        return size - length, size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as audio_file:
+        audio_file.seek(start)
+        while length > 0:
+            chunk = audio_file.read(min(_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+class AudioFileView(View):
+    """Serves one question audio file with caching, range and offload support."""
+
+    def get(self, request, filename):
+        path = audio_cache.path_for(filename)
+        try:
+            stat = os.stat(path) if path else None
+        except FileNotFoundError:
+            stat = None
+        if stat is None:
+            raise Http404("Audio file not found.")
+
+        etag = f'"{posixpath.splitext(filename)[0]}"'
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = self._file_response(request, path, filename, stat.st_size, etag)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        response["Cache-Control"] = f"public, max-age={settings.AUDIO_CACHE_MAX_AGE}, immutable"
+        return response
+
+    def _file_response(self, request, path, filename, size, etag):
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        offload = settings.AUDIO_OFFLOAD.lower()
+        if offload:
+            # The proxy sends the bytes and handles Range itself
+            response = HttpResponse(content_type=content_type)
+            if offload == "x-accel-redirect":
+                response["X-Accel-Redirect"] = posixpath.join(settings.AUDIO_OFFLOAD_PREFIX, filename)
+            else:
+                response["X-Sendfile"] = path
+            return response
+
+        # A range only applies while the client's copy is still current
+        if_range = request.headers.get("If-Range")
+        try:
+            byte_range = _parse_range(request.headers.get("Range"), size) if if_range in (None, etag) else None
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is None:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end - start + 1), status=206, content_type=content_type
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+        return response
@@ -2,19 +2,39 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Interview
-from .serializers import InterviewSerializer
+from .pagination import InterviewCursorPagination
+from .serializers import InterviewSerializer, InterviewSummarySerializer
 from django.contrib.auth.models import User
+from django.db.models.functions import Substr
+
+# Characters of the job description loaded for a summary's job title
+JOB_DESCRIPTION_EXCERPT_LENGTH = 200
 
 class InterviewByUserAPIView(APIView):
     def get(self, request, user_id):
         """
-        Retrieve interviews for a specific user ID.
+        Retrieve interviews for a specific user ID, newest first and cursor-paginated.
+
+        Returns summaries by default; pass ``?detail=full`` for complete interviews
+        including questions and conversation history.
         """
         try:
             user = User.objects.get(id=user_id)  # Fetch the user by ID
             interviews = Interview.objects.filter(user=user)  # Filter interviews by user
-            serializer = InterviewSerializer(interviews, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+
+            if request.query_params.get('detail') == 'full':
+                interviews = interviews.select_related('user').prefetch_related('turns')
+                serializer_class = InterviewSerializer
+            else:
+                interviews = interviews.only(
+                    'id', 'interview_id', 'status', 'created_at', 'updated_at'
+                ).annotate(job_description_excerpt=Substr('job_description', 1, JOB_DESCRIPTION_EXCERPT_LENGTH))
+                serializer_class = InterviewSummarySerializer
+
+            paginator = InterviewCursorPagination()
+            page = paginator.paginate_queryset(interviews, request, view=self)
+            serializer = serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -27,4 +27,30 @@ class InterviewApiUser(HttpUser):
             response = self.client.get(f"/api/interviews/{self.interview_id}/")
             print(f"Get Interview Response: {response.status_code}, {response.json()}")
         else:
-            print("No interview_id available, skipping get_interview task.")
\ No newline at end of file
+            print("No interview_id available, skipping get_interview task.")
+
+
+class AsyncInterviewApiUser(HttpUser):
+    """Same flow as InterviewApiUser, against the async endpoints served by thryv.asgi."""
+    wait_time = between(1, 5)
+    interview_id = None
+
+    @task
+    def start_interview(self):
+        payload = {
+            "job_description": "Data Scientist",
+            "user_id": 2
+        }
+
+        response = self.client.post("/api/async/start-interview/", json=payload)
+        if response.status_code == 200:
+            self.interview_id = response.json().get("interview_id")
+
+    @task
+    def continue_interview(self):
+        if self.interview_id:
+            payload = {
+                "interview_id": self.interview_id,
+                "user_response": "I have five years of experience building data pipelines."
+            }
+            self.client.post("/api/async/continue-interview/", json=payload)
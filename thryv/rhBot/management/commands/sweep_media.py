@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from thryv.media_sweeper import MediaSweeper
+
+
+class Command(BaseCommand):
+    help = "Remove expired interview audio and expired or unreferenced resume files from MEDIA_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without removing it.")
+        parser.add_argument("--batch-size", type=int, help="Files or rows handled per batch (default: MEDIA_SWEEP_BATCH_SIZE).")
+        parser.add_argument("--audio-retention", type=int, help="Seconds unused audio is kept (default: MEDIA_AUDIO_RETENTION).")
+        parser.add_argument("--resume-retention", type=int, help="Seconds resume uploads are kept (default: MEDIA_RESUME_RETENTION).")
+        parser.add_argument("--orphan-grace", type=int, help="Minimum age in seconds of an orphaned resume file (default: MEDIA_ORPHAN_GRACE).")
+
+    def handle(self, *args, **options):
+        sweeper = MediaSweeper.from_settings(
+            batch_size=options["batch_size"],
+            audio_retention=options["audio_retention"],
+            resume_retention=options["resume_retention"],
+            orphan_grace=options["orphan_grace"],
+            dry_run=options["dry_run"],
+        )
+        counts = sweeper.sweep()
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(
+            f"{verb} {counts['audio_files']} expired audio file(s) and {counts['resume_files']} orphaned resume file(s); "
+            f"released the uploads of {counts['expired_resumes']} expired resume(s) and job(s)."
+        )
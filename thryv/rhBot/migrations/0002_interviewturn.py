@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rhBot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interview',
+            name='conversation_history',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='InterviewTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('role', models.CharField(choices=[('assistant', 'Assistant'), ('user', 'User')], max_length=10)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='rhBot.interview')),
+            ],
+            options={
+                'ordering': ['interview', 'index'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='interviewturn',
+            constraint=models.UniqueConstraint(fields=('interview', 'index'), name='unique_interview_turn_index'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+import json
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def _legacy_messages(conversation_history):
+    """Decode a legacy history: a list of messages, or that list JSON-encoded as a string."""
+    if isinstance(conversation_history, str):
+        try:
+            conversation_history = json.loads(conversation_history)
+        except ValueError:
+            return None
+    if not isinstance(conversation_history, list):
+        return None
+    if not all(isinstance(m, dict) and "role" in m and "content" in m for m in conversation_history):
+        return None
+    return conversation_history
+
+
+def forwards(apps, schema_editor):
+    Interview = apps.get_model("rhBot", "Interview")
+    InterviewTurn = apps.get_model("rhBot", "InterviewTurn")
+
+    interviews = Interview.objects.only("id", "conversation_history").order_by("id")
+    for interview in interviews.iterator(chunk_size=BATCH_SIZE):
+        messages = _legacy_messages(interview.conversation_history)
+        if not messages:
+            continue  # Empty or unrecognised shape: leave the row untouched
+        InterviewTurn.objects.bulk_create([
+            InterviewTurn(interview_id=interview.id, index=index, role=message["role"], content=str(message["content"]))
+            for index, message in enumerate(messages)
+        ])
+        Interview.objects.filter(pk=interview.pk).update(conversation_history=[])
+
+
+def backwards(apps, schema_editor):
+    Interview = apps.get_model("rhBot", "Interview")
+    InterviewTurn = apps.get_model("rhBot", "InterviewTurn")
+
+    interview_ids = InterviewTurn.objects.values_list("interview_id", flat=True).distinct()
+    for interview_id in interview_ids.iterator():
+        turns = InterviewTurn.objects.filter(interview_id=interview_id).order_by("index")
+        messages = [{"role": turn.role, "content": turn.content} for turn in turns]
+        # Restore the format the old views expected: a JSON string inside the JSONField
+        Interview.objects.filter(pk=interview_id).update(conversation_history=json.dumps(messages))
+    InterviewTurn.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rhBot", "0002_interviewturn"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,34 @@
+import uuid
+
+from django.db import migrations
+
+# Namespace for deriving stable UUIDs from legacy, non-UUID interview ids
+LEGACY_INTERVIEW_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "thryv:interview")
+
+
+def normalize_interviews(apps, schema_editor):
+    """Rewrite interview ids as 32-char UUID hex and statuses as known choices before the columns change type."""
+    Interview = apps.get_model("rhBot", "Interview")
+    statuses = {"ongoing", "completed"}
+
+    for interview in Interview.objects.only("id", "interview_id", "status").iterator(chunk_size=1000):
+        try:
+            interview_id = uuid.UUID(str(interview.interview_id)).hex
+        except ValueError:
+            interview_id = uuid.uuid5(LEGACY_INTERVIEW_ID_NAMESPACE, str(interview.interview_id)).hex
+        status = str(interview.status).strip().lower()
+        if status not in statuses:
+            status = "ongoing"
+        if interview_id != interview.interview_id or status != interview.status:
+            Interview.objects.filter(pk=interview.pk).update(interview_id=interview_id, status=status)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rhBot", "0003_move_conversation_history_to_turns"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_interviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('rhBot', '0004_normalize_interview_ids'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interview',
+            name='interview_id',
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='interview',
+            name='status',
+            field=models.CharField(choices=[('ongoing', 'Ongoing'), ('completed', 'Completed')], default='ongoing', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='interview',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['user', '-created_at'], name='interview_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['status'], name='interview_status_idx'),
+        ),
+    ]
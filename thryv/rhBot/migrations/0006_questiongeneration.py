@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rhBot', '0005_compact_interview_schema'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('succeeded', models.BooleanField(default=False)),
+                ('llm_calls', models.PositiveSmallIntegerField(default=0)),
+                ('llm_seconds', models.FloatField(default=0.0)),
+                ('question_count', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
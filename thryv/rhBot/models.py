@@ -1,15 +1,96 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 
 class Interview(models.Model):
-    interview_id = models.CharField(max_length=100, unique=True)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    class Status(models.TextChoices):
+        ONGOING = "ongoing", "Ongoing"
+        COMPLETED = "completed", "Completed"
+
+    interview_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    # Indexed through the (user, -created_at) index below
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     job_description = models.TextField()
     questions = models.JSONField(null=True, blank=True)  # Allow null and blank
-    conversation_history = models.JSONField()
-    status = models.CharField(max_length=20)
+    # Legacy whole-conversation blob; turns are now stored as InterviewTurn rows
+    conversation_history = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.ONGOING)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # A user's interviews, newest first (listing and its cursor pagination)
+            models.Index(fields=["user", "-created_at"], name="interview_user_created_idx"),
+            models.Index(fields=["status"], name="interview_status_idx"),
+        ]
+
     def __str__(self):
         return f"Interview with {self.user} for job: {self.job_description}"
+
+    def history(self):
+        """Return the conversation as a list of ``{"role", "content"}`` messages."""
+        return [turn.as_message() for turn in self.turns.all()]
+
+    async def ahistory(self):
+        """Async counterpart of ``history``."""
+        return [turn.as_message() async for turn in self.turns.all()]
+
+    def append_turns(self, start_index, messages):
+        """Insert ``messages`` as the turns numbered from ``start_index``, in one INSERT."""
+        return InterviewTurn.objects.bulk_create(self._build_turns(start_index, messages))
+
+    async def aappend_turns(self, start_index, messages):
+        """Async counterpart of ``append_turns``."""
+        return await InterviewTurn.objects.abulk_create(self._build_turns(start_index, messages))
+
+    def _build_turns(self, start_index, messages):
+        return [
+            InterviewTurn(interview=self, index=start_index + offset, role=message["role"], content=message["content"])
+            for offset, message in enumerate(messages)
+        ]
+
+
+class InterviewTurn(models.Model):
+    """One message of an interview conversation; rows are only ever appended."""
+
+    class Role(models.TextChoices):
+        ASSISTANT = "assistant", "Assistant"
+        USER = "user", "User"
+
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name="turns")
+    index = models.PositiveIntegerField()
+    role = models.CharField(max_length=10, choices=Role.choices)
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["interview", "index"]
+        constraints = [
+            # Also the index history is read through, and rejects a turn submitted twice
+            models.UniqueConstraint(fields=["interview", "index"], name="unique_interview_turn_index"),
+        ]
+
+    def __str__(self):
+        return f"Turn {self.index} ({self.role}) of interview {self.interview_id}"
+
+    def as_message(self):
+        return {"role": self.role, "content": self.content}
+
+
+class QuestionGeneration(models.Model):
+    """One generation of an interview question set by the LLM, kept for the wasted-call statistics."""
+
+    succeeded = models.BooleanField(default=False)
+    # Completions requested: 1, or 2 when the first reply broke the schema and was retried
+    llm_calls = models.PositiveSmallIntegerField(default=0)
+    llm_seconds = models.FloatField(default=0.0)
+    question_count = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)  # Last schema violation, if any
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        outcome = "succeeded" if self.succeeded else "failed"
+        return f"Question generation {outcome} after {self.llm_calls} LLM call(s)"
@@ -0,0 +1,15 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class InterviewCursorPagination(CursorPagination):
+    """
+    Newest-first cursor pagination for interview listings.
+
+    Cursors seek on ``created_at`` instead of counting an OFFSET, so every page
+    costs the same however far back a user scrolls.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = settings.INTERVIEW_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.INTERVIEW_MAX_PAGE_SIZE
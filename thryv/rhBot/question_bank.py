@@ -0,0 +1,59 @@
+"""
+In-process cache of generated interview question sets.
+
+Sets are keyed by the normalized job description. Each key holds a pool of up
+to ``variants`` different question sets; until the pool is full every start
+still asks the LLM (and the result joins the pool), after that a random
+variant is served so candidates don't all get identical scripts.
+"""
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_NON_WORD = re.compile(r"[^\w+#]+")
+
+
+def normalize_job_description(job_description):
+    """Collapse case, punctuation and whitespace so trivially different postings share a key."""
+    return " ".join(_NON_WORD.sub(" ", job_description.lower()).split())
+
+
+class QuestionBank:
+    """LRU cache of question-set variants with a per-variant time to live."""
+
+    def __init__(self, max_entries, ttl, variants):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variants = variants
+        self._entries = OrderedDict()  # key -> list of (expires_at, questions)
+        self._lock = threading.Lock()
+
+    def get(self, job_description):
+        """Return a cached question set, or None when the LLM should be called."""
+        key = normalize_job_description(job_description)
+        now = time.monotonic()
+        with self._lock:
+            pool = self._entries.get(key)
+            if pool is None:
+                return None
+            pool[:] = [variant for variant in pool if variant[0] > now]
+            if not pool:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            if len(pool) < self.variants:
+                return None
+            return list(random.choice(pool)[1])
+
+    def add(self, job_description, questions):
+        """Add a freshly generated question set to the pool for its job description."""
+        key = normalize_job_description(job_description)
+        with self._lock:
+            pool = self._entries.setdefault(key, [])
+            self._entries.move_to_end(key)
+            pool.append((time.monotonic() + self.ttl, list(questions)))
+            del pool[:-self.variants]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
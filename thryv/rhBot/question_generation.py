@@ -0,0 +1,148 @@
+"""
+Interview question generation in JSON mode, validated against a schema.
+
+The LLM is asked for ``{"questions": [...]}`` with ``response_format``
+``json_object`` (as cvBot does for resume evaluations) instead of a prose
+script, so wrapped or numbered lines no longer come back as zero questions.
+A reply that still breaks ``QUESTIONS_SCHEMA`` gets one constrained retry:
+the model sees its reply and what was wrong with it, and answers again at
+temperature 0. Only when that retry fails too does the start fail.
+
+Every generation is stored as a ``QuestionGeneration`` row, so
+``QuestionGenerationStatsView`` can report the calls whose reply was thrown
+away and the starts the retry rescued.
+"""
+import json
+import re
+import time
+
+from thryv.text_normalization import normalize
+
+from .models import QuestionGeneration
+
+MIN_QUESTIONS = 3
+MAX_QUESTIONS = 15
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "minItems": MIN_QUESTIONS,
+            "maxItems": MAX_QUESTIONS,
+            "items": {"type": "string", "minLength": 1},
+        },
+    },
+    "required": ["questions"],
+}
+
+QUESTIONS_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Options of the retry: no sampling, the schema violation was enough creativity
+RETRY_OPTIONS = {"temperature": 0}
+
+# Numbering or bullets the model may still put in front of a question
+_LIST_MARKER = re.compile(r"^(?:\d{1,2}[.):]|[-*•])\s+")
+
+
+class QuestionSchemaError(ValueError):
+    """Raised when an LLM reply doesn't match ``QUESTIONS_SCHEMA``."""
+
+
+class QuestionGenerationError(Exception):
+    """Raised when no valid question set was generated, retry included."""
+
+
+def parse_questions(content):
+    """
+    Validate an LLM reply against ``QUESTIONS_SCHEMA``.
+
+    Returns:
+        list: The questions, whitespace collapsed and list markers removed.
+
+    Raises:
+        QuestionSchemaError: If the reply isn't a JSON object with 3 to 15 non-empty strings in ``questions``.
+    """
+    try:
+        reply = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        raise QuestionSchemaError("the reply is not valid JSON")
+    questions = reply.get("questions") if isinstance(reply, dict) else None
+    if not isinstance(questions, list):
+        raise QuestionSchemaError('the reply has no "questions" array')
+    if not all(isinstance(question, str) for question in questions):
+        raise QuestionSchemaError('every item of "questions" must be a string')
+
+    questions = [_LIST_MARKER.sub("", normalize(question, ascii=False)) for question in questions]
+    questions = [question for question in questions if question]
+    if not MIN_QUESTIONS <= len(questions) <= MAX_QUESTIONS:
+        raise QuestionSchemaError(
+            f'"questions" must hold {MIN_QUESTIONS} to {MAX_QUESTIONS} non-empty strings, not {len(questions)}'
+        )
+    return questions
+
+
+def _retry_messages(messages, content, error):
+    """The conversation of the constrained retry: the rejected reply and why it was rejected."""
+    return messages + [
+        {"role": "assistant", "content": str(content)[:2000]},
+        {"role": "user", "content": (
+            f"That reply is invalid: {error}. Answer again with only a JSON object matching this "
+            f"JSON schema, with no other text: {json.dumps(QUESTIONS_SCHEMA)}"
+        )},
+    ]
+
+
+def _check(generation, messages, content):
+    """Record one reply; return its questions, or None and the retry conversation."""
+    generation.llm_calls += 1
+    try:
+        questions = parse_questions(content)
+    except QuestionSchemaError as e:
+        generation.error = str(e)[:255]
+        return None, _retry_messages(messages, content, e)
+    generation.succeeded = True
+    generation.question_count = len(questions)
+    return questions, messages
+
+
+def generate_questions(gateway, prompt):
+    """
+    Generate a question set for ``prompt``, retrying once on a schema violation.
+
+    Returns:
+        list: The questions.
+
+    Raises:
+        QuestionGenerationError: If both replies break the schema.
+    """
+    generation = QuestionGeneration()
+    messages = [{"role": "user", "content": prompt}]
+    started = time.monotonic()
+    try:
+        for options in ({}, RETRY_OPTIONS):
+            content = gateway.complete(messages, response_format=QUESTIONS_RESPONSE_FORMAT, **options)
+            questions, messages = _check(generation, messages, content)
+            if questions:
+                return questions
+        raise QuestionGenerationError(f"Failed to generate valid questions: {generation.error}.")
+    finally:
+        generation.llm_seconds = time.monotonic() - started
+        generation.save()
+
+
+async def agenerate_questions(gateway, prompt):
+    """Async counterpart of ``generate_questions``."""
+    generation = QuestionGeneration()
+    messages = [{"role": "user", "content": prompt}]
+    started = time.monotonic()
+    try:
+        for options in ({}, RETRY_OPTIONS):
+            content = await gateway.acomplete(messages, response_format=QUESTIONS_RESPONSE_FORMAT, **options)
+            questions, messages = _check(generation, messages, content)
+            if questions:
+                return questions
+        raise QuestionGenerationError(f"Failed to generate valid questions: {generation.error}.")
+    finally:
+        generation.llm_seconds = time.monotonic() - started
+        await generation.asave()
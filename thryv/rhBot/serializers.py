@@ -2,6 +2,8 @@ from rest_framework import serializers
 from .models import Interview
 from django.contrib.auth.models import User
 
+JOB_TITLE_MAX_LENGTH = 80
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -22,6 +24,7 @@ class InterviewSerializer(serializers.ModelSerializer):
         source='user',  # Map user_id to the 'user' foreign key field
         write_only=True  # Only allow this field during creation or update
     )
+    conversation_history = serializers.SerializerMethodField()
 
     class Meta:
         model = Interview
@@ -31,11 +34,15 @@ class InterviewSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']  # Ensure timestamps are read-only
 
+    def get_conversation_history(self, obj):
+        """Conversation rebuilt from the interview's turns (prefetch ``turns`` for lists)."""
+        return obj.history()
+
     def validate_status(self, value):
         """
         Custom validation for the `status` field.
         """
-        allowed_statuses = ['Pending', 'In Progress', 'Completed', 'Cancelled']
+        allowed_statuses = Interview.Status.values
         if value not in allowed_statuses:
             raise serializers.ValidationError(
                 f"Invalid status: {value}. Allowed values are {', '.join(allowed_statuses)}."
@@ -53,3 +60,25 @@ class InterviewSerializer(serializers.ModelSerializer):
         Custom update method if needed for additional logic.
         """
         return super().update(instance, validated_data)
+
+
+class InterviewSummarySerializer(serializers.ModelSerializer):
+    """
+    Lightweight serializer for interview listings.
+
+    ``job_title`` is the first line of the job description, read from the
+    ``job_description_excerpt`` annotation so the full text is never loaded.
+    """
+    job_title = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Interview
+        fields = ['id', 'interview_id', 'status', 'job_title', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+    def get_job_title(self, obj):
+        excerpt = obj.job_description_excerpt.strip()
+        first_line = excerpt.splitlines()[0] if excerpt else ""
+        if len(first_line) > JOB_TITLE_MAX_LENGTH:
+            return first_line[:JOB_TITLE_MAX_LENGTH - 3].rstrip() + "..."
+        return first_line
@@ -1,35 +1,30 @@
 # rhBot/signals.py
 
+import logging
+
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import Interview
 
+logger = logging.getLogger(__name__)
+
 @receiver(post_save, sender=Interview)
 def handle_new_interview(sender, instance, created, **kwargs):
     if created:
-        print(f"New interview created: {instance.interview_id}")
-        # You can add additional logic here, such as:
-        # - Sending a notification
-        # - Updating related models
-        # - Triggering an external API call
+        logger.debug(f"New interview created: {instance.interview_id}")
 
 @receiver(pre_delete, sender=Interview)
 def handle_interview_deletion(sender, instance, **kwargs):
-    print(f"Interview being deleted: {instance.interview_id}")
-    # You can add cleanup logic here, such as:
-    # - Deleting related data
-    # - Logging the deletion
-    # - Notifying relevant parties
+    # Turns are deleted by the FK cascade. Question audio is shared with other
+    # interviews asking the same question, so it is not deleted here: the
+    # media sweeper removes it once unused for MEDIA_AUDIO_RETENTION.
+    logger.debug(f"Interview being deleted: {instance.interview_id}")
 
 @receiver(post_save, sender=User)
 def handle_new_user(sender, instance, created, **kwargs):
     if created:
-        print(f"New user created: {instance.username}")
-        # You can add user initialization logic here, such as:
-        # - Creating a user profile
-        # - Sending a welcome email
-        # - Setting up default preferences
+        logger.debug(f"New user created: {instance.username}")
 
-# Note: Remember to import and use these signals in your app's configuration
-# This is typically done in the apps.py file, in the ready() method of your AppConfig
\ No newline at end of file
+# Connected in RhBotConfig.ready(); uploads of deleted users' resumes are
+# released by the cvBot signals
@@ -15,7 +15,7 @@ class InterviewModelTestCase(TestCase):
 
         #  interview instance
         self.interview = Interview.objects.create(
-            interview_id="Int12345",
+            interview_id="3f1c2a9e-6f4b-4d1e-9a53-1c8e2b7d4f60",
             user=self.user,
             job_description="software engineer",
             questions=[
@@ -32,7 +32,7 @@ class InterviewModelTestCase(TestCase):
 
     def test_interview_creation(self):
 
-        interview = Interview.objects.get(interview_id="Int12345")
+        interview = Interview.objects.get(interview_id="3f1c2a9e-6f4b-4d1e-9a53-1c8e2b7d4f60")
         self.assertEqual(interview.user.username, "testuser")
         self.assertEqual(interview.job_description, "software engineer")
         self.assertEqual(interview.status, "ongoing")
@@ -46,7 +46,7 @@ class InterviewAPITestCase(APITestCase):
         self.client.login(username="testuser", password="password123")
 
         self.interview = Interview.objects.create(
-            interview_id="int12345",
+            interview_id="8b0e5d2c-1a7f-4c39-b6e4-2d9f0a1c3e57",
             user=self.user,
             job_description="Software Engineer",
             conversation_history={},
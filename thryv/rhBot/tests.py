@@ -1,6 +1,24 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import time
+import wave
+from datetime import timedelta
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.contrib.auth.models import  User
-from  .models import Interview
+from cvBot.models import Resume
+from thryv.media_sweeper import MediaSweeper
+from . import views
+from  .models import Interview, QuestionGeneration
+from .audio_cache import AudioCache
+from .question_bank import QuestionBank
+from .question_generation import MAX_QUESTIONS, MIN_QUESTIONS, QuestionSchemaError, parse_questions
+from .tts import GoogleTTSBackend, LocalTTSBackend
 
 class InterviewModelTestCase(TestCase):
     def setUp(self):
@@ -8,7 +26,7 @@ class InterviewModelTestCase(TestCase):
 
 
         self.interview = Interview.objects.create(
-            interview_id="Int12345",
+            interview_id="3f1c2a9e-6f4b-4d1e-9a53-1c8e2b7d4f60",
             user=self.user,
             job_description="software engeineer",
             questions={"1. Can you start by telling us a little about yourself and why you're interested in this Software Engineer position?",
@@ -19,8 +37,473 @@ class InterviewModelTestCase(TestCase):
         )
 
         def  test_interview_cretion(self):
-          interview = Interview.objects.get(interview_id="Int12345")
+          interview = Interview.objects.get(interview_id="3f1c2a9e-6f4b-4d1e-9a53-1c8e2b7d4f60")
           self.assertEqual(interview.user.username, "testuser")
           self.assertEqual(interview.job_description, "software engeineer")
           self.assertEqual(interview.status, "ongoing")
 
+
+
+class AsyncInterviewViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="asyncuser", password="password123")
+
+    @override_settings(LLM_API_KEY="test-key")
+    def test_async_start_interview(self):
+        gateway = mock.MagicMock()
+        gateway.acomplete = mock.AsyncMock(
+            return_value='{"questions": ["What drew you to data science?", "Tell us about a recent project?", '
+                         '"How do you validate a model?"]}'
+        )
+
+        with mock.patch("rhBot.async_views.get_llm_gateway", return_value=gateway), \
+                mock.patch("rhBot.async_views._schedule_audio"), \
+                mock.patch("rhBot.async_views._agenerate_audio", new=mock.AsyncMock(return_value="q.mp3")):
+            response = self.client.post(
+                "/api/async/start-interview/",
+                {"job_description": "Data Scientist", "user_id": self.user.id},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["current_question"], "What drew you to data science?")
+        self.assertTrue(Interview.objects.filter(interview_id=body["interview_id"]).exists())
+
+    @override_settings(LLM_API_KEY="test-key")
+    def test_async_start_interview_saves_nothing_when_the_turns_fail(self):
+        gateway = mock.MagicMock()
+        gateway.acomplete = mock.AsyncMock(
+            return_value='{"questions": ["Why embedded systems?", "Which RTOS have you used?", "How do you debug?"]}'
+        )
+
+        with mock.patch("rhBot.async_views.get_llm_gateway", return_value=gateway), \
+                mock.patch.object(Interview, "append_turns", side_effect=IntegrityError("turn insert failed")):
+            response = self.client.post(
+                "/api/async/start-interview/",
+                {"job_description": "Embedded Engineer", "user_id": self.user.id},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(Interview.objects.filter(job_description="Embedded Engineer").exists())
+
+    async def test_async_continue_interview_streams_feedback(self):
+        interview = await Interview.objects.acreate(
+            user=self.user,
+            job_description="Data Scientist",
+            questions=["Why data?", "What is overfitting?"],
+            status="ongoing"
+        )
+        await interview.aappend_turns(0, [{"role": "assistant", "content": "Why data?"}])
+
+        async def stream(messages):
+            for token in ["Great ", "job!"]:
+                yield token
+
+        gateway = mock.MagicMock()
+        gateway.astream = stream
+        with mock.patch("rhBot.async_views.get_llm_gateway", return_value=gateway), \
+                mock.patch("rhBot.async_views._agenerate_audio", new=mock.AsyncMock(return_value="q.mp3")):
+            response = await self.async_client.post(
+                "/api/async/continue-interview/stream/",
+                {"interview_id": str(interview.interview_id), "user_response": "I like numbers."},
+                content_type="application/json",
+            )
+            body = "".join([chunk.decode() async for chunk in response.streaming_content])
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(body.startswith('event: token\ndata: {"content": "Great "}\n\n'))
+        self.assertIn('"current_question": "What is overfitting?"', body)
+        history = await interview.ahistory()
+        self.assertEqual(history[2], {"role": "assistant", "content": "Great job!"})
+
+
+@override_settings(LLM_API_KEY="test-key")
+class QuestionGenerationTestCase(TestCase):
+    QUESTIONS = '{"questions": ["Welcome! Tell us about yourself?", "Why data?", "What is overfitting?"]}'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="generator", password="x")
+
+    def _start(self, *replies):
+        gateway = mock.MagicMock()
+        gateway.complete.side_effect = replies
+        with mock.patch("rhBot.views.get_llm_gateway", return_value=gateway), \
+                mock.patch("rhBot.views.question_bank", QuestionBank(max_entries=10, ttl=60, variants=1)), \
+                mock.patch("rhBot.views._schedule_audio"), \
+                mock.patch("rhBot.views._generate_audio", return_value="q.mp3"):
+            response = self.client.post(
+                "/api/start-interview/",
+                {"job_description": "Data Scientist", "user_id": self.user.id},
+                content_type="application/json",
+            )
+        return response, gateway.complete.call_args_list
+
+    def test_questions_come_from_the_json_reply(self):
+        response, calls = self._start(self.QUESTIONS)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["current_question"], "Welcome! Tell us about yourself?")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].kwargs["response_format"], {"type": "json_object"})
+        self.assertIn(f"{MIN_QUESTIONS} to {MAX_QUESTIONS} strings", calls[0].args[0][0]["content"])
+
+    def test_schema_violation_is_retried_once(self):
+        response, calls = self._start("1. Why data?\n2. What is overfitting?", self.QUESTIONS)
+
+        self.assertEqual(response.status_code, 200)
+        retry = calls[1]
+        self.assertEqual(retry.kwargs["temperature"], 0)
+        self.assertEqual([message["role"] for message in retry.args[0]], ["user", "assistant", "user"])
+        self.assertIn("not valid JSON", retry.args[0][2]["content"])
+
+        stats = self.client.get("/api/question-generation/stats/").json()
+        self.assertEqual(stats["rescued_by_retry"], 1)
+        self.assertEqual(stats["wasted_calls"], 1)
+        self.assertEqual(stats["wasted_call_rate"], 0.5)
+
+    def test_start_fails_when_the_retry_breaks_the_schema_too(self):
+        response, calls = self._start('{"questions": []}', '{"items": ["Why data?"]}')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('no "questions" array', response.json()["error"])
+        self.assertEqual(len(calls), 2)
+        generation = QuestionGeneration.objects.get()
+        self.assertEqual((generation.succeeded, generation.llm_calls), (False, 2))
+
+    def test_parse_questions(self):
+        self.assertEqual(
+            parse_questions('{"questions": ["1. Why data?", " - What is\\nbias? ", "", "3) Any questions?"]}'),
+            ["Why data?", "What is bias?", "Any questions?"],
+        )
+        for content in ("Why data?", '["Why data?"]', '{"questions": ["Why?", 2, "How?"]}',
+                        '{"questions": ["Why?", "How?"]}'):
+            with self.assertRaises(QuestionSchemaError):
+                parse_questions(content)
+
+
+class InterviewTurnTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="turns", password="x")
+        self.interview = Interview.objects.create(
+            user=self.user,
+            job_description="Data Scientist",
+            questions=["Why data?", "What is overfitting?"],
+            status="ongoing"
+        )
+        self.interview.append_turns(0, [{"role": "assistant", "content": "Why data?"}])
+
+    def _answer(self, user_response):
+        gateway = mock.MagicMock()
+        gateway.complete.return_value = "Great job!"
+        with mock.patch("rhBot.views.get_llm_gateway", return_value=gateway), \
+                mock.patch("rhBot.views._wait_for_audio", return_value="q.mp3"):
+            return self.client.post(
+                "/api/continue-interview/",
+                {"interview_id": str(self.interview.interview_id), "user_response": user_response},
+                content_type="application/json",
+            )
+
+    def test_each_answer_appends_turns_without_rewriting_the_interview(self):
+        response = self._answer("I like numbers.")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.interview.turns.values_list("index", "role")), [
+            (0, "assistant"), (1, "user"), (2, "assistant"), (3, "assistant"),
+        ])
+        self.assertEqual(response.json()["conversation_history"], self.interview.history())
+        self.assertEqual(Interview.objects.get(pk=self.interview.pk).conversation_history, [])
+
+    def test_last_answer_completes_the_interview(self):
+        self._answer("I like numbers.")
+        response = self._answer("Fitting noise.")
+
+        self.assertEqual(response.json()["message"], "Interview completed.")
+        self.assertEqual(self.interview.turns.count(), 6)
+        self.assertEqual(Interview.objects.get(pk=self.interview.pk).status, "completed")
+
+    def test_malformed_interview_id_is_not_found(self):
+        response = self.client.post(
+            "/api/continue-interview/",
+            {"interview_id": "Int12345", "user_response": "Hello"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_duplicate_turn_is_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.interview.append_turns(0, [{"role": "assistant", "content": "Why data?"}])
+
+
+class InterviewListingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="lister", password="x")
+        self.interview_ids = []
+        for number in range(3):
+            interview = Interview.objects.create(
+                user=self.user,
+                job_description=f"  Backend Engineer {number}\nWe are looking for " + "x" * 5000,
+                questions=["Why backend?"],
+                status="ongoing"
+            )
+            interview.append_turns(0, [{"role": "assistant", "content": "Why backend?"}])
+            self.interview_ids.append(str(interview.interview_id))
+
+    def test_summaries_are_paginated_newest_first(self):
+        response = self.client.get(f"/api/interviews/user/{self.user.id}/", {"page_size": 2})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([item["interview_id"] for item in body["results"]], self.interview_ids[:0:-1])
+        self.assertEqual(body["results"][0]["job_title"], "Backend Engineer 2")
+        self.assertNotIn("conversation_history", body["results"][0])
+
+        next_page = self.client.get(body["next"]).json()
+        self.assertEqual([item["interview_id"] for item in next_page["results"]], self.interview_ids[:1])
+        self.assertIsNone(next_page["next"])
+
+    def test_full_detail_is_opt_in(self):
+        response = self.client.get(f"/api/interviews/user/{self.user.id}/", {"detail": "full"})
+
+        result = response.json()["results"][0]
+        self.assertEqual(result["user"]["username"], "lister")
+        self.assertEqual(result["conversation_history"], [{"role": "assistant", "content": "Why backend?"}])
+
+
+class AudioFileViewTestCase(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        cache = AudioCache(tmpdir.name, max_bytes=1024)
+        patcher = mock.patch("rhBot.audio_views.audio_cache", cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.key = "a" * 64
+        self.filename = cache.put(self.key, b"0123456789")
+        self.url = f"/api/audio/{self.filename}"
+
+    def test_full_response_is_cacheable(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(response["ETag"], f'"{self.key}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Content-Type"], "audio/mpeg")
+
+    def test_conditional_get_returns_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.key}"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], f'"{self.key}"')
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(AUDIO_OFFLOAD="x-accel-redirect", AUDIO_OFFLOAD_PREFIX="/protected/audio_files/")
+    def test_offload_to_proxy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/audio_files/{self.filename}")
+        self.assertEqual(response.content, b"")
+
+    def test_unknown_or_invalid_names_are_not_found(self):
+        self.assertEqual(self.client.get(f"/api/audio/{'b' * 64}.mp3").status_code, 404)
+        self.assertEqual(self.client.get("/api/audio/..%2Fsecret.mp3").status_code, 404)
+
+
+class AudioCacheTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_identical_text_reuses_file(self):
+        cache = AudioCache(self.tmpdir.name, max_bytes=1024)
+        key = AudioCache.make_key("Tell me about yourself?", "en-US-Wavenet-H", "en-US", "MP3")
+        self.assertIsNone(cache.get(key))
+        filename = cache.put(key, b"audio")
+        self.assertEqual(cache.get(key), filename)
+        self.assertEqual(os.listdir(self.tmpdir.name), [filename])
+
+    def test_evicts_least_recently_used(self):
+        cache = AudioCache(self.tmpdir.name, max_bytes=10)
+        keys = [AudioCache.make_key(f"q{i}?", "voice", "en-US", "MP3") for i in range(3)]
+        cache.put(keys[0], b"aaaa")
+        cache.put(keys[1], b"bbbb")
+        cache.get(keys[0])  # keys[1] is now the least recently used
+        cache.put(keys[2], b"cccc")
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        cache = AudioCache(self.tmpdir.name, max_bytes=1024)
+        key = AudioCache.make_key("Why this role?", "voice", "en-US", "MP3")
+        with self.assertRaises(TypeError):
+            cache.put(key, mock.MagicMock())  # Not bytes, as a mocked TTS client returns
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+        self.assertIsNone(cache.get(key))
+
+
+class AudioPresynthesisTestCase(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = mock.patch("rhBot.views.audio_cache", AudioCache(tmpdir.name, max_bytes=1024))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_continue_reuses_background_synthesis(self):
+        from . import views
+
+        with mock.patch.object(views.tts_backend, "synthesize", return_value=b"audio") as synthesize:
+            views._schedule_audio(["Why this role?", "Where do you see yourself?"])
+            filename = views._wait_for_audio("Where do you see yourself?")
+            views._wait_for_audio("Why this role?")
+
+        self.assertEqual(filename, views.audio_cache.get(views.tts_backend.cache_key("Where do you see yourself?")))
+        self.assertEqual(synthesize.call_count, 2)
+
+    @override_settings(LLM_API_KEY="test-key")
+    def test_first_question_is_synthesized_before_the_rest_are_queued(self):
+        user = User.objects.create_user(username="presynthesis", password="x")
+        gateway = mock.MagicMock()
+        gateway.complete.return_value = '{"questions": ["Welcome! Why QA?", "What is a flaky test?", "Any questions?"]}'
+        audio = mock.MagicMock()
+        audio.generate.return_value = "q.mp3"
+
+        with mock.patch("rhBot.views.get_llm_gateway", return_value=gateway), \
+                mock.patch("rhBot.views._generate_audio", audio.generate), \
+                mock.patch("rhBot.views._schedule_audio", audio.schedule):
+            response = self.client.post(
+                "/api/start-interview/",
+                {"job_description": "QA Engineer", "user_id": user.id},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(audio.mock_calls, [
+            mock.call.generate("Welcome! Why QA?"),
+            mock.call.schedule(["What is a flaky test?", "Any questions?"]),
+        ])
+
+
+class LocalTTSBackendTestCase(TestCase):
+    def test_generates_deterministic_wav(self):
+        backend = LocalTTSBackend()
+        audio = backend.synthesize("Tell us about yourself?")
+        self.assertEqual(audio, backend.synthesize("Tell us about yourself?"))
+        with wave.open(io.BytesIO(audio)) as wav:
+            self.assertEqual(wav.getnchannels(), 1)
+            self.assertGreater(wav.getnframes(), 0)
+        self.assertNotEqual(backend.cache_key("Hi?"), GoogleTTSBackend().cache_key("Hi?"))
+
+
+class GoogleTTSClientPoolTestCase(TestCase):
+    @override_settings(TTS_CLIENT_POOL_SIZE=1, TTS_CLIENT_WAIT_TIMEOUT=0.2)
+    def test_failed_client_creation_frees_its_slot(self):
+        backend = GoogleTTSBackend()
+        with mock.patch.object(backend, "_make_client", side_effect=OSError("bad credentials")):
+            for _ in range(3):
+                with self.assertRaises(OSError):
+                    backend._acquire()
+
+        with mock.patch.object(backend, "_make_client", return_value=mock.MagicMock()):
+            client = backend._acquire()
+            with self.assertRaises(TimeoutError):
+                backend._acquire()  # The only client is busy
+        backend._clients.put(client)
+        self.assertIs(backend._acquire(), client)
+
+
+class QuestionBankTestCase(TestCase):
+    def test_serves_cached_variants_once_pool_is_full(self):
+        bank = QuestionBank(max_entries=10, ttl=60, variants=2)
+        bank.add("Data Scientist", ["Why data?"])
+        self.assertIsNone(bank.get("data scientist"))  # pool still growing
+        bank.add("  data   SCIENTIST!", ["What is overfitting?"])
+        self.assertIn(bank.get("Data Scientist"), [["Why data?"], ["What is overfitting?"]])
+
+    def test_expired_variants_are_dropped(self):
+        bank = QuestionBank(max_entries=10, ttl=0, variants=1)
+        bank.add("Data Scientist", ["Why data?"])
+        self.assertIsNone(bank.get("Data Scientist"))
+
+
+class MediaSweeperTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.audio_directory = os.path.join(self.media_root.name, "audio_files")
+        os.makedirs(self.audio_directory)
+        patcher = mock.patch("rhBot.views.audio_directory", self.audio_directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username="sweeper", password="x")
+        Interview.objects.create(user=self.user, job_description="Backend", questions=["Why backend?"])
+
+    def _write(self, relative_path, age):
+        path = os.path.join(self.media_root.name, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as media_file:
+            media_file.write(b"data")
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def _sweeper(self, **options):
+        options = {"audio_retention": 86400, "resume_retention": None, "orphan_grace": 3600, "batch_size": 2, **options}
+        return MediaSweeper(**options)
+
+    def test_removes_only_expired_audio(self):
+        referenced = views.audio_cache.filename_for(views.tts_backend.cache_key("Why backend?"))
+        kept = self._write(f"audio_files/{referenced}", age=7200)
+        expired = self._write(f"audio_files/{'b' * 64}.mp3", age=2 * 86400)
+        # Not asked by any ongoing interview, but still cached for the next one (e.g. a question bank set)
+        unreferenced = self._write(f"audio_files/{'c' * 64}.mp3", age=7200)
+        also_expired = self._write(f"audio_files/{'d' * 64}.mp3", age=3 * 86400)
+
+        self.assertEqual(self._sweeper(dry_run=True).sweep_audio(), 2)
+        self.assertTrue(os.path.exists(expired))
+
+        self.assertEqual(self._sweeper().sweep_audio(), 2)
+        self.assertEqual([os.path.exists(p) for p in (kept, expired, unreferenced, also_expired)], [True, False, True, False])
+
+    def test_removes_unreferenced_resume_files(self):
+        referenced = self._write("resumes/aa/referenced.pdf", age=7200)
+        orphan = self._write("resumes/bb/orphan.pdf", age=7200)
+        Resume.objects.create(user=self.user, name="cv.pdf", file="resumes/aa/referenced.pdf")
+
+        call_command("sweep_media", stdout=io.StringIO())
+
+        self.assertTrue(os.path.exists(referenced))
+        self.assertFalse(os.path.exists(orphan))
+
+    def test_expired_resumes_release_their_upload(self):
+        path = self._write("resumes/aa/old.pdf", age=7200)
+        resume = Resume.objects.create(user=self.user, name="cv.pdf", file="resumes/aa/old.pdf")
+        Resume.objects.filter(pk=resume.pk).update(created_at=timezone.now() - timedelta(days=40))
+
+        released = self._sweeper(resume_retention=30 * 86400).expire_resumes()
+
+        self.assertEqual(released, 1)
+        resume.refresh_from_db()
+        self.assertEqual(resume.file.name, "")
+        self.assertFalse(os.path.exists(path))
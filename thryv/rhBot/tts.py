@@ -0,0 +1,197 @@
+"""
+Text-to-speech backends for interview question audio.
+
+The backend is chosen with the ``TTS_BACKEND`` setting (a dotted class path).
+``GoogleTTSBackend`` talks to Google Cloud TTS; its SDK is imported and its
+clients are created on first use, then reused through a small pool.
+``LocalTTSBackend`` generates a synthetic WAV offline, so the whole interview
+flow can be load-tested without cloud access.
+"""
+import asyncio
+import io
+import math
+import queue
+import struct
+import threading
+import time
+import wave
+import weakref
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .audio_cache import AudioCache
+
+# How often a thread waiting for a pooled client checks whether it may create one
+_CLIENT_POLL_SECONDS = 0.5
+
+
+class BaseTTSBackend:
+    """Interface of a TTS backend; subclasses implement ``synthesize``."""
+
+    extension = "mp3"
+    language_code = ""
+    voice_name = ""
+    audio_encoding = ""
+
+    def synthesize(self, text):
+        """Return the encoded audio for ``text`` as bytes."""
+        raise NotImplementedError
+
+    async def asynthesize(self, text):
+        """Async counterpart of ``synthesize``; runs it on a thread by default."""
+        return await sync_to_async(self.synthesize, thread_sensitive=False)(text)
+
+    def cache_key(self, text):
+        """Audio cache key: everything that changes the synthesized audio."""
+        return AudioCache.make_key(text, self.voice_name, self.language_code, self.audio_encoding)
+
+
+class GoogleTTSBackend(BaseTTSBackend):
+    """Google Cloud Text-to-Speech, with lazily created, pooled clients."""
+
+    extension = "mp3"
+    language_code = "en-US"
+    voice_name = "en-US-Wavenet-H"
+    audio_encoding = "MP3"
+
+    def __init__(self):
+        self.credentials_file = settings.TTS_CREDENTIALS_FILE
+        self.pool_size = settings.TTS_CLIENT_POOL_SIZE
+        self.client_wait_timeout = settings.TTS_CLIENT_WAIT_TIMEOUT
+        self._clients = queue.LifoQueue()
+        self._created = 0
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> async client
+        self._lock = threading.Lock()
+
+    def synthesize(self, text):
+        client = self._acquire()
+        try:
+            response = client.synthesize_speech(**self._request(text))
+        finally:
+            self._clients.put(client)
+        return response.audio_content
+
+    async def asynthesize(self, text):
+        response = await self._get_async_client().synthesize_speech(**self._request(text))
+        return response.audio_content
+
+    def _acquire(self):
+        """
+        Take an idle client from the pool, creating one while under ``pool_size``.
+
+        Raises:
+            TimeoutError: If no client became free within ``client_wait_timeout`` seconds.
+        """
+        deadline = time.monotonic() + self.client_wait_timeout
+        while True:
+            try:
+                return self._clients.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    return self._make_client(async_client=False)
+                except Exception:
+                    # Give the slot back, or failed creations would leave the pool empty for good
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No Google TTS client became free within {self.client_wait_timeout}s.")
+            try:
+                return self._clients.get(timeout=min(remaining, _CLIENT_POLL_SECONDS))
+            except queue.Empty:
+                pass  # Check again: a failed creation may have freed a slot
+
+    def _get_async_client(self):
+        # gRPC aio channels belong to the event loop they were created on
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._make_client(async_client=True)
+                self._async_clients[loop] = client
+            return client
+
+    def _make_client(self, async_client):
+        from google.cloud import texttospeech
+
+        client_class = texttospeech.TextToSpeechAsyncClient if async_client else texttospeech.TextToSpeechClient
+        if self.credentials_file:
+            return client_class.from_service_account_json(self.credentials_file)
+        return client_class()  # Application Default Credentials
+
+    def _request(self, text):
+        from google.cloud import texttospeech
+
+        return {
+            "input": texttospeech.SynthesisInput(text=text),
+            "voice": texttospeech.VoiceSelectionParams(
+                language_code=self.language_code,
+                name=self.voice_name,
+                ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
+            ),
+            "audio_config": texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3),
+        }
+
+
+class LocalTTSBackend(BaseTTSBackend):
+    """
+    Offline backend producing a short 16-bit mono WAV of synthetic tones.
+
+    Each word becomes a beep whose pitch is derived from the word, so the
+    output is deterministic and its length scales with the text like speech.
+    """
+
+    extension = "wav"
+    language_code = "en-US"
+    voice_name = "local-synthetic"
+    audio_encoding = "LINEAR16"
+
+    sample_rate = 8000
+    word_seconds = 0.12
+    gap_seconds = 0.04
+
+    async def asynthesize(self, text):
+        return self.synthesize(text)  # Pure CPU and fast enough to run inline
+
+    def synthesize(self, text):
+        samples = bytearray()
+        gap = bytes(2 * int(self.sample_rate * self.gap_seconds))
+        for word in text.split() or [""]:
+            samples += self._tone(200 + zlib.crc32(word.lower().encode()) % 600)
+            samples += gap
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(bytes(samples))
+        return buffer.getvalue()
+
+    def _tone(self, frequency):
+        count = int(self.sample_rate * self.word_seconds)
+        step = 2 * math.pi * frequency / self.sample_rate
+        return struct.pack(f"<{count}h", *(int(8000 * math.sin(step * i)) for i in range(count)))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_tts_backend():
+    """Return the process-wide backend selected by the TTS_BACKEND setting."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = import_string(settings.TTS_BACKEND)()
+        return _backend
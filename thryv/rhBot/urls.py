@@ -1,9 +1,9 @@
 from django.urls import path
 
+from .async_views import AsyncStartInterviewView, AsyncContinueInterviewView, AsyncContinueInterviewStreamView
+from .audio_views import AudioFileView
 from .interviewCrude import InterviewByUserAPIView
-from .views import StartInterviewAPIView, ContinueInterviewAPIView, InterviewDetailView
-from django.conf import settings
-from django.conf.urls.static import static
+from .views import StartInterviewAPIView, ContinueInterviewAPIView, InterviewDetailView, QuestionGenerationStatsView
 
 
 
@@ -12,9 +12,14 @@ from django.conf.urls.static import static
 urlpatterns = [
     path('start-interview/', StartInterviewAPIView.as_view(), name='start-interview'),
     path('continue-interview/', ContinueInterviewAPIView.as_view(), name='continue-interview'),
+    path('async/start-interview/', AsyncStartInterviewView.as_view(), name='async-start-interview'),
+    path('async/continue-interview/', AsyncContinueInterviewView.as_view(), name='async-continue-interview'),
+    path('async/continue-interview/stream/', AsyncContinueInterviewStreamView.as_view(), name='async-continue-interview-stream'),
     path('interviews/user/<int:user_id>/', InterviewByUserAPIView.as_view(),name='get_interviews_by_user'),
     path('interviews/', InterviewByUserAPIView.as_view(), name='create_interview'),
     #path('interviews/<int:interview_id>/', InterviewByUserAPIView.as_view(),name='update_delete_interview'),
-    path('interviews/<str:interview_id>/', InterviewDetailView.as_view(), name='interview_detail'),
+    path('interviews/<uuid:interview_id>/', InterviewDetailView.as_view(), name='interview_detail'),
+    path('audio/<str:filename>', AudioFileView.as_view(), name='interview-audio'),
+    path('question-generation/stats/', QuestionGenerationStatsView.as_view(), name='question-generation-stats'),
     # path('end-interview/', EndInterviewAPIView.as_view(), name='end_interview'),
-]+ static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
@@ -1,37 +1,61 @@
 import os
-import posixpath
 import json
 import uuid
-import environ
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from groq import Groq
-from google.cloud import texttospeech
 from django.contrib.auth.models import User
 from django.conf import settings
-from .models import Interview
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, Q, Sum
+from django.urls import reverse
+from django.utils import timezone
+from thryv.llm_gateway import get_llm_gateway
+from thryv.text_normalization import normalize
+from .models import Interview, QuestionGeneration
 from .serializers import InterviewSerializer
+from .audio_cache import AudioCache
+from .question_bank import QuestionBank
+from .question_generation import (
+    MAX_QUESTIONS,
+    MIN_QUESTIONS,
+    QUESTIONS_SCHEMA,
+    QuestionGenerationError,
+    generate_questions,
+)
+from .tts import get_tts_backend
 
-# Load environment variables
-env = environ.Env()
-environ.Env.read_env()
+logger = logging.getLogger(__name__)
 
-# Initialize TTS client
-tts_client = texttospeech.TextToSpeechClient.from_service_account_json(
-    'C:/Users/amine/PycharmProjects/thryv/thryv/thryve-437811-b7386ccb7409 - Copy.json'
-)
+# TTS backend selected in settings; it connects lazily on first synthesis
+tts_backend = get_tts_backend()
 
 # Directory for audio files
 audio_directory = os.path.join(settings.MEDIA_ROOT, 'audio_files')
 os.makedirs(audio_directory, exist_ok=True)  # Ensure directory exists
-api_key = env("GROQ_API_KEY")
+audio_cache = AudioCache(audio_directory, settings.TTS_AUDIO_CACHE_MAX_BYTES, extension=tts_backend.extension)
+
+# Bounded pool that synthesizes upcoming questions while the candidate answers
+tts_executor = ThreadPoolExecutor(max_workers=settings.TTS_PRESYNTHESIS_WORKERS, thread_name_prefix="tts")
+_pending_audio = {}  # audio cache key -> Future of the cached filename
+_pending_audio_lock = threading.Lock()
+
+# Generated question sets, reused for job descriptions we have already seen
+question_bank = QuestionBank(
+    max_entries=settings.QUESTION_BANK_MAX_ENTRIES,
+    ttl=settings.QUESTION_BANK_TTL,
+    variants=settings.QUESTION_BANK_VARIANTS,
+)
+
 
 class StartInterviewAPIView(APIView):
     def post(self, request):
         """Starts an interview session."""
-        api_key = env("GROQ_API_KEY")
-        if not api_key:
+        if not settings.LLM_API_KEY:
             return Response({"error": "GROQ_API_KEY is not set."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         job_description = request.data.get("job_description", "").strip()
@@ -49,63 +73,43 @@ class StartInterviewAPIView(APIView):
             return Response({"error": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            # Generate interview questions using Groq API
-            client = Groq(api_key=api_key)
-            prompt = f"""
-                As an experienced HR specialist, create a welcoming interview script for this {job_description} position. 
-                    
-                    Begin with a warm welcome greeting, then follow with conversational interview questions that naturally flow from one topic to another. Craft questions that reveal both technical capabilities and personality traits while maintaining a comfortable atmosphere.
-                    
-                    The questions should:
-                    - Start with an ice-breaker
-                    - Blend naturally without numbering or bullet points
-                    - Progress from general to more specific topics
-                    - Include behavioral and situational scenarios
-                    - Cover required technical skills
-                    - Assess cultural fit and soft skills
-                    
-                    Please write the questions as a flowing conversation rather than a numbered list."""
-            chat_response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.1-70b-versatile"
-            )
-            raw_questions = chat_response.choices[0].message.content.split("\n")
-            questions = [q.strip() for q in raw_questions if q.strip().endswith("?")]
-
-            if not questions:
-                return Response(
-                    {"error": "Failed to generate valid questions."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+            # Reuse a cached question set, or generate one using the LLM gateway
+            questions = question_bank.get(job_description)
+            if questions is None:
+                prompt = _build_questions_prompt(job_description)
+                try:
+                    questions = generate_questions(get_llm_gateway(), prompt)
+                except QuestionGenerationError as e:
+                    return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                question_bank.add(job_description, questions)
 
             # Save interview data
             interview_id = str(uuid.uuid4())
-            conversation_history = json.dumps([{"role": "assistant", "content": questions[0]}])  # Initialize as JSON string
-
-            interview = Interview.objects.create(
-                interview_id=interview_id,
-                user=user,
-                job_description=job_description,
-                questions=questions,
-                conversation_history=conversation_history,
-                status="ongoing"
-            )
+            conversation_history = [{"role": "assistant", "content": questions[0]}]
+
+            with transaction.atomic():
+                interview = Interview.objects.create(
+                    interview_id=interview_id,
+                    user=user,
+                    job_description=job_description,
+                    questions=questions,
+                    status=Interview.Status.ONGOING
+                )
+                interview.append_turns(0, conversation_history)
 
-            # TTS Integration: Convert first question to audio
-            audio_filename = f"{interview_id}_first_question.mp3"
-            audio_path = os.path.join(audio_directory, audio_filename)
-            _generate_audio(questions[0], audio_path)
+            # TTS Integration: Convert first question to audio, then queue the rest in the
+            # background, so they don't compete with it for the pooled TTS clients
+            audio_filename = _generate_audio(questions[0])
+            _schedule_audio(questions[1:])
 
-            audio_url = request.build_absolute_uri(
-                posixpath.join(settings.MEDIA_URL, 'audio_files', audio_filename)
-            )
+            audio_url = audio_url_for(request, audio_filename)
 
             return Response({
                 "interview_id": interview_id,
                 "current_question": questions[0],
-                "conversation_history": json.loads(conversation_history),  # Convert back to JSON for response
+                "conversation_history": conversation_history,
                 "audio_url": audio_url,
-                "status": "ongoing"
+                "status": Interview.Status.ONGOING
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -124,41 +128,26 @@ class ContinueInterviewAPIView(APIView):
         try:
             interview = Interview.objects.get(interview_id=interview_id)
 
-
-
-            # Load and update conversation history
-            conversation_history = json.loads(interview.conversation_history)
+            # Load the conversation; only the turns added below get written back
+            conversation_history = interview.history()
+            turn_index = len(conversation_history)
             conversation_history.append({"role": "user", "content": user_response})
 
             # Evaluate user response and generate next question
             current_index = len(conversation_history) // 2  # Alternates user/assistant pairs
             questions = interview.questions
             current_question = questions[current_index-1]
-            client = Groq(api_key=api_key)
-            prompt = f""" You are an HR specialist evaluating a candidate's response to an interview question. 
-                        Question: {current_question} 
-                        Candidate's Answer: {user_response}
-                        Based on this answer, evaluate whether it is correct, and offer constructive feedback.
-                        - If the answer is correct, provide positive feedback like 'Great job!' and offer to move on to the next question.
-                        - If the answer is incorrect, provide a polite explanation, guide them with constructive feedback, and provide the correct answer.
-                                                     
-                         """
-            chat_response = client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="llama-3.1-70b-versatile"
-            )
-            print(chat_response)
-            response_content = chat_response.choices[0].message.content
+            prompt = _build_feedback_prompt(current_question, user_response)
+            response_content = get_llm_gateway().complete([{"role": "user", "content": prompt}])
 
             # Append the feedback to the conversation history
             conversation_history.append({"role": "assistant", "content": response_content})
 
             # Check if interview is completed
-
             if current_index >= len(questions):
-                interview.status = "completed"
-                interview.conversation_history = json.dumps(conversation_history)
-                interview.save()
+                with transaction.atomic():
+                    interview.append_turns(turn_index, conversation_history[turn_index:])
+                    Interview.objects.filter(pk=interview.pk).update(status=Interview.Status.COMPLETED, updated_at=timezone.now())
                 return Response({
                     "message": "Interview completed.",
                     "conversation_history": conversation_history
@@ -167,18 +156,13 @@ class ContinueInterviewAPIView(APIView):
             next_question = questions[current_index]
             conversation_history.append({"role": "assistant", "content": next_question})
 
-            # TTS Integration: Generate audio for the next question
-            audio_filename = f"{interview_id}_question_{current_index}.mp3"
-            audio_path = os.path.join(audio_directory, audio_filename)
-            _generate_audio(next_question, audio_path)
+            # TTS Integration: Audio for the next question was queued when the interview started
+            audio_filename = _wait_for_audio(next_question)
 
-            audio_url = request.build_absolute_uri(
-                posixpath.join(settings.MEDIA_URL, 'audio_files', audio_filename)
-            )
+            audio_url = audio_url_for(request, audio_filename)
 
-            # Save updated interview
-            interview.conversation_history = json.dumps(conversation_history)
-            interview.save()
+            # Save the new turns
+            interview.append_turns(turn_index, conversation_history[turn_index:])
 
             return Response({
                 "current_question": next_question,
@@ -186,25 +170,104 @@ class ContinueInterviewAPIView(APIView):
                 "conversation_history": conversation_history
             }, status=status.HTTP_200_OK)
 
-        except Interview.DoesNotExist:
+        except (Interview.DoesNotExist, ValidationError):  # Unknown or malformed UUID
             return Response({"error": "Invalid interview ID."}, status=status.HTTP_404_NOT_FOUND)
+        except IntegrityError:
+            return Response({"error": "This answer was already submitted."}, status=status.HTTP_409_CONFLICT)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 # Utility Functions
-def _generate_audio(text, path):
-    """Generate an audio file from text."""
-    synthesis_input = texttospeech.SynthesisInput(text=text)
-    voice = texttospeech.VoiceSelectionParams(
-        language_code="en-US",
-        name="en-US-Wavenet-H",
-        ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
-    )
-    audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-    response = tts_client.synthesize_speech(input=synthesis_input, voice=voice, audio_config=audio_config)
-
-    with open(path, "wb") as audio_file:
-        audio_file.write(response.audio_content)
+def _build_questions_prompt(job_description):
+    """Build the prompt asking the LLM for an interview script as JSON (``QUESTIONS_SCHEMA``)."""
+    job_description = normalize(job_description, ascii=False)
+    return f"""
+                As an experienced HR specialist, create a welcoming interview script for this {job_description} position. 
+                    
+                    Begin with a warm welcome greeting, then follow with conversational interview questions that naturally flow from one topic to another. Craft questions that reveal both technical capabilities and personality traits while maintaining a comfortable atmosphere.
+                    
+                    The questions should:
+                    - Start with an ice-breaker
+                    - Blend naturally without numbering or bullet points
+                    - Progress from general to more specific topics
+                    - Include behavioral and situational scenarios
+                    - Cover required technical skills
+                    - Assess cultural fit and soft skills
+                    
+                    Reply with JSON only: an object whose "questions" array holds {MIN_QUESTIONS} to {MAX_QUESTIONS} strings, one question each, in the order of the conversation, the first one opening with the welcome greeting. JSON schema: {json.dumps(QUESTIONS_SCHEMA)}"""
+
+
+def _build_feedback_prompt(current_question, user_response):
+    """Build the prompt asking the LLM to evaluate a candidate's answer."""
+    current_question = normalize(current_question, ascii=False)
+    user_response = normalize(user_response, ascii=False)
+    return f""" You are an HR specialist evaluating a candidate's response to an interview question. 
+                        Question: {current_question} 
+                        Candidate's Answer: {user_response}
+                        Based on this answer, evaluate whether it is correct, and offer constructive feedback.
+                        - If the answer is correct, provide positive feedback like 'Great job!' and offer to move on to the next question.
+                        - If the answer is incorrect, provide a polite explanation, guide them with constructive feedback, and provide the correct answer.
+                                                     
+                         """
+
+
+def audio_url_for(request, audio_filename):
+    """Absolute URL of a question audio file, served by ``AudioFileView``."""
+    return request.build_absolute_uri(reverse('interview-audio', args=[audio_filename]))
+
+
+def _generate_audio(text):
+    """
+    Return the filename of the audio for ``text`` inside ``audio_directory``.
+
+    Identical text is only synthesized once; later calls reuse the cached file.
+    """
+    key = tts_backend.cache_key(text)
+    audio_filename = audio_cache.get(key)
+    if audio_filename is None:
+        audio_filename = audio_cache.put(key, tts_backend.synthesize(text))
+    return audio_filename
+
+
+def _schedule_audio(texts):
+    """Queue background synthesis for ``texts`` on ``tts_executor``."""
+    for text in texts:
+        key = tts_backend.cache_key(text)
+        with _pending_audio_lock:
+            if key in _pending_audio:
+                continue
+            future = tts_executor.submit(_generate_audio, text)
+            _pending_audio[key] = future
+        future.add_done_callback(lambda f, key=key: _finish_scheduled_audio(key, f))
+
+
+def _finish_scheduled_audio(key, future):
+    with _pending_audio_lock:
+        _pending_audio.pop(key, None)
+    if future.exception() is not None:
+        logger.warning(f"Background audio synthesis failed: {future.exception()}")
+
+
+def pending_audio(text):
+    """Return the Future synthesizing ``text`` in the background, if any."""
+    with _pending_audio_lock:
+        return _pending_audio.get(tts_backend.cache_key(text))
+
+
+def _wait_for_audio(text):
+    """
+    Return the audio filename for ``text``, waiting only on its own background task.
+
+    Falls back to synthesizing inline when nothing was queued in this process
+    (e.g. the interview was started by another worker) or the task failed.
+    """
+    future = pending_audio(text)
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass
+    return _generate_audio(text)
 
 class InterviewDetailView(APIView):
     def get(self, request, interview_id):
@@ -221,4 +284,39 @@ class InterviewDetailView(APIView):
             return Response(
                 {"error": f"An unexpected error occurred: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+class QuestionGenerationStatsView(APIView):
+    """Wasted-call counters of interview question generation."""
+
+    def get(self, request):
+        """
+        A call is wasted when its reply is thrown away: the first reply of a
+        generation that needed the schema retry, and every call of a failed
+        generation. Generations the retry rescued used to end in a 500, after
+        which the client started over with a new full LLM call.
+
+        Returns:
+            Response: Generations (succeeded, failed, rescued by the retry),
+            LLM calls, wasted calls and their share of all calls, and the
+            average LLM time per generation.
+        """
+        totals = QuestionGeneration.objects.aggregate(
+            generations=Count("id"),
+            successes=Count("id", filter=Q(succeeded=True)),
+            rescues=Count("id", filter=Q(succeeded=True, llm_calls__gt=1)),
+            llm_calls=Sum("llm_calls"),
+            llm_seconds=Avg("llm_seconds"),
+        )
+        llm_calls = totals["llm_calls"] or 0
+        wasted_calls = llm_calls - totals["successes"]
+        return Response({
+            "generations": totals["generations"],
+            "succeeded": totals["successes"],
+            "failed": totals["generations"] - totals["successes"],
+            "rescued_by_retry": totals["rescues"],
+            "llm_calls": llm_calls,
+            "wasted_calls": wasted_calls,
+            "wasted_call_rate": wasted_calls / llm_calls if llm_calls else 0.0,
+            "average_llm_seconds": totals["llm_seconds"] or 0.0,
+        }, status=status.HTTP_200_OK)
@@ -2,6 +2,13 @@
 ASGI config for thryv project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with uvicorn so the async interview views in ``rhBot.async_views`` can
+overlap their LLM and TTS calls:
+
+    uvicorn thryv.asgi:application --host 0.0.0.0 --port 8000
+
+Django doesn't handle lifespan events, so they are answered here: on shutdown
+the LLM gateway's async connections are closed inside the server's loop.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +20,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'thryv.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from thryv.llm_gateway import aclose_llm_gateway  # noqa: E402 (after the settings module is set)
+
+
+async def application(scope, receive, send):
+    if scope["type"] != "lifespan":
+        return await django_application(scope, receive, send)
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await aclose_llm_gateway()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,326 @@
+"""
+Process-wide gateway to the chat-completion LLM shared by rhBot and cvBot.
+
+Requests go to an OpenAI-compatible ``/chat/completions`` endpoint (Groq by
+default) over pooled keep-alive connections, with configurable timeouts,
+bounded retries with jittered exponential backoff on 429/5xx and transport
+errors, and a cap on concurrent in-flight requests. Point ``LLM_BASE_URL``
+at ``benchmarks/llm_stub_server.py`` to run without Groq. httpx is imported
+on first use to keep worker start-up fast.
+
+The cap (``max_concurrency``) is counted separately for the sync API, across
+all threads of the process, and for the async API, per event loop: a worker
+serving both WSGI-style threads and one ASGI event loop can have up to twice
+``max_concurrency`` requests in flight. A streamed completion holds its slot
+until the upstream response has been read to the end, or until the caller
+closes the generator.
+
+Connections are closed by ``close()`` (registered with ``atexit`` for the
+process-wide gateway) and, for the async client of an event loop, by
+``aclose()``, which ``thryv.asgi`` awaits on lifespan shutdown.
+"""
+import atexit
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when the LLM request fails or retries are exhausted."""
+
+
+class LLMGateway:
+    """Pooled, rate-limited client for an OpenAI-compatible chat-completion API (see the module docstring for the caps)."""
+
+    def __init__(self, base_url, api_key, model, timeout=60.0, connect_timeout=5.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 max_concurrency=32, max_connections=64, transport=None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self._transport = transport
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._client = None
+        self._async_state = weakref.WeakKeyDictionary()  # event loop -> (AsyncClient, Semaphore)
+        self._lock = threading.Lock()
+
+    # Sync API
+
+    def complete(self, messages, response_format=None, **options):
+        """Return the content of a chat completion for ``messages``."""
+        payload = self._payload(messages, False, response_format, options)
+        with self._semaphore:
+            client = self._get_client()
+            response = self._send(client, client.build_request("POST", "chat/completions", json=payload))
+        return _message_content(response.json())
+
+    def stream(self, messages, **options):
+        """
+        Yield the content tokens of a streamed chat completion.
+
+        Reads one line ahead, so the concurrency slot is released as soon as
+        the upstream response ends, even if the caller never asks for the
+        token after the last one; closing the generator releases it too.
+        """
+        payload = self._payload(messages, True, None, options)
+        self._semaphore.acquire()
+        held, response = True, None
+        try:
+            client = self._get_client()
+            response = self._send(client, client.build_request("POST", "chat/completions", json=payload), stream=True)
+            pending = None
+            for line in response.iter_lines():
+                token = _stream_token(line)
+                if token is _DONE:
+                    break
+                if token:
+                    if pending is not None:
+                        yield pending
+                    pending = token
+            response.close()
+            self._semaphore.release()
+            held = False
+            if pending is not None:
+                yield pending
+        finally:
+            if response is not None:
+                response.close()
+            if held:
+                self._semaphore.release()
+
+    def close(self):
+        """Close the pooled connections: the sync client, and the async clients of loops no longer running."""
+        with self._lock:
+            client, self._client = self._client, None
+            async_states = list(self._async_state.items())
+            self._async_state.clear()
+        if client is not None:
+            client.close()
+        for loop, (async_client, _) in async_states:
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(async_client.aclose())
+
+    def _send(self, client, request, stream=False):
+        import httpx
+
+        attempt = 0
+        while True:
+            try:
+                response = client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"LLM request failed: {e}") from e
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in _RETRYABLE_STATUS or attempt >= self.max_retries:
+                    return _check_status(response)
+                response.close()
+                delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying LLM request in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_client(self):
+        import httpx
+
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(transport=self._transport, **self._client_options())
+            return self._client
+
+    # Async API
+
+    async def acomplete(self, messages, response_format=None, **options):
+        """Async counterpart of ``complete``."""
+        payload = self._payload(messages, False, response_format, options)
+        client, semaphore = self._get_async_state()
+        async with semaphore:
+            response = await self._asend(client, client.build_request("POST", "chat/completions", json=payload))
+        return _message_content(response.json())
+
+    async def astream(self, messages, **options):
+        """Async counterpart of ``stream``."""
+        payload = self._payload(messages, True, None, options)
+        client, semaphore = self._get_async_state()
+        await semaphore.acquire()
+        held, response = True, None
+        try:
+            response = await self._asend(
+                client, client.build_request("POST", "chat/completions", json=payload), stream=True
+            )
+            pending = None
+            async for line in response.aiter_lines():
+                token = _stream_token(line)
+                if token is _DONE:
+                    break
+                if token:
+                    if pending is not None:
+                        yield pending
+                    pending = token
+            await response.aclose()
+            semaphore.release()
+            held = False
+            if pending is not None:
+                yield pending
+        finally:
+            if response is not None:
+                await response.aclose()
+            if held:
+                semaphore.release()
+
+    async def aclose(self):
+        """Close the async client of the running event loop."""
+        with self._lock:
+            state = self._async_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
+
+    async def _asend(self, client, request, stream=False):
+        import httpx
+
+        attempt = 0
+        while True:
+            try:
+                response = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"LLM request failed: {e}") from e
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in _RETRYABLE_STATUS or attempt >= self.max_retries:
+                    return await _acheck_status(response)
+                await response.aclose()
+                delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying LLM request in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _get_async_state(self):
+        import httpx
+
+        # httpx async connections and asyncio semaphores belong to one event loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._async_state.get(loop)
+            if state is None:
+                transport = self._transport if isinstance(self._transport, httpx.AsyncBaseTransport) else None
+                state = (
+                    httpx.AsyncClient(transport=transport, **self._client_options()),
+                    asyncio.Semaphore(self.max_concurrency),
+                )
+                self._async_state[loop] = state
+            return state
+
+    # Helpers
+
+    def _client_options(self):
+        import httpx
+
+        if not self.api_key:
+            raise EnvironmentError("GROQ_API_KEY is not set in the environment.")
+        return {
+            "base_url": self.base_url,
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections),
+        }
+
+    def _payload(self, messages, stream, response_format, options):
+        payload = {"model": self.model, "messages": messages, "stream": stream, **options}
+        if response_format:
+            payload["response_format"] = response_format
+        return payload
+
+    def _backoff(self, attempt, response=None):
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+_DONE = object()
+
+
+def _stream_token(line):
+    """Parse one server-sent event line of a streamed completion."""
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return _DONE
+    choices = json.loads(data).get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content")
+
+
+def _message_content(body):
+    try:
+        return body["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        raise LLMError(f"Unexpected LLM response: {str(body)[:200]}")
+
+
+def _check_status(response):
+    if response.is_error:
+        response.read()
+        raise LLMError(f"LLM request failed with status {response.status_code}: {response.text[:200]}")
+    return response
+
+
+async def _acheck_status(response):
+    if response.is_error:
+        await response.aread()
+        raise LLMError(f"LLM request failed with status {response.status_code}: {response.text[:200]}")
+    return response
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway():
+    """Return the process-wide gateway configured from the LLM_* settings."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(
+                base_url=settings.LLM_BASE_URL,
+                api_key=settings.LLM_API_KEY,
+                model=settings.LLM_MODEL,
+                timeout=settings.LLM_TIMEOUT,
+                connect_timeout=settings.LLM_CONNECT_TIMEOUT,
+                max_retries=settings.LLM_MAX_RETRIES,
+                backoff_base=settings.LLM_BACKOFF_BASE,
+                backoff_max=settings.LLM_BACKOFF_MAX,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+            )
+            atexit.register(_gateway.close)
+        return _gateway
+
+
+async def aclose_llm_gateway():
+    """Close the process-wide gateway's async connections of the running loop, if it was ever created."""
+    if _gateway is not None:
+        await _gateway.aclose()
@@ -0,0 +1,193 @@
+"""
+Retention and garbage collection for files under ``MEDIA_ROOT``.
+
+* Interview audio (``audio_files/``) is a cache that can be regenerated and
+  is shared across interviews (question bank sets, common questions), so it
+  only expires: files unused for ``MEDIA_AUDIO_RETENTION`` seconds are
+  removed. A cache hit touches the file, and ``TTS_AUDIO_CACHE_MAX_BYTES``
+  bounds the rest with LRU eviction.
+* Resume uploads (``resumes/``) that no resume or evaluation job references
+  are removed. If ``MEDIA_RESUME_RETENTION`` is set, resumes older than that
+  lose their upload but keep their evaluation.
+
+Uploads younger than ``MEDIA_ORPHAN_GRACE`` are never treated as orphans,
+because they are written before the row that references them. Directories
+are scanned lazily, resume files are checked against the database
+``batch_size`` at a time and nothing is collected across batches, so memory
+use and query size stay bounded whatever the directory or table size. Run it
+with ``manage.py sweep_media``, or in the background of every worker by
+setting ``MEDIA_SWEEP_INTERVAL``.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _scan_files(directory):
+    """Yield ``(path, mtime)`` for every file below ``directory``, without listing it all at once."""
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                try:
+                    yield entry.path, entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+
+
+class MediaSweeper:
+    """Removes expired and unreferenced media files in bounded batches."""
+
+    def __init__(self, audio_retention, resume_retention, orphan_grace, batch_size, dry_run=False):
+        self.audio_retention = audio_retention
+        self.resume_retention = resume_retention
+        self.orphan_grace = orphan_grace
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        options = {
+            "audio_retention": settings.MEDIA_AUDIO_RETENTION,
+            "resume_retention": settings.MEDIA_RESUME_RETENTION,
+            "orphan_grace": settings.MEDIA_ORPHAN_GRACE,
+            "batch_size": settings.MEDIA_SWEEP_BATCH_SIZE,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**options)
+
+    def sweep(self):
+        """
+        Run every pass once.
+
+        Returns:
+            dict: Number of audio files removed, orphaned resume files removed,
+            and expired resumes whose upload was released.
+        """
+        return {
+            "audio_files": self.sweep_audio(),
+            "expired_resumes": self.expire_resumes(),
+            "resume_files": self.sweep_resume_files(),
+        }
+
+    def sweep_audio(self):
+        """Remove the audio files unused for ``audio_retention`` seconds."""
+        from rhBot.views import audio_directory
+
+        now = time.time()
+        removed = 0
+        for path, mtime in _scan_files(audio_directory):
+            if now - mtime > self.audio_retention:
+                removed += self._remove(path)
+        return removed
+
+    def sweep_resume_files(self):
+        from cvBot.models import Resume, ResumeEvaluationJob, resume_storage
+        from cvBot.storage import release_file
+
+        media_root = str(settings.MEDIA_ROOT)
+        now = time.time()
+        removed = 0
+        for batch in _batched(_scan_files(os.path.join(media_root, "resumes")), self.batch_size):
+            candidates = {
+                os.path.relpath(path, media_root).replace(os.sep, "/"): path
+                for path, mtime in batch if now - mtime > self.orphan_grace
+            }
+            if not candidates:
+                continue
+            referenced = set(Resume.objects.filter(file__in=candidates).values_list("file", flat=True))
+            referenced.update(ResumeEvaluationJob.objects.filter(file__in=candidates).values_list("file", flat=True))
+            for name, path in candidates.items():
+                if name in referenced:
+                    continue
+                if self.dry_run:
+                    removed += self._remove(path)
+                else:
+                    removed += release_file(resume_storage, name, grace=self.orphan_grace)
+        return removed
+
+    def expire_resumes(self):
+        """Release the uploads of resumes and finished jobs older than ``resume_retention``."""
+        if not self.resume_retention:
+            return 0
+        from cvBot.models import Resume, ResumeEvaluationJob, resume_storage
+        from cvBot.storage import release_file
+
+        cutoff = timezone.now() - timedelta(seconds=self.resume_retention)
+        finished = [ResumeEvaluationJob.Status.DONE, ResumeEvaluationJob.Status.FAILED]
+        querysets = [
+            Resume.objects.filter(created_at__lt=cutoff),
+            ResumeEvaluationJob.objects.filter(created_at__lt=cutoff, status__in=finished),
+        ]
+        released = 0
+        for queryset in querysets:
+            expired = queryset.exclude(file="").order_by("pk").values_list("pk", "file")
+            if self.dry_run:
+                released += expired.count()
+                continue
+            while batch := list(expired[:self.batch_size]):
+                released += len(batch)
+                with transaction.atomic():
+                    queryset.model.objects.filter(pk__in=[pk for pk, _ in batch]).update(file="")
+                for name in {name for _, name in batch}:
+                    release_file(resume_storage, name, grace=self.orphan_grace)
+        return released
+
+    def _remove(self, path):
+        if self.dry_run:
+            logger.info(f"Would remove {path}")
+            return 1
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return 0  # Already gone (another sweeper or cache eviction)
+        return 1
+
+
+_sweeper_thread = None
+_sweeper_lock = threading.Lock()
+
+
+def start_background_sweeper(interval):
+    """Run ``MediaSweeper.sweep`` every ``interval`` seconds on a daemon thread (once per process)."""
+    global _sweeper_thread
+    with _sweeper_lock:
+        if _sweeper_thread is not None:
+            return _sweeper_thread
+        _sweeper_thread = threading.Thread(target=_sweep_forever, args=(interval,), name="media-sweeper", daemon=True)
+        _sweeper_thread.start()
+        return _sweeper_thread
+
+
+def _sweep_forever(interval):
+    while True:
+        # Jitter so the workers of one deployment don't all sweep at the same moment
+        time.sleep(interval * random.uniform(0.75, 1.25))
+        try:
+            counts = MediaSweeper.from_settings().sweep()
+            logger.info(f"Media sweep removed {counts}")
+        except Exception as e:
+            logger.warning(f"Media sweep failed: {e}")
+        finally:
+            connection.close()
@@ -9,61 +9,29 @@ https://docs.djangoproject.com/en/5.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
-import pymysql
-pymysql.install_as_MySQLdb()
-
+import os
 from pathlib import Path
 
 import environ
 
-# Initialize environment variables
-import os
-import environ
-
-
-# Define the base directory
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Print the current working directory
-print(f"Current working directory: {os.getcwd()}")
-
-# Print the contents of the directory
-print(f"Directory contents: {os.listdir('.')}")
-
 env = environ.Env()
 
-# Specify the path to your .env file
-env_file = os.path.join(os.getcwd(), '.env')
-print(f"Looking for .env file at: {env_file}")
-
-CORS_ALLOW_ALL_ORIGINS = True
+# Fast-boot mode (THRYV_FAST_BOOT=1) is for deployments that pass configuration
+# through the process environment: settings then do no file I/O at import time.
+FAST_BOOT = env.bool("THRYV_FAST_BOOT", default=False)
 
+# Load the .env file from the working directory, if any
+if not FAST_BOOT:
+    env_file = os.path.join(os.getcwd(), '.env')
+    if os.path.exists(env_file):
+        environ.Env.read_env(env_file)
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# Set MEDIA_ROOT to the location where your audio files are stored
-MEDIA_ROOT = os.path.join(BASE_DIR, 'audio_files')
-
-# MEDIA_URL is the URL to access media files in your app
-MEDIA_URL = '/media/'
-
-# Check if the .env file exists
-if os.path.exists(env_file):
-    print(f".env file found at {env_file}")
-    environ.Env.read_env(env_file)
-else:
-    print(f".env file not found at {env_file}")
+CORS_ALLOW_ALL_ORIGINS = True
 
-# Try to get the GROQ_API_KEY with a default value
 GROQ_API_KEY = env("GROQ_API_KEY", default=None)
-print(f"GROQ_API_KEY: {'Set' if GROQ_API_KEY else 'Not set'}")
-
-
-# Print all environment variables (be careful with sensitive information)
-print("All environment variables:")
-for key, value in os.environ.items():
-    print(f"{key}: {'*' * len(value)}")  # Print asterisks instead of actual values for security
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
 
 
 
@@ -81,6 +49,106 @@ ALLOWED_HOSTS = []
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Text-to-speech backend for interview questions: rhBot.tts.GoogleTTSBackend, or
+# rhBot.tts.LocalTTSBackend to run offline. Without a credentials file, Google
+# uses Application Default Credentials (GOOGLE_APPLICATION_CREDENTIALS).
+TTS_BACKEND = env("TTS_BACKEND", default="rhBot.tts.GoogleTTSBackend")
+TTS_CREDENTIALS_FILE = env("TTS_CREDENTIALS_FILE", default=None)
+TTS_CLIENT_POOL_SIZE = env.int("TTS_CLIENT_POOL_SIZE", default=4)
+# Seconds a synthesis waits for a pooled Google client before failing
+TTS_CLIENT_WAIT_TIMEOUT = env.float("TTS_CLIENT_WAIT_TIMEOUT", default=30.0)
+
+# Upper bound on the disk used by cached interview question audio
+TTS_AUDIO_CACHE_MAX_BYTES = env.int("TTS_AUDIO_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+
+# Threads per worker that synthesize the remaining questions once an interview
+# starts; keep it below TTS_CLIENT_POOL_SIZE so the question a candidate is
+# waiting for always finds a free Google client
+TTS_PRESYNTHESIS_WORKERS = env.int("TTS_PRESYNTHESIS_WORKERS", default=3)
+
+# Cache of generated question sets per normalized job description: how many
+# descriptions to keep, how long a set stays valid (seconds), and how many
+# different sets to rotate through before the LLM is skipped
+QUESTION_BANK_MAX_ENTRIES = env.int("QUESTION_BANK_MAX_ENTRIES", default=1000)
+QUESTION_BANK_TTL = env.int("QUESTION_BANK_TTL", default=24 * 60 * 60)
+QUESTION_BANK_VARIANTS = env.int("QUESTION_BANK_VARIANTS", default=3)
+
+# Interview listing: default and largest page size a client may ask for
+INTERVIEW_PAGE_SIZE = env.int("INTERVIEW_PAGE_SIZE", default=20)
+INTERVIEW_MAX_PAGE_SIZE = env.int("INTERVIEW_MAX_PAGE_SIZE", default=100)
+
+# Resume PDF extraction runs on a process pool with per-document budgets
+PDF_EXTRACTION_WORKERS = env.int("PDF_EXTRACTION_WORKERS", default=2)
+PDF_EXTRACTION_MAX_PAGES = env.int("PDF_EXTRACTION_MAX_PAGES", default=20)
+PDF_EXTRACTION_TIMEOUT = env.float("PDF_EXTRACTION_TIMEOUT", default=10.0)
+PDF_EXTRACTION_MAX_CHARS = env.int("PDF_EXTRACTION_MAX_CHARS", default=100_000)
+
+# Batch resume upload: files per request and resumes evaluated concurrently
+RESUME_BATCH_MAX_FILES = env.int("RESUME_BATCH_MAX_FILES", default=50)
+RESUME_BATCH_CONCURRENCY = env.int("RESUME_BATCH_CONCURRENCY", default=8)
+
+# Question audio delivery: browser cache lifetime of the (content-addressed)
+# files, and optional hand-off of the bytes to the front proxy with
+# AUDIO_OFFLOAD = "x-accel-redirect" (nginx, internal location
+# AUDIO_OFFLOAD_PREFIX) or "x-sendfile" (Apache/lighttpd, absolute path)
+AUDIO_CACHE_MAX_AGE = env.int("AUDIO_CACHE_MAX_AGE", default=365 * 24 * 60 * 60)
+AUDIO_OFFLOAD = env.str("AUDIO_OFFLOAD", default="")
+AUDIO_OFFLOAD_PREFIX = env.str("AUDIO_OFFLOAD_PREFIX", default="/protected/audio_files/")
+
+# Media retention (seconds): unused question audio is kept for
+# MEDIA_AUDIO_RETENTION; uploads of resumes older than MEDIA_RESUME_RETENTION
+# are released (unset keeps them); unreferenced files younger than
+# MEDIA_ORPHAN_GRACE are left alone. MEDIA_SWEEP_INTERVAL > 0 runs the sweep
+# in the background of every worker, otherwise use `manage.py sweep_media`.
+MEDIA_AUDIO_RETENTION = env.int("MEDIA_AUDIO_RETENTION", default=7 * 24 * 60 * 60)
+MEDIA_RESUME_RETENTION = env.int("MEDIA_RESUME_RETENTION", default=None)
+MEDIA_ORPHAN_GRACE = env.int("MEDIA_ORPHAN_GRACE", default=60 * 60)
+MEDIA_SWEEP_BATCH_SIZE = env.int("MEDIA_SWEEP_BATCH_SIZE", default=500)
+MEDIA_SWEEP_INTERVAL = env.int("MEDIA_SWEEP_INTERVAL", default=0)
+
+# Local resume pre-scoring: "auto" only asks the LLM when the keyword score
+# (0-100) reaches RESUME_LOCAL_SCORE_THRESHOLD, "always" always asks it and
+# "never" only on an explicit request (``llm_evaluation`` upload field)
+RESUME_LLM_EVALUATION = env.str("RESUME_LLM_EVALUATION", default="auto")
+RESUME_LOCAL_SCORE_THRESHOLD = env.float("RESUME_LOCAL_SCORE_THRESHOLD", default=10.0)
+
+# Resume evaluation prompt budget in estimated tokens (cvBot.prompt_budget):
+# the whole prompt, of which the job description may take at most
+# RESUME_JOB_DESCRIPTION_MAX_TOKENS; resume sections are trimmed to fit
+RESUME_PROMPT_TOKEN_BUDGET = env.int("RESUME_PROMPT_TOKEN_BUDGET", default=6000)
+RESUME_JOB_DESCRIPTION_MAX_TOKENS = env.int("RESUME_JOB_DESCRIPTION_MAX_TOKENS", default=1500)
+
+# Resume listing: default and largest page size a client may ask for
+RESUME_PAGE_SIZE = env.int("RESUME_PAGE_SIZE", default=20)
+RESUME_MAX_PAGE_SIZE = env.int("RESUME_MAX_PAGE_SIZE", default=100)
+
+# Resume search (cvBot.search): results returned by default and at most
+RESUME_SEARCH_RESULTS = env.int("RESUME_SEARCH_RESULTS", default=20)
+RESUME_SEARCH_MAX_RESULTS = env.int("RESUME_SEARCH_MAX_RESULTS", default=100)
+
+# Resume matching (cvBot.vectors): embedding size (float32, so 4 bytes per
+# dimension per resume, stored and held in each worker's index), results
+# returned by default and at most, and how often (seconds) a worker reloads
+# its index to see texts changed by other workers
+RESUME_EMBEDDING_DIMENSIONS = env.int("RESUME_EMBEDDING_DIMENSIONS", default=512)
+RESUME_MATCH_RESULTS = env.int("RESUME_MATCH_RESULTS", default=20)
+RESUME_MATCH_MAX_RESULTS = env.int("RESUME_MATCH_MAX_RESULTS", default=100)
+RESUME_VECTOR_INDEX_MAX_AGE = env.int("RESUME_VECTOR_INDEX_MAX_AGE", default=60 * 60)
+
+# Shared LLM gateway (thryv.llm_gateway). Any OpenAI-compatible server works,
+# e.g. benchmarks/llm_stub_server.py for offline benchmarks. LLM_MAX_CONCURRENCY caps the
+# sync calls of the process and, separately, the async calls of each event loop.
+LLM_BASE_URL = env("LLM_BASE_URL", default="https://api.groq.com/openai/v1")
+LLM_API_KEY = env("LLM_API_KEY", default=GROQ_API_KEY)
+LLM_MODEL = env("LLM_MODEL", default="llama-3.1-70b-versatile")
+LLM_TIMEOUT = env.float("LLM_TIMEOUT", default=60.0)
+LLM_CONNECT_TIMEOUT = env.float("LLM_CONNECT_TIMEOUT", default=5.0)
+LLM_MAX_RETRIES = env.int("LLM_MAX_RETRIES", default=3)
+LLM_BACKOFF_BASE = env.float("LLM_BACKOFF_BASE", default=0.5)
+LLM_BACKOFF_MAX = env.float("LLM_BACKOFF_MAX", default=8.0)
+LLM_MAX_CONCURRENCY = env.int("LLM_MAX_CONCURRENCY", default=32)
+LLM_MAX_CONNECTIONS = env.int("LLM_MAX_CONNECTIONS", default=64)
+
 # Application definition
 
 INSTALLED_APPS = [
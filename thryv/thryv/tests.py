@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import httpx
+from django.test import SimpleTestCase
+
+from .llm_gateway import LLMError, LLMGateway
+from .text_normalization import normalize, normalize_many
+
+
+def _completion(content):
+    return httpx.Response(200, json={"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+
+class LLMGatewayTestCase(SimpleTestCase):
+    def _gateway(self, handler, max_retries=2, **options):
+        return LLMGateway(
+            base_url="http://llm.test/v1", api_key="test", model="stub-model",
+            max_retries=max_retries, backoff_base=0, transport=httpx.MockTransport(handler), **options,
+        )
+
+    def test_retries_rate_limited_requests(self):
+        calls = []
+
+        def handler(request):
+            calls.append(json.loads(request.content))
+            return httpx.Response(429) if len(calls) == 1 else _completion("Hello")
+
+        self.assertEqual(self._gateway(handler).complete([{"role": "user", "content": "Hi"}]), "Hello")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0]["model"], "stub-model")
+
+    def test_gives_up_after_max_retries(self):
+        gateway = self._gateway(lambda request: httpx.Response(503), max_retries=1)
+        with self.assertRaises(LLMError):
+            gateway.complete([{"role": "user", "content": "Hi"}])
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, json={"error": "bad request"})
+
+        with self.assertRaises(LLMError):
+            self._gateway(handler).complete([{"role": "user", "content": "Hi"}])
+        self.assertEqual(len(calls), 1)
+
+    def test_stream_yields_tokens(self):
+        body = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}\n\n" for token in ["Great ", "job!"]
+        ) + "data: [DONE]\n\n"
+        gateway = self._gateway(lambda request: httpx.Response(200, text=body))
+        self.assertEqual(list(gateway.stream([{"role": "user", "content": "Hi"}])), ["Great ", "job!"])
+
+    def test_stream_releases_its_slot_once_the_response_ends(self):
+        body = f"data: {json.dumps({'choices': [{'delta': {'content': 'Done'}}]})}\n\ndata: [DONE]\n\n"
+        gateway = self._gateway(lambda request: httpx.Response(200, text=body), max_concurrency=1)
+        tokens = gateway.stream([{"role": "user", "content": "Hi"}])
+        self.assertEqual(next(tokens), "Done")  # The generator is left open on its last token
+        self.assertTrue(gateway._semaphore.acquire(blocking=False))
+
+    def test_closed_stream_releases_its_slot(self):
+        body = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}\n\n" for token in ["a", "b", "c"]
+        )
+        gateway = self._gateway(lambda request: httpx.Response(200, text=body), max_concurrency=1)
+        tokens = gateway.stream([{"role": "user", "content": "Hi"}])
+        next(tokens)
+        self.assertFalse(gateway._semaphore.acquire(blocking=False))  # Held while the response is open
+        tokens.close()
+        self.assertTrue(gateway._semaphore.acquire(blocking=False))
+
+    def test_close_closes_the_clients(self):
+        gateway = self._gateway(lambda request: _completion("Hello"))
+        gateway.complete([{"role": "user", "content": "Hi"}])
+        client = gateway._client
+        loop = asyncio.new_event_loop()
+        try:
+            async_client, _ = loop.run_until_complete(self._async_state(gateway))
+            gateway.close()
+        finally:
+            loop.close()
+        self.assertTrue(client.is_closed)
+        self.assertTrue(async_client.is_closed)
+        self.assertIsNone(gateway._client)
+
+    async def _async_state(self, gateway):
+        return gateway._get_async_state()
+
+
+class TextNormalizationTestCase(SimpleTestCase):
+    def test_folds_to_printable_ascii(self):
+        text = "  Ingénieur\u00a0Data –\tﬁnance\x00\x1f café\u200b crème ™ 日本  "
+        self.assertEqual(normalize(text), "Ingenieur Data finance cafe creme TM")
+
+    def test_clean_only_keeps_letters(self):
+        text = "Développeur\u00a0Python\u00ad senior\x07 à Paris\u200b –\n Lyon"
+        self.assertEqual(normalize(text, ascii=False), "Développeur Python senior à Paris – Lyon")
+
+    def test_batch_matches_one_call_per_document(self):
+        texts = ["Éric  Dupont", "", "\u00a0", "SQL\x00Python", "naïve ﬂow 日本", "ligne\nsuivante"]
+        for ascii in (True, False):
+            self.assertEqual(normalize_many(texts, ascii), [normalize(text, ascii) for text in texts])
+        self.assertEqual(normalize_many([]), [])
@@ -0,0 +1,82 @@
+"""
+Text normalization shared by cvBot and rhBot.
+
+``normalize(text)`` folds text to printable ASCII: accents are stripped and
+compatibility characters decomposed (NFKD: "é" -> "e", "ﬁ" -> "fi"), other
+non-ASCII characters are dropped, control characters become spaces, and
+whitespace is collapsed and stripped. That is what cvBot has always fed its
+keyword scoring, search index and evaluation prompts, and the output is
+identical to the five-pass sanitizer the resume views used to run.
+
+``normalize(text, ascii=False)`` only cleans: control characters become
+spaces, zero-width characters and soft hyphens are removed, Unicode spaces
+(NBSP included) are collapsed with the rest of the whitespace, and letters are
+kept as they are, so prompts in French keep their accents.
+
+Every step runs once over the text, in C, and nothing is done twice: ASCII
+folding is NFKD plus an ``ignore`` encode (skipped for text that is already
+ASCII), control characters are mapped by a precomputed 256-byte
+``bytes.translate`` table, and ``" ".join(text.split())`` collapses and strips
+whitespace. ``str.translate`` with a Unicode table is avoided on purpose:
+CPython looks up every character of non-ASCII text in the table one by one,
+which is slower than the regex passes it would replace. ``normalize_many``
+normalizes a batch of documents (e.g. the lines of a resume) in one go.
+"""
+import re
+import unicodedata
+
+# ASCII control characters (and DEL) to spaces
+_CONTROLS = bytes([*range(0x20), 0x7F])
+_CONTROL_TABLE = bytes.maketrans(_CONTROLS, b" " * len(_CONTROLS))
+
+# Separates the documents of a batch; a control character, so never left in the output
+_SEPARATOR = "\x00"
+_BATCH_CONTROL_TABLE = bytes.maketrans(_CONTROLS[1:], b" " * (len(_CONTROLS) - 1))
+
+# Invisible characters PDF extraction leaves inside words: soft hyphen, zero-width spaces and joiners, BOM
+_INVISIBLE = re.compile("[­​‌‍⁠﻿]+")
+# Control characters str.split() doesn't treat as whitespace (C0 and C1, DEL)
+_CONTROL = re.compile(r"[\x00-\x08\x0e-\x1b\x7f-\x9f]+")
+_BATCH_CONTROL = re.compile(r"[\x01-\x08\x0e-\x1b\x7f-\x9f]+")
+
+
+def _fold(text, table):
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+    return text.encode("ascii", "ignore").translate(table).decode("ascii")
+
+
+def _clean(text, control):
+    return control.sub(" ", _INVISIBLE.sub("", text))
+
+
+def normalize(text, ascii=True):
+    """
+    Normalize ``text`` for prompts, scoring and indexing.
+
+    Args:
+        text (str): Text to normalize.
+        ascii (bool): Fold to printable ASCII; if False, only clean control
+            characters, invisible characters and whitespace.
+
+    Returns:
+        str: Normalized text on a single line.
+    """
+    text = _fold(text, _CONTROL_TABLE) if ascii else _clean(text, _CONTROL)
+    return " ".join(text.split())
+
+
+def normalize_many(texts, ascii=True):
+    """
+    Normalize many documents at once, e.g. the lines of a resume.
+
+    Returns:
+        list: The normalized texts, in order.
+    """
+    texts = list(texts)
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:
+        # Empty batch, or a document contains the separator: one call each
+        return [normalize(text, ascii) for text in texts]
+    joined = _fold(joined, _BATCH_CONTROL_TABLE) if ascii else _clean(joined, _BATCH_CONTROL)
+    return [" ".join(part.split()) for part in joined.split(_SEPARATOR)]